@@ -17,9 +17,18 @@ class AppSettings(BaseSettings):
     # OpenAI config (for dataset generation)
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL_ID: str = "gpt-4o-mini"
+    # Account rate limits shared by all workers in this process (0 disables the limit)
+    OPENAI_RPM: int = 500
+    OPENAI_TPM: int = 200000
+    OPENAI_MAX_CONCURRENCY: int = 64  # Default number of in-flight LLM workers per batch
+    # Prompt section budgets for README generation (tokens)
+    FILE_TREE_TOKEN_BUDGET: int = 1500
+    CODE_SAMPLES_TOKEN_BUDGET: int = 2000
 
     # GitHub config (for repo crawling)
     GITHUB_TOKEN: str | None = None
+    GITHUB_TOKENS: str | None = None  # Extra comma-separated tokens the search crawler rotates through
+    MOXI_NO_HTTP_CACHE: bool = False  # Bypass the writer's in-process SHA/directory caches
     
     # Hugging Face config (for model training/inference)
     HUGGINGFACE_ACCESS_TOKEN: str | None = None
@@ -52,6 +61,11 @@ class AppSettings(BaseSettings):
     USE_QDRANT_CLOUD: bool = False
     QDRANT_CLOUD_URL: str | None = None
     QDRANT_APIKEY: str | None = None
+
+    # LLM response cache for the streaming doc flow (exact: MongoDB, semantic: Qdrant)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 7 * 24 * 3600  # seconds
+    LLM_CACHE_SIMILARITY: float = 0.95  # cosine threshold for a semantic hit
     
     # RabbitMQ config (for task queue)
     RABBITMQ_DEFAULT_USERNAME: str = "guest"
@@ -73,6 +87,11 @@ class AppSettings(BaseSettings):
     DATA_DIR: str = f"{ROOT_DIR}/data"
     MODELS_DIR: str = f"{ROOT_DIR}/models"
     REPO_CACHE_DIR: str | None = f"{ROOT_DIR}/data/repos"  # Cache for cloned repositories
+    REPO_SNAPSHOT_TTL: int = 24 * 3600  # seconds before a cached tarball snapshot is checked against the remote HEAD
+    CLONE_WORKERS: int | None = None  # Concurrent clones/analyses in batch doc generation (None: min(8, CPUs))
+    ANALYSIS_CACHE_PATH: str | None = f"{ROOT_DIR}/data/cache/analysis_cache.sqlite"  # Per-file AST results (None: off)
+    HTTP_CACHE_PATH: str | None = f"{ROOT_DIR}/data/cache/github_http_cache.sqlite"  # ETag cache for GitHub API GETs (None: off)
+    HTTP_CACHE_TTL: int = 30 * 24 * 3600  # seconds an ETag entry lives without being revalidated
     
     # Dataset generation config
     MIN_REPO_STARS: int = 100  # Lowered to get more repositories (can be overridden via CLI)
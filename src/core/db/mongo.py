@@ -4,7 +4,8 @@ Use this when you don't want to keep all data in local JSON: store README sample
 and SFT samples in MongoDB, then export or stream for training.
 """
 
-from typing import Any, Iterator, Optional
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
 
 from core import get_logger, settings
 
@@ -66,19 +67,30 @@ def count_readme_samples(filter_query: Optional[dict] = None) -> int:
     return get_db()[COLL_README_SAMPLES].count_documents(filter_query or {})
 
 
+def iter_readme_samples(
+    filter_query: Optional[dict] = None,
+    batch_size: int = 500,
+) -> Iterator[dict]:
+    """Iterate README samples over a single server-side cursor (no skip-based paging)."""
+    yield from get_db()[COLL_README_SAMPLES].find(filter_query or {}, batch_size=batch_size)
+
+
 def stream_readme_samples(
     batch_size: int = 50,
     filter_query: Optional[dict] = None,
 ) -> Iterator[list[dict]]:
     """Stream README samples in batches (for large datasets without loading all)."""
-    db = get_db()
-    skip = 0
+    return _batched(iter_readme_samples(filter_query, batch_size=batch_size), batch_size)
+
+
+def _batched(docs: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    """Group a document iterator into lists of batch_size."""
+    it = iter(docs)
     while True:
-        batch = find_readme_samples(skip=skip, limit=batch_size, filter_query=filter_query)
+        batch = list(islice(it, batch_size))
         if not batch:
             break
         yield batch
-        skip += batch_size
 
 
 # ---------- SFT samples (Phase 3 output: instruction + input + content for training) ----------
@@ -124,10 +136,5 @@ def stream_sft_samples(
     filter_query: Optional[dict] = None,
 ) -> Iterator[list[dict]]:
     """Stream SFT samples in batches (for training data loader or export)."""
-    skip = 0
-    while True:
-        batch = find_sft_samples(skip=skip, limit=batch_size, filter_query=filter_query)
-        if not batch:
-            break
-        yield batch
-        skip += batch_size
+    cur = get_db()[COLL_SFT_SAMPLES].find(filter_query or {}, batch_size=batch_size)
+    return _batched(cur, batch_size)
@@ -87,6 +87,17 @@ class QdrantConnector:
             logger.error("Search failed", error=str(e))
             raise
 
+    def delete_points(self, collection_name: str, points_filter: models.Filter):
+        """Delete the points matching a filter."""
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=points_filter),
+            )
+        except Exception as e:
+            logger.error("Failed to delete points", error=str(e))
+            raise
+
     def scroll(
         self,
         collection_name: str,
@@ -0,0 +1,134 @@
+"""ETag cache for GitHub GET requests (conditional requests backed by SQLite).
+
+GitHub does not count a 304 Not Modified against the rate limit, so re-running
+a crawl or collection only pays for resources that actually changed.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from core import get_logger, settings
+
+logger = get_logger(__name__)
+
+# Bump when the table layout changes: a cache written by another version is
+# dropped on open (stored as PRAGMA user_version)
+HTTP_CACHE_VERSION = 2
+# Most responses kept; the least recently validated ones are pruned first
+HTTP_CACHE_MAX_ENTRIES = 20000
+# Stores between two prunes within one process
+_PRUNE_EVERY = 1000
+
+# Per-process connection to the cache (created on first use)
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+_stores_since_prune = 0
+
+
+def _prune(conn: sqlite3.Connection) -> None:
+    """Drop expired responses, then the oldest ones beyond HTTP_CACHE_MAX_ENTRIES."""
+    with conn:
+        conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - settings.HTTP_CACHE_TTL,))
+        conn.execute(
+            "DELETE FROM responses WHERE url NOT IN "
+            "(SELECT url FROM responses ORDER BY stored_at DESC LIMIT ?)",
+            (HTTP_CACHE_MAX_ENTRIES,),
+        )
+
+
+def _get_cache(cache_path: str) -> sqlite3.Connection:
+    """Open (once per process) the SQLite cache of (etag, body) per URL."""
+    global _conn
+    if _conn is None:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != HTTP_CACHE_VERSION:
+                conn.execute("DROP TABLE IF EXISTS responses")
+                conn.execute(f"PRAGMA user_version = {HTTP_CACHE_VERSION}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(url TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+        _prune(conn)
+        _conn = conn
+    return _conn
+
+
+def conditional_get(
+    session: requests.Session,
+    url: str,
+    params: Optional[dict] = None,
+    timeout: float = 30,
+    headers: Optional[dict] = None,
+) -> requests.Response:
+    """
+    GET ``url`` through ``session`` as a conditional request.
+
+    A cached ETag is sent as If-None-Match; on 304 the cached body is
+    returned as a 200, so callers handle the response as usual. Responses
+    with an ETag are stored under the full URL (query string included) and
+    expire after HTTP_CACHE_TTL seconds without being revalidated.
+    Cache failures are logged and fall through to a plain GET.
+
+    Args:
+        session: Session to send the request with (headers, pooling, retries)
+        url: Request URL
+        params: Query parameters
+        timeout: Request timeout in seconds
+        headers: Extra request headers (e.g. a per-request Authorization)
+
+    Returns:
+        The response
+    """
+    global _stores_since_prune
+    cache_path = settings.HTTP_CACHE_PATH
+    if not cache_path:
+        return session.get(url, params=params, headers=headers, timeout=timeout)
+
+    key = requests.Request("GET", url, params=params).prepare().url
+    cached = None
+    try:
+        with _lock:
+            cached = _get_cache(cache_path).execute(
+                "SELECT etag, body FROM responses WHERE url = ? AND stored_at >= ?",
+                (key, time.time() - settings.HTTP_CACHE_TTL),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.debug("HTTP cache lookup failed", error=str(e))
+
+    if cached:
+        headers = {**(headers or {}), "If-None-Match": cached[0]}
+    response = session.get(url, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        response.status_code = 200
+        response._content = cached[1]
+        response.encoding = "utf-8"
+        row = None
+    elif response.status_code == 200 and response.headers.get("ETag"):
+        row = (key, response.headers["ETag"], response.content)
+    else:
+        return response
+
+    try:
+        with _lock:
+            conn = _get_cache(cache_path)
+            with conn:
+                if row is None:
+                    # Still current: keep it for another HTTP_CACHE_TTL
+                    conn.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), key))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (*row, time.time()))
+                    _stores_since_prune += 1
+            if _stores_since_prune >= _PRUNE_EVERY:
+                _stores_since_prune = 0
+                _prune(conn)
+    except sqlite3.Error as e:
+        logger.debug("HTTP cache update failed", error=str(e))
+    return response
@@ -0,0 +1,47 @@
+"""Client-side rate limiting shared by the API clients (OpenAI, GitHub)."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: ``limit`` tokens per ``period`` seconds, refilled continuously.
+
+    Args:
+        limit: Tokens granted per period
+        period: Window length in seconds
+        burst: Most tokens that can be saved up (defaults to ``limit``)
+        on_wait: Called with the number of seconds before each wait
+    """
+
+    def __init__(
+        self,
+        limit: float,
+        period: float = 60.0,
+        burst: Optional[float] = None,
+        on_wait: Optional[Callable[[float], None]] = None,
+    ):
+        self.capacity = float(min(burst, limit) if burst is not None else limit)
+        self.rate = limit / period
+        self.on_wait = on_wait
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Block until ``amount`` tokens are available, then take them."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            if self.on_wait is not None:
+                self.on_wait(wait)
+            time.sleep(wait)
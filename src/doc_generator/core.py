@@ -1,15 +1,23 @@
 """Core business logic for document generation (reusable by CLI and API)."""
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import Context
+from typing import Dict, Iterator, List, Optional
 
 from core import get_logger, settings
-from moxi_analyzer import analyze_repository
+from moxi_analyzer import RepositoryInfo, analyze_repository
 from doc_generator.llm.architecture_gen import ArchitectureGenerator
+from doc_generator.utils import batch_context
 from doc_generator.writer import write_to_repo_via_api
 
 logger = get_logger(__name__)
 
+# Clone/analysis workers, sized separately from the LLM concurrency of a batch
+# (cloning + AST analysis is disk/CPU bound, so it follows the core count)
+CLONE_WORKERS = settings.CLONE_WORKERS or min(8, os.cpu_count() or 4)
+_CLONE_POOL = ThreadPoolExecutor(max_workers=CLONE_WORKERS, thread_name_prefix="clone")
+
 
 def generate_single_doc(
     repo_url: str,
@@ -42,7 +50,23 @@ def generate_single_doc(
             repo_url,
             cache_dir=cache_dir or settings.REPO_CACHE_DIR
         )
+    except Exception as e:
+        logger.error("Failed to generate architecture diagram", url=repo_url, error=str(e))
+        return None
+
+    return _generate_from_analysis(repo_url, repo_analysis, auto_write, file_name,
+                                   architecture_generator)
 
+
+def _generate_from_analysis(
+    repo_url: str,
+    repo_analysis: RepositoryInfo,
+    auto_write: bool,
+    file_name: str,
+    architecture_generator: Optional[ArchitectureGenerator],
+) -> Optional[Dict]:
+    """Run the LLM and write steps for an already analyzed repository."""
+    try:
         # Step 2: Generate architecture diagram using rule-based analysis + GPT-4
         if architecture_generator is None:
             architecture_generator = ArchitectureGenerator()
@@ -91,80 +115,140 @@ def generate_batch_docs(
     auto_write: bool = False,
     file_name: str = "ARCHITECTURE_BY_MOXI.md",
     concurrent: bool = True,
-    max_workers: int = 10,
+    max_workers: Optional[int] = None,
     cache_dir: Optional[str] = None,
 ) -> List[Dict]:
     """
     Generate architecture diagrams for multiple repositories in batch (with optional concurrency).
 
-    This function demonstrates high concurrency capabilities.
+    This function demonstrates high concurrency capabilities. It collects
+    everything from iter_batch_docs(); use that directly to handle each
+    result as soon as it is ready without holding the whole batch in memory.
 
     Args:
         repo_urls: List of GitHub repository URLs
         auto_write: If True, automatically write to repositories via GitHub API
         file_name: Name of the file to write (default: "ARCHITECTURE_BY_MOXI.md")
         concurrent: If True, process repositories concurrently
-        max_workers: Maximum number of concurrent workers (if concurrent=True)
+        max_workers: Maximum number of concurrent LLM workers (if concurrent=True);
+                     defaults to settings.OPENAI_MAX_CONCURRENCY
         cache_dir: Optional cache directory for cloned repos
 
     Returns:
         List of results (None values filtered out)
     """
+    return list(iter_batch_docs(repo_urls, auto_write, file_name, concurrent, max_workers, cache_dir))
+
+
+def iter_batch_docs(
+    repo_urls: List[str],
+    auto_write: bool = False,
+    file_name: str = "ARCHITECTURE_BY_MOXI.md",
+    concurrent: bool = True,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Generate architecture diagrams for multiple repositories, yielding each result as it completes.
+
+    Args are the same as generate_batch_docs(). Failed repositories are
+    logged and skipped; in concurrent mode results arrive in completion order.
+
+    Yields:
+        Result dictionaries, as returned by generate_single_doc()
+    """
     if not repo_urls:
-        return []
+        return
+
+    # LLM calls are network-bound and throttled by the shared rate limiter,
+    # so the LLM pool follows the provider limit rather than the core count
+    llm_workers = min(max_workers or settings.OPENAI_MAX_CONCURRENCY,
+                      settings.OPENAI_MAX_CONCURRENCY,
+                      len(repo_urls))
 
     logger.info("Processing batch",
                total=len(repo_urls),
                concurrent=concurrent,
-               max_workers=max_workers if concurrent else 1,
+               llm_workers=llm_workers if concurrent else 1,
+               clone_workers=CLONE_WORKERS if concurrent else 1,
                auto_write=auto_write)
 
     # Create a single architecture generator to reuse (more efficient)
     architecture_generator = ArchitectureGenerator()
 
+    # All docs in one batch share the same "Last updated" timestamp
+    context = batch_context()
     if concurrent:
-        # Concurrent processing (high concurrency demonstration)
-        results = []
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_url = {
-                executor.submit(
-                    generate_single_doc,
-                    url,
-                    auto_write,
-                    file_name,
-                    cache_dir,
-                    architecture_generator
-                ): url
-                for url in repo_urls
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    result = future.result()
-                    if result:
-                        results.append(result)
-                        logger.debug("Completed",
-                                   url=url,
-                                   total_results=len(results))
-                except Exception as e:
-                    logger.error("Task failed", url=url, error=str(e))
-
-        logger.info("Batch processing complete",
-                   total=len(repo_urls),
-                   successful=len(results))
-        return results
-
+        yield from _iter_concurrent(repo_urls, auto_write, file_name, llm_workers,
+                                    cache_dir or settings.REPO_CACHE_DIR,
+                                    architecture_generator, context)
     else:
         # Serial processing (for debugging or when concurrency is not desired)
-        results = []
         for i, url in enumerate(repo_urls, 1):
             logger.info("Processing", current=i, total=len(repo_urls), url=url)
-            result = generate_single_doc(url, auto_write, file_name, cache_dir, None)
+            result = context.run(generate_single_doc, url, auto_write, file_name, cache_dir,
+                                 architecture_generator)
             if result:
-                results.append(result)
-        return results
+                yield result
+
 
+def _iter_concurrent(
+    repo_urls: List[str],
+    auto_write: bool,
+    file_name: str,
+    llm_workers: int,
+    cache_dir: Optional[str],
+    architecture_generator: ArchitectureGenerator,
+    context: Context,
+) -> Iterator[Dict]:
+    # Staged: clones/analysis run on _CLONE_POOL and each analyzed repo is
+    # handed straight to the LLM pool, so git I/O and LLM latency overlap
+    # instead of sharing one set of workers
+    successful = 0
+
+    executor = ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix="llm")
+    pending: Dict = {}
+    try:
+        pending = {
+            _CLONE_POOL.submit(analyze_repository, url, cache_dir=cache_dir): ("analyze", url)
+            for url in repo_urls
+        }
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, url = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("Task failed", url=url, stage=stage, error=str(e))
+                    continue
+
+                if stage == "analyze":
+                    doc_future = executor.submit(
+                        context.copy().run,
+                        _generate_from_analysis,
+                        url,
+                        result,
+                        auto_write,
+                        file_name,
+                        architecture_generator,
+                    )
+                    pending[doc_future] = ("generate", url)
+                elif result:
+                    successful += 1
+                    logger.debug("Completed",
+                               url=url,
+                               total_results=successful)
+                    yield result
+    finally:
+        # Stopped early (consumer closed the generator or an error): drop the
+        # clones and LLM calls not started yet; running ones finish in the
+        # background instead of blocking the caller
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=not pending, cancel_futures=True)
+
+    logger.info("Batch processing complete",
+               total=len(repo_urls),
+               successful=successful)
@@ -1,18 +1,30 @@
 """Architecture diagram generator using rule-based analysis + GPT-4."""
 
+from operator import itemgetter
 from typing import Optional
 
 from openai import OpenAI
 
 from core import get_logger, settings
 from moxi_analyzer import RepositoryInfo
+from doc_generator.llm.completion import chat_completion
+from doc_generator.utils import current_timestamp
 from moxi_analyzer.architecture.analyzer import analyze_architecture_with_rules
 
 logger = get_logger(__name__)
 
+_get_name = itemgetter("name")
+_get_type = itemgetter("type")
+_get_edge = itemgetter("from", "to")
+
 
 class ArchitectureGenerator:
-    """Generate architecture diagrams using rule-based analysis + GPT-4."""
+    """
+    Generate architecture diagrams using rule-based analysis + GPT-4.
+
+    Instances hold no per-repository state and the OpenAI client is safe to
+    share, so one generator can serve every worker thread in a batch.
+    """
 
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         """
@@ -28,7 +40,7 @@ class ArchitectureGenerator:
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY in .env file.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, max_retries=0)
         logger.info("Architecture generator initialized", model=self.model)
 
     def generate(self, repo_info: RepositoryInfo) -> Optional[str]:
@@ -121,7 +133,8 @@ graph TB
     Logic --> Cache[(Cache)]
 """
 
-            response = self.client.chat.completions.create(
+            response = chat_completion(
+                self.client,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an architecture diagram expert. Generate simple, accurate Mermaid diagrams."},
@@ -179,7 +192,8 @@ Example of what you MUST NOT write:
 "How to Use: Clone the repository, install dependencies, run the application..."
 """
 
-            response = self.client.chat.completions.create(
+            response = chat_completion(
+                self.client,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an architecture diagram generator. You ONLY generate architecture explanations. You NEVER generate README content, installation instructions, usage examples, or any documentation beyond the architecture diagram explanation. If asked for anything else, refuse."},
@@ -204,17 +218,17 @@ Example of what you MUST NOT write:
 
     def _format_components(self, components: list) -> str:
         """Format components for prompt."""
-        return "\n".join([f"- {c['name']} ({c['type']})" for c in components])
+        names = list(map(_get_name, components))
+        types = list(map(_get_type, components))
+        return "\n".join([f"- {n} ({t})" for n, t in zip(names, types)])
 
     def _format_connections(self, connections: list) -> str:
         """Format connections for prompt."""
-        return "\n".join([f"- {c['from']} → {c['to']}" for c in connections])
+        return "\n".join([f"- {src} → {dst}" for src, dst in map(_get_edge, connections)])
 
     def _format_architecture_doc(self, mermaid_diagram: str, explanation: str, rule_analysis: dict) -> str:
         """Format architecture document - ONLY diagram and explanation, NO README content."""
-        from datetime import datetime
-        
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+        current_time = current_timestamp()
         
         # Validate explanation doesn't contain README content
         readme_keywords = ["how to use", "installation", "clone", "pip install", "usage examples", 
@@ -225,8 +239,15 @@ Example of what you MUST NOT write:
             logger.warning("Explanation contains README keywords, using minimal fallback")
             explanation = "This architecture consists of the components shown in the diagram above, with data flowing between them as indicated by the arrows."
         
+        # A README heading inside the diagram would only come from the model
+        # ignoring instructions; cut the diagram there rather than re-scanning the doc
+        heading_pos = mermaid_diagram.find("## ")
+        if heading_pos != -1:
+            logger.error("Mermaid diagram contains Markdown headings, truncating")
+            mermaid_diagram = mermaid_diagram[:heading_pos].rstrip()
+        
         # Simple format: ONLY diagram and explanation - NO other content
-        doc = f"""# Architecture Diagram
+        return f"""# Architecture Diagram
 Last updated: {current_time}
 
 ```mermaid
@@ -237,24 +258,3 @@ Last updated: {current_time}
 
 {explanation}
 """
-        
-        # Final validation: ensure no README sections
-        if any(section in doc.lower() for section in ["how to use", "installation", "usage examples", 
-                                                       "project structure", "contributing", "license",
-                                                       "how this project works", "command-line example"]):
-            logger.error("Generated document contains README content - this should not happen!")
-            # Return minimal version
-            return f"""# Architecture Diagram
-Last updated: {current_time}
-
-```mermaid
-{mermaid_diagram}
-```
-
-## Overview
-
-This architecture consists of the components shown in the diagram above, with data flowing between them as indicated by the arrows.
-"""
-        
-        return doc
-
@@ -0,0 +1,177 @@
+"""Shared chat-completion call with retry/backoff for OpenAI rate limits."""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    OpenAI,
+    RateLimitError,
+)
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from core import get_logger, settings
+from core.rate_limit import TokenBucket
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    tiktoken = None
+
+logger = get_logger(__name__)
+
+# Cap on how long we honour a server-provided Retry-After (seconds)
+MAX_RETRY_AFTER = 60.0
+
+_backoff = wait_exponential_jitter(initial=1, max=32)
+
+# OpenAI reset headers look like "1s", "6m0s", "120ms"
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse a Retry-After / x-ratelimit-reset value into seconds."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after_seconds(error: RateLimitError) -> Optional[float]:
+    """Extract the server-suggested wait from a 429 response, if any."""
+    headers = getattr(error.response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        seconds = _parse_duration(retry_after_ms)
+        if seconds is not None:
+            return seconds / 1000.0
+
+    for header in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        value = headers.get(header)
+        if value:
+            seconds = _parse_duration(value)
+            if seconds is not None:
+                return seconds
+    return None
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """Prefer the server's Retry-After on 429s, otherwise exponential backoff + jitter."""
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(error, RateLimitError):
+        seconds = _retry_after_seconds(error)
+        if seconds is not None:
+            return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    logger.warning("OpenAI call failed, retrying",
+                   attempt=retry_state.attempt_number,
+                   wait=round(retry_state.next_action.sleep, 2) if retry_state.next_action else None,
+                   error=type(error).__name__ if error else None)
+
+
+_limiters: Dict[Tuple[str, int, int], Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+_limiters_lock = threading.Lock()
+
+
+def _get_limiters(model: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+    """Return the (requests, tokens) buckets shared by every caller of ``model``."""
+    key = (model, settings.OPENAI_RPM, settings.OPENAI_TPM)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = (
+                TokenBucket(settings.OPENAI_RPM) if settings.OPENAI_RPM > 0 else None,
+                TokenBucket(settings.OPENAI_TPM) if settings.OPENAI_TPM > 0 else None,
+            )
+        return _limiters[key]
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def estimate_tokens(model: str, messages: list, max_tokens: Optional[int] = None) -> int:
+    """Estimate prompt + completion tokens a request will be billed for."""
+    text = "".join(m.get("content") or "" for m in messages)
+    if TIKTOKEN_AVAILABLE:
+        prompt_tokens = len(_get_encoding(model).encode(text))
+    else:
+        prompt_tokens = len(text) // 4
+    return prompt_tokens + (max_tokens or settings.MAX_OUTPUT_TOKENS)
+
+
+def truncate_to_tokens(text: str, model: str, budget: int) -> str:
+    """Cut ``text`` to at most ``budget`` tokens, marking it as truncated."""
+    if TIKTOKEN_AVAILABLE:
+        encoding = _get_encoding(model)
+        tokens = encoding.encode(text)
+        if len(tokens) <= budget:
+            return text
+        return encoding.decode(tokens[:budget]) + "\n... (truncated)"
+    # ~4 characters per token without a tokenizer
+    if len(text) <= budget * 4:
+        return text
+    return text[:budget * 4] + "\n... (truncated)"
+
+
+@retry(
+    retry=retry_if_exception_type(
+        (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+    ),
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(6),
+    before_sleep=_log_retry,
+    reraise=True,
+)
+def chat_completion(client: OpenAI, **kwargs: Any) -> Any:
+    """
+    Call ``client.chat.completions.create`` with retry on rate limits and transient errors.
+
+    Create the client with ``max_retries=0`` so retries are not stacked on top of
+    the SDK's own retry loop. Every attempt first waits on the process-wide
+    RPM/TPM buckets for the model, so concurrent workers stay under the
+    account limits instead of bursting into 429s.
+
+    Args:
+        client: OpenAI client
+        **kwargs: Arguments forwarded to ``chat.completions.create``
+
+    Returns:
+        The chat completion response
+    """
+    model = kwargs.get("model", "")
+    request_limiter, token_limiter = _get_limiters(model)
+    if request_limiter:
+        request_limiter.acquire()
+    if token_limiter:
+        token_limiter.acquire(
+            estimate_tokens(model, kwargs.get("messages", []), kwargs.get("max_tokens"))
+        )
+    return client.chat.completions.create(**kwargs)
@@ -1,16 +1,18 @@
 """OpenAI-based document generator using GPT-4o-mini."""
 
-from datetime import datetime
-from typing import Optional
+from string import Formatter
+from typing import List, Optional, Tuple
 
 from openai import OpenAI
 
 from core import get_logger, settings
 from moxi_analyzer import RepositoryInfo
+from doc_generator.llm.completion import chat_completion, truncate_to_tokens
 from doc_generator.utils import (
     read_project_metadata,
     read_key_file_content,
     format_file_tree,
+    current_timestamp,
 )
 
 logger = get_logger(__name__)
@@ -68,6 +70,24 @@ Make the README professional, clear, and helpful for users who want to understan
 Generate only the README content in Markdown format, without any additional explanation or code blocks around it."""
 
 
+def _compile_template(template: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a str.format template into (literal, field_name) pairs once."""
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+
+_README_PROMPT_PARTS = _compile_template(README_PROMPT_TEMPLATE)
+
+
+def build_readme_prompt(**fields: str) -> str:
+    """Fill README_PROMPT_TEMPLATE without re-parsing it on every call."""
+    pieces = []
+    for literal, field in _README_PROMPT_PARTS:
+        pieces.append(literal)
+        if field is not None:
+            pieces.append(str(fields[field]))
+    return "".join(pieces)
+
+
 class OpenAIDocGenerator:
     """Document generator using OpenAI GPT-4o-mini."""
 
@@ -85,7 +105,7 @@ class OpenAIDocGenerator:
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY in .env file.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, max_retries=0)
         
         logger.info("OpenAI document generator initialized", model=self.model)
 
@@ -107,6 +127,7 @@ class OpenAIDocGenerator:
             
             # Format file tree
             file_tree = format_file_tree(repo_info.all_files, max_depth=4, max_files=80)
+            file_tree = truncate_to_tokens(file_tree, self.model, settings.FILE_TREE_TOKEN_BUDGET)
             
             # Format key files for prompt
             key_files_str = "\n".join([
@@ -122,12 +143,14 @@ class OpenAIDocGenerator:
                     code_samples.append(f"\n### {key} ({path}):\n```\n{content}\n```")
             
             code_samples_str = "\n".join(code_samples) if code_samples else "No code samples available"
+            code_samples_str = truncate_to_tokens(code_samples_str, self.model,
+                                                  settings.CODE_SAMPLES_TOKEN_BUDGET)
             
             # Get current time for timestamp
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+            current_time = current_timestamp()
             
             # Build prompt
-            prompt = README_PROMPT_TEMPLATE.format(
+            prompt = build_readme_prompt(
                 project_name=project_name,
                 project_type=repo_info.project_type.value,
                 description=description,
@@ -147,7 +170,8 @@ class OpenAIDocGenerator:
                        model=self.model)
             
             # Call OpenAI API
-            response = self.client.chat.completions.create(
+            response = chat_completion(
+                self.client,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an expert technical writer."},
@@ -1,11 +1,13 @@
 """Main entry point for document generation (CLI)."""
 
 import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from core import get_logger, settings
 from core.lib import ensure_dir_exists
-from doc_generator.core import generate_single_doc, generate_batch_docs
+from doc_generator.core import generate_single_doc, iter_batch_docs
 
 logger = get_logger(__name__)
 
@@ -44,8 +46,8 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--max-workers",
         type=int,
-        default=10,
-        help="Maximum number of concurrent workers (default: 10)",
+        default=None,
+        help="Maximum number of concurrent LLM workers (default: OPENAI_MAX_CONCURRENCY)",
     )
     return parser.parse_args()
 
@@ -82,7 +84,7 @@ def main() -> None:
                     output_dir = Path(args.output)
                     ensure_dir_exists(output_dir)
                     output_file = output_dir / result["file_name"]
-                    output_file.write_text(result["architecture_content"], encoding="utf-8")
+                    output_file.write_bytes(result["architecture_content"].encode("utf-8"))
                     print(f"✅ Generated {result['file_name']} saved to {output_file}")
                 else:
                     # Print to stdout
@@ -96,30 +98,42 @@ def main() -> None:
     
     # Multiple repositories
     else:
-        results = generate_batch_docs(
-            repo_urls=args.repo_urls,
-            auto_write=args.auto_write,
-            file_name=args.file_name,
-            concurrent=args.concurrent,
-            max_workers=args.max_workers,
-        )
-        
-        successful = [r for r in results if r]
-        failed = len(args.repo_urls) - len(successful)
-        
-        print(f"\n✅ Successfully generated {len(successful)}/{len(args.repo_urls)} architecture diagrams")
-        if failed > 0:
-            print(f"❌ Failed to generate {failed} architecture diagrams")
-        
-        if args.output:
-            output_dir = Path(args.output)
-            ensure_dir_exists(output_dir)
-            for i, result in enumerate(successful, 1):
+        output_dir = ensure_dir_exists(args.output) if args.output else None
+        successful = 0
+        lines = []
+
+        # Write each file as soon as its repo finishes rather than after the
+        # whole batch, so disk I/O overlaps with the remaining LLM calls
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="write") as writer:
+            write_futures = []
+            for result in iter_batch_docs(
+                repo_urls=args.repo_urls,
+                auto_write=args.auto_write,
+                file_name=args.file_name,
+                concurrent=args.concurrent,
+                max_workers=args.max_workers,
+            ):
+                successful += 1
+                if output_dir is None:
+                    continue
                 repo_name = result["repo_url"].split("/")[-1]
                 file_name = result.get("file_name", "ARCHITECTURE_BY_MOXI.md")
                 output_file = output_dir / f"{repo_name}_{file_name}"
-                output_file.write_text(result["architecture_content"], encoding="utf-8")
-                print(f"  - {repo_name}: {output_file}")
+                write_futures.append(
+                    writer.submit(output_file.write_bytes, result["architecture_content"].encode("utf-8"))
+                )
+                lines.append(f"  - {repo_name}: {output_file}")
+
+            for future in write_futures:
+                future.result()
+
+        failed = len(args.repo_urls) - successful
+        
+        print(f"\n✅ Successfully generated {successful}/{len(args.repo_urls)} architecture diagrams")
+        if failed > 0:
+            print(f"❌ Failed to generate {failed} architecture diagrams")
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,27 +1,45 @@
 """Bytewax streaming pipeline for document generation (like llm-twin-course)."""
 
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import MethodType
+from typing import Callable, Deque, List, Optional, Tuple
+
 try:
     import bytewax.operators as op
     from bytewax.dataflow import Dataflow
+    from bytewax.inputs import FixedPartitionedSource, StatefulSourcePartition
     BYTEWAX_AVAILABLE = True
 except ImportError:
     BYTEWAX_AVAILABLE = False
     op = None
     Dataflow = None
+    FixedPartitionedSource = object
+    StatefulSourcePartition = object
 
-from core import get_logger
-from core.db.qdrant import QdrantConnector
-from core.mq import RabbitMQConnection
+from core import get_logger, settings
 
 logger = get_logger(__name__)
 
+# (delivery_tag, redelivered) of the broker message a flow item came from
+Delivery = Tuple[int, bool]
+# Outcome of a message, queued by the flow's steps: (delivery_tag, ok, requeue)
+Settlement = Tuple[int, bool, bool]
+
 
 class DocumentGenerationFlow:
     """
     Bytewax streaming pipeline for processing repository documentation requests.
-    
+
     Similar to llm-twin-course's feature pipeline, but for document generation.
-    
+    Messages travel through the flow in batches (lists of dicts) so broker
+    I/O and per-step overhead are paid once per batch, and the repos in a
+    batch are analyzed/generated concurrently. A message is acked only once
+    its documentation is written; failed ones are nacked (requeued once,
+    then dropped or dead-lettered by the broker).
+
     Flow:
     1. Read from RabbitMQ
     2. Analyze repository
@@ -30,12 +48,30 @@ class DocumentGenerationFlow:
     5. Write to GitHub
     """
 
-    def __init__(self, queue_name: str = "doc_generation_queue"):
+    __slots__ = (
+        "queue_name",
+        "batch_size",
+        "batch_timeout_ms",
+        "connection",
+        "_settlements",
+        "_executor",
+        "_architecture_generator",
+        "_generate_cached",
+    )
+
+    def __init__(
+        self,
+        queue_name: str = "doc_generation_queue",
+        batch_size: int = 16,
+        batch_timeout_ms: int = 1000,
+    ):
         """
         Initialize streaming pipeline.
-        
+
         Args:
             queue_name: RabbitMQ queue name
+            batch_size: Maximum number of messages per batch
+            batch_timeout_ms: Maximum time to wait while filling a batch
         """
         if not BYTEWAX_AVAILABLE:
             raise ImportError(
@@ -43,20 +79,43 @@ class DocumentGenerationFlow:
                 "poetry add --group streaming bytewax"
             )
 
+        # Imported here so CLI-only runs don't pay for qdrant-client/grpc, the
+        # analyzer or the LLM client stack (openai, tiktoken, pymongo) at import
+        from core.db.qdrant import QdrantConnector
+        from doc_generator.streaming.llm_cache import cached_llm
+
         self.queue_name = queue_name
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
         self.connection = QdrantConnector()
+        # Filled by the steps (any thread), applied by the RabbitMQ consumer
+        self._settlements: Deque[Settlement] = deque()
+        self._executor = ThreadPoolExecutor(max_workers=batch_size, thread_name_prefix="doc-flow")
+        self._architecture_generator = None
+        self._generate_cached: Callable[[dict], Optional[dict]] = MethodType(
+            cached_llm(DocumentGenerationFlow._generate_one), self
+        )
 
     def create_flow(self) -> Dataflow:
         """
         Create Bytewax dataflow for document generation.
-        
+
         Returns:
             Configured Dataflow object
         """
         flow = Dataflow("Document generation pipeline")
 
-        # Step 1: Read from RabbitMQ
-        stream = op.input("input", flow, RabbitMQSource(queue_name=self.queue_name))
+        # Step 1: Read from RabbitMQ (one item per batch of messages)
+        stream = op.input(
+            "input",
+            flow,
+            RabbitMQSource(
+                queue_name=self.queue_name,
+                batch_size=self.batch_size,
+                batch_timeout_ms=self.batch_timeout_ms,
+                settlements=self._settlements,
+            ),
+        )
 
         # Step 2: Parse message
         stream = op.map("parse", stream, self._parse_message)
@@ -75,41 +134,180 @@ class DocumentGenerationFlow:
 
         return flow
 
-    def _parse_message(self, message: dict) -> dict:
-        """Parse RabbitMQ message."""
-        # TODO: Implement message parsing
-        return message
+    def _settle(self, delivery: Delivery, ok: bool, requeue: bool = True) -> None:
+        """Report a message's outcome; a message that already failed once is not requeued again."""
+        tag, redelivered = delivery
+        self._settlements.append((tag, ok, requeue and not redelivered))
 
-    def _analyze_repository(self, message: dict) -> dict:
-        """Analyze repository structure."""
-        # TODO: Implement repository analysis
-        return message
+    def _parse_message(self, messages: List[Tuple[int, bool, bytes]]) -> List[dict]:
+        """Parse a batch of RabbitMQ messages, rejecting malformed ones."""
+        parsed = []
+        for tag, redelivered, body in messages:
+            try:
+                message = json.loads(body)
+            except (TypeError, ValueError) as e:
+                logger.warning("Dropping malformed message", error=str(e))
+                self._settle((tag, redelivered), ok=False, requeue=False)
+                continue
+            if isinstance(message, dict) and message.get("repo_url"):
+                message["_delivery"] = (tag, redelivered)
+                parsed.append(message)
+            else:
+                logger.warning("Dropping message without repo_url")
+                self._settle((tag, redelivered), ok=False, requeue=False)
+        return parsed
+
+    def _keep_successful(self, messages: List[dict], results: List[Optional[dict]]) -> List[dict]:
+        """Drop the messages whose step failed, nacking them."""
+        kept = []
+        for message, result in zip(messages, results):
+            if result is None:
+                self._settle(message["_delivery"], ok=False)
+            else:
+                kept.append(result)
+        return kept
+
+    def _analyze_repository(self, messages: List[dict]) -> List[dict]:
+        """Analyze repository structure for every message in the batch."""
+        return self._keep_successful(messages, list(self._executor.map(self._analyze_one, messages)))
+
+    def _analyze_one(self, message: dict) -> Optional[dict]:
+        from moxi_analyzer import analyze_repository
+
+        try:
+            message["repo_analysis"] = analyze_repository(
+                message["repo_url"],
+                cache_dir=settings.REPO_CACHE_DIR,
+            )
+            return message
+        except Exception as e:
+            logger.error("Failed to analyze repository", url=message["repo_url"], error=str(e))
+            return None
+
+    def _generate_documentation(self, messages: List[dict]) -> List[dict]:
+        """Generate documentation for every message in the batch."""
+        if self._architecture_generator is None:
+            from doc_generator.llm.architecture_gen import ArchitectureGenerator
 
-    def _generate_documentation(self, message: dict) -> dict:
-        """Generate documentation."""
-        # TODO: Implement documentation generation
+            self._architecture_generator = ArchitectureGenerator()
+        return self._keep_successful(messages, list(self._executor.map(self._generate_cached, messages)))
+
+    def _generate_one(self, message: dict) -> Optional[dict]:
+        # Called through the LLM cache (self._generate_cached)
+        content = self._architecture_generator.generate(message["repo_analysis"])
+        if not content:
+            logger.warning("Failed to generate documentation", url=message["repo_url"])
+            return None
+        message["architecture_content"] = content
         return message
 
-    def _evaluate_documentation(self, message: dict) -> dict:
+    def _evaluate_documentation(self, messages: List[dict]) -> List[dict]:
         """Evaluate documentation with Opik."""
         # TODO: Implement Opik evaluation
-        return message
+        return messages
+
+    def _write_to_github(self, messages: List[dict]) -> None:
+        """Write documentation to GitHub, then settle each message."""
+        from doc_generator.writer import write_files_to_repo_via_api
+
+        written = write_files_to_repo_via_api([
+            {
+                "repo_url": message["repo_url"],
+                "content": message["architecture_content"],
+                "file_path": message.get("file_name", "ARCHITECTURE_BY_MOXI.md"),
+            }
+            for message in messages
+        ])
+        for message, ok in zip(messages, written):
+            self._settle(message["_delivery"], ok=ok)
+
+
+class RabbitMQPartition(StatefulSourcePartition):
+    """Single RabbitMQ consumer that emits messages in batches."""
+
+    def __init__(
+        self,
+        queue_name: str,
+        batch_size: int,
+        batch_timeout_ms: int,
+        settlements: Deque[Settlement],
+    ):
+        from core.mq import RabbitMQConnection
+
+        self.queue_name = queue_name
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout_ms / 1000.0
+        self._settlements = settlements
+
+        self.connection = RabbitMQConnection()
+        self.connection.connect()
+        self.channel = self.connection.get_channel()
+        self.channel.queue_declare(queue=queue_name, durable=True)
+        # Messages stay unacked until written: allow one batch in the flow
+        # while the next one is filled
+        self.channel.basic_qos(prefetch_count=2 * batch_size)
+        self._messages = self.channel.consume(
+            queue=queue_name,
+            inactivity_timeout=self.batch_timeout,
+        )
+
+    def next_batch(self) -> List[List[Tuple[int, bool, bytes]]]:
+        """Collect up to batch_size messages or until the timeout expires."""
+        self._apply_settlements()
+
+        batch: List[Tuple[int, bool, bytes]] = []
+        deadline = time.monotonic() + self.batch_timeout
+        for method, _properties, body in self._messages:
+            if method is None:
+                break
+            batch.append((method.delivery_tag, method.redelivered, body))
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                break
+
+        return [batch] if batch else []
+
+    def snapshot(self) -> None:
+        return None
+
+    def close(self) -> None:
+        # Unsettled messages are redelivered by the broker once the channel closes
+        self._apply_settlements()
+        self.channel.cancel()
+        self.connection.close()
 
-    def _write_to_github(self, message: dict) -> None:
-        """Write documentation to GitHub."""
-        # TODO: Implement GitHub writing
-        pass
+    def _apply_settlements(self) -> None:
+        # The steps only queue outcomes: pika channels must be used from this thread
+        while self._settlements:
+            tag, ok, requeue = self._settlements.popleft()
+            if ok:
+                self.channel.basic_ack(delivery_tag=tag)
+            else:
+                self.channel.basic_nack(delivery_tag=tag, requeue=requeue)
 
 
-class RabbitMQSource:
-    """RabbitMQ source for Bytewax (similar to llm-twin-course)."""
+class RabbitMQSource(FixedPartitionedSource):
+    """RabbitMQ source for Bytewax (similar to llm-twin-course), emitting message batches."""
 
-    def __init__(self, queue_name: str):
+    def __init__(
+        self,
+        queue_name: str,
+        batch_size: int = 16,
+        batch_timeout_ms: int = 1000,
+        settlements: Optional[Deque[Settlement]] = None,
+    ):
         self.queue_name = queue_name
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
+        # Outcomes reported by the flow; without one, nothing is ever acked
+        self.settlements: Deque[Settlement] = deque() if settlements is None else settlements
 
-    def __call__(self, flow: Dataflow):
-        """Create RabbitMQ input operator."""
-        # TODO: Implement RabbitMQ input
-        # Similar to llm-twin-course/src/feature_pipeline/data_flow/stream_input.py
-        pass
+    def list_parts(self) -> List[str]:
+        return ["single partition"]
 
+    def build_part(self, step_id: str, for_part: str, resume_state: None) -> RabbitMQPartition:
+        return RabbitMQPartition(
+            queue_name=self.queue_name,
+            batch_size=self.batch_size,
+            batch_timeout_ms=self.batch_timeout_ms,
+            settlements=self.settlements,
+        )
@@ -0,0 +1,223 @@
+"""Two-tier cache for generated docs: exact key in MongoDB, semantic match in Qdrant.
+
+Used by the streaming flow so repeated (or near-identical) runs for a repository
+skip the LLM call entirely. Semantic matches are limited to the same repository,
+and both tiers expire after LLM_CACHE_TTL seconds.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import PurePath
+from typing import Callable, Optional, Tuple
+
+from core import get_logger, settings
+from core.db.mongo import get_db
+
+logger = get_logger(__name__)
+
+# MongoDB collection (exact tier) and Qdrant collection (semantic tier)
+COLL_LLM_RESPONSES = "llm_responses"
+# Entries per line of the embedded tree summary (the embedding model reads at
+# most 512 tokens, so the full file list of a large repository would be cut off)
+SEMANTIC_SUMMARY_ENTRIES = 30
+
+_lock = threading.Lock()
+_collection = None
+# Separate lock: loading the embedding model takes seconds and must not stall the
+# exact tier; a failed load is recorded and not retried in this process
+_semantic_lock = threading.Lock()
+_semantic_tier: Optional[Tuple] = None
+_semantic_error: Optional[str] = None
+
+
+def _get_collection():
+    """Exact-match tier; entries expire after LLM_CACHE_TTL seconds via a TTL index."""
+    global _collection
+    with _lock:
+        if _collection is None:
+            collection = get_db()[COLL_LLM_RESPONSES]
+            collection.create_index("created_at", expireAfterSeconds=settings.LLM_CACHE_TTL)
+            _collection = collection
+        return _collection
+
+
+def _get_semantic_tier():
+    """
+    Embedding model + Qdrant connector, created once per process.
+
+    Returns:
+        (embedder, qdrant), or None if the tier failed to start in this process
+    """
+    global _semantic_tier, _semantic_error
+    with _semantic_lock:
+        if _semantic_tier is None and _semantic_error is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                from core.db.qdrant import QdrantConnector
+
+                # Qdrant first: no point loading the model if it is unreachable
+                qdrant = QdrantConnector()
+                qdrant.create_vector_collection(COLL_LLM_RESPONSES)
+                embedder = SentenceTransformer(settings.EMBEDDING_MODEL_ID,
+                                               device=settings.EMBEDDING_MODEL_DEVICE)
+                _semantic_tier = (embedder, qdrant)
+            except Exception as e:
+                _semantic_error = str(e)
+                logger.warning("LLM cache semantic tier disabled", error=_semantic_error)
+        return _semantic_tier
+
+
+def _file_tree_text(message: dict) -> str:
+    return "\n".join(sorted(str(p) for p in message["repo_analysis"].all_files))
+
+
+def _semantic_text(repo_url: str, message: dict) -> str:
+    """Bounded summary of the file tree to embed: top-level entries and extensions, with counts."""
+    paths = [PurePath(p) for p in message["repo_analysis"].all_files]
+    top_level = Counter(path.parts[0] for path in paths if path.parts)
+    extensions = Counter(path.suffix for path in paths if path.suffix)
+    return "\n".join([
+        repo_url,
+        " ".join(f"{name}:{count}" for name, count in sorted(top_level.most_common(SEMANTIC_SUMMARY_ENTRIES))),
+        " ".join(f"{ext}:{count}" for ext, count in extensions.most_common(SEMANTIC_SUMMARY_ENTRIES)),
+    ])
+
+
+def cache_key(repo_url: str, file_tree: str, model: str) -> str:
+    """SHA-256 over the inputs that determine the generated document."""
+    file_tree_hash = hashlib.sha256(file_tree.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{repo_url}\0{file_tree_hash}\0{model}".encode("utf-8")).hexdigest()
+
+
+def _lookup_exact(key: str) -> Optional[str]:
+    doc = _get_collection().find_one({"_id": key}, {"architecture_content": 1})
+    if doc:
+        logger.debug("LLM cache hit (exact)", key=key[:12])
+        return doc["architecture_content"]
+    return None
+
+
+def _semantic_filter(repo_url: str):
+    """Only this repository's unexpired entries (content must never cross repositories)."""
+    from qdrant_client import models
+
+    return models.Filter(
+        must=[
+            models.FieldCondition(key="repo_url", match=models.MatchValue(value=repo_url)),
+            models.FieldCondition(
+                key="created_at", range=models.Range(gte=time.time() - settings.LLM_CACHE_TTL)
+            ),
+        ]
+    )
+
+
+def _lookup_semantic(qdrant, repo_url: str, embedding: list) -> Optional[str]:
+    hits = qdrant.search(COLL_LLM_RESPONSES, embedding, query_filter=_semantic_filter(repo_url), limit=1)
+    if hits and hits[0].score >= settings.LLM_CACHE_SIMILARITY:
+        logger.debug("LLM cache hit (semantic)", repo_url=repo_url, score=hits[0].score)
+        return hits[0].payload.get("architecture_content")
+    return None
+
+
+def _store_exact(key: str, repo_url: str, content: str) -> None:
+    _get_collection().replace_one(
+        {"_id": key},
+        {
+            "_id": key,
+            "repo_url": repo_url,
+            "architecture_content": content,
+            "created_at": datetime.now(timezone.utc),
+        },
+        upsert=True,
+    )
+
+
+def _store_semantic(qdrant, key: str, embedding: list, repo_url: str, content: str) -> None:
+    from qdrant_client import models
+
+    now = time.time()
+    qdrant.upsert_points(
+        COLL_LLM_RESPONSES,
+        [
+            models.PointStruct(
+                id=str(uuid.UUID(key[:32])),
+                vector=embedding,
+                payload={"repo_url": repo_url, "architecture_content": content, "created_at": now},
+            )
+        ],
+    )
+    # Qdrant has no TTL index: drop expired points as new ones come in
+    qdrant.delete_points(
+        COLL_LLM_RESPONSES,
+        models.Filter(
+            should=[
+                models.FieldCondition(
+                    key="created_at", range=models.Range(lt=now - settings.LLM_CACHE_TTL)
+                ),
+                models.IsEmptyCondition(is_empty=models.PayloadField(key="created_at")),
+            ]
+        ),
+    )
+
+
+def cached_llm(func: Callable[..., Optional[dict]]) -> Callable[..., Optional[dict]]:
+    """
+    Cache a per-message generation step of the streaming flow.
+
+    The wrapped method takes ``(self, message)`` where ``message`` has
+    ``repo_url`` and ``repo_analysis``, and sets ``architecture_content`` on
+    success. Cache backend failures are logged and fall through to the LLM;
+    the exact tier works without the semantic one (no embedder or Qdrant).
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, message: dict) -> Optional[dict]:
+        if not settings.LLM_CACHE_ENABLED:
+            return func(self, message)
+
+        repo_url = message["repo_url"]
+        file_tree = _file_tree_text(message)
+        key = cache_key(repo_url, file_tree, settings.OPENAI_MODEL_ID)
+        try:
+            content = _lookup_exact(key)
+            if content:
+                message["architecture_content"] = content
+                return message
+        except Exception as e:
+            logger.warning("LLM cache lookup failed", tier="exact", error=str(e))
+
+        embedding = None
+        semantic_tier = None
+        try:
+            semantic_tier = _get_semantic_tier()
+            if semantic_tier is not None:
+                embedder, qdrant = semantic_tier
+                embedding = embedder.encode(_semantic_text(repo_url, message)).tolist()
+                content = _lookup_semantic(qdrant, repo_url, embedding)
+                if content:
+                    message["architecture_content"] = content
+                    return message
+        except Exception as e:
+            logger.warning("LLM cache lookup failed", tier="semantic", error=str(e))
+
+        result = func(self, message)
+
+        if result is not None:
+            content = result["architecture_content"]
+            try:
+                _store_exact(key, repo_url, content)
+            except Exception as e:
+                logger.warning("LLM cache store failed", tier="exact", error=str(e))
+            if embedding is not None:
+                try:
+                    _store_semantic(semantic_tier[1], key, embedding, repo_url, content)
+                except Exception as e:
+                    logger.warning("LLM cache store failed", tier="semantic", error=str(e))
+        return result
+
+    return wrapper
@@ -1,10 +1,64 @@
 """Utility functions for document generation."""
 
+import json
+import mmap
+import re
+from contextvars import Context, ContextVar, copy_context
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 from typing import Optional, List
 
+try:
+    import tomllib as _toml  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as _toml
+    except ImportError:
+        _toml = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = None  # Will be initialized when needed
 
+# Fallback pyproject.toml parsing when no TOML library is available
+# (bytes patterns so they can scan an mmap of the file directly)
+_NAME_RE_BYTES = re.compile(rb'name\s*=\s*["\']([^"\']+)["\']')
+_DESC_RE_BYTES = re.compile(rb'description\s*=\s*["\']([^"\']+)["\']')
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+
+# Path parts always left out of the prompt file tree
+_TREE_IGNORE = frozenset({"__pycache__", ".git"})
+
+# Key files bigger than this are only partially read for prompt samples
+MAX_KEY_FILE_BYTES = 256 * 1024
+
+# Shared "Last updated" timestamp for all docs generated in one batch; only set
+# inside the context returned by batch_context(), so concurrent batches don't mix
+_batch_timestamp: ContextVar[Optional[str]] = ContextVar("batch_timestamp", default=None)
+
+
+def batch_context() -> Context:
+    """
+    Copy of the current context with a batch timestamp pinned for current_timestamp().
+    
+    Run a batch's generation steps in it (``context.run(...)``); a Context can
+    only be entered by one thread at a time, so give each concurrent task its
+    own ``context.copy()``.
+    """
+    context = copy_context()
+    context.run(_batch_timestamp.set, datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT))
+    return context
+
+
+def current_timestamp() -> str:
+    """Return the batch timestamp if one is set, else the current UTC time."""
+    return _batch_timestamp.get() or datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
 
 def read_project_metadata(repo_path: Path) -> dict:
     """
@@ -26,11 +80,10 @@ def read_project_metadata(repo_path: Path) -> dict:
     
     # Try pyproject.toml (Python projects)
     pyproject_path = repo_path / "pyproject.toml"
-    if pyproject_path.exists():
+    if pyproject_path.exists() and _toml is not None:
         try:
-            import tomli  # Python 3.11+ has tomllib, but tomli is more compatible
             with open(pyproject_path, "rb") as f:
-                data = tomli.load(f)
+                data = _toml.load(f)
             
             if "project" in data:
                 project = data["project"]
@@ -51,20 +104,19 @@ def read_project_metadata(repo_path: Path) -> dict:
                     metadata["description"] = poetry.get("description")
                 if not metadata["version"]:
                     metadata["version"] = poetry.get("version")
-        except ImportError:
-            # Fallback: simple parsing without tomli
-            try:
-                content = pyproject_path.read_text(encoding="utf-8")
-                # Simple regex-based extraction
-                import re
-                name_match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
+        except Exception:
+            pass
+    elif pyproject_path.exists():
+        # Fallback: simple regex-based extraction without a TOML parser
+        try:
+            with open(pyproject_path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                name_match = _NAME_RE_BYTES.search(mm)
                 if name_match:
-                    metadata["name"] = name_match.group(1)
-                desc_match = re.search(r'description\s*=\s*["\']([^"\']+)["\']', content)
+                    metadata["name"] = name_match.group(1).decode("utf-8", "ignore")
+                desc_match = _DESC_RE_BYTES.search(mm)
                 if desc_match:
-                    metadata["description"] = desc_match.group(1)
-            except Exception:
-                pass
+                    metadata["description"] = desc_match.group(1).decode("utf-8", "ignore")
         except Exception:
             pass
     
@@ -72,9 +124,11 @@ def read_project_metadata(repo_path: Path) -> dict:
     package_json_path = repo_path / "package.json"
     if package_json_path.exists():
         try:
-            import json
-            with open(package_json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if orjson is not None:
+                data = orjson.loads(package_json_path.read_bytes())
+            else:
+                with open(package_json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             if not metadata["name"]:
                 metadata["name"] = data.get("name")
             if not metadata["description"]:
@@ -91,7 +145,12 @@ def read_project_metadata(repo_path: Path) -> dict:
     return metadata
 
 
-def read_key_file_content(repo_path: Path, file_path: Path, max_lines: int = 50) -> Optional[str]:
+def read_key_file_content(
+    repo_path: Path,
+    file_path: Path,
+    max_lines: int = 50,
+    max_bytes: int = MAX_KEY_FILE_BYTES,
+) -> Optional[str]:
     """
     Read content from a key file (limited to avoid token limits).
     
@@ -99,6 +158,7 @@ def read_key_file_content(repo_path: Path, file_path: Path, max_lines: int = 50)
         repo_path: Repository root path
         file_path: Path to file (relative to repo_path or absolute)
         max_lines: Maximum number of lines to read
+        max_bytes: Files larger than this only have their first max_bytes read
         
     Returns:
         File content (first max_lines lines) or None if file doesn't exist
@@ -109,20 +169,24 @@ def read_key_file_content(repo_path: Path, file_path: Path, max_lines: int = 50)
         else:
             full_path = repo_path / file_path
         
-        if not full_path.exists() or not full_path.is_file():
+        if not full_path.is_file():
             return None
         
-        # Read first max_lines
-        lines = []
-        with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-            for i, line in enumerate(f):
-                if i >= max_lines:
-                    break
-                lines.append(line)
+        oversized = full_path.stat().st_size > max_bytes
+        if oversized:
+            # Huge/minified files: one bounded read instead of scanning for newlines
+            with open(full_path, "rb") as f:
+                head = f.read(max_bytes)
+            lines = head.decode("utf-8", "ignore").splitlines(keepends=True)[:max_lines]
+        else:
+            with open(full_path, "r", encoding="utf-8", errors="ignore", buffering=65536) as f:
+                lines = list(islice(f, max_lines))
         
         content = "".join(lines)
         if len(lines) == max_lines:
             content += f"\n... (truncated, showing first {max_lines} lines)"
+        elif oversized:
+            content += f"\n... (truncated, showing first {max_bytes} bytes)"
         
         return content
     except Exception:
@@ -147,45 +211,71 @@ def format_file_tree(all_files: List[Path], max_depth: int = 3, max_files: int =
     # Filter and sort files
     filtered_files = []
     for file_path in all_files:
-        # Skip hidden files and common ignore patterns
         parts = file_path.parts
-        if any(part.startswith('.') and part != '.env.example' for part in parts):
-            continue
-        if '__pycache__' in parts or '.git' in parts:
-            continue
         if len(parts) > max_depth:
             continue
-        filtered_files.append(file_path)
+        # Skip hidden files and common ignore patterns
+        for part in parts:
+            if part in _TREE_IGNORE or (part[:1] == "." and part != ".env.example"):
+                break
+        else:
+            filtered_files.append(file_path)
     
     # Limit number of files
     filtered_files = sorted(filtered_files)[:max_files]
+
+    # Common case: nothing deeper than dir/file, no recursion needed
+    if all(len(f.parts) <= 2 for f in filtered_files):
+        return _format_flat_tree(filtered_files)
     
-    # Build tree structure
-    tree_lines = []
-    seen_dirs = set()
-    
+    # Build a trie of the paths (directories map to dicts, files to None);
+    # insertion order follows the sorted file list
+    root: dict = {}
     for file_path in filtered_files:
+        node = root
+        for part in file_path.parts[:-1]:
+            node = node.setdefault(part, {})
+        node[file_path.parts[-1]] = None
+
+    # Walk it once, like the `tree` command
+    tree_lines = []
+
+    def _walk(node: dict, prefix: str) -> None:
+        last_index = len(node) - 1
+        for index, (name, child) in enumerate(node.items()):
+            is_last = index == last_index
+            connector = "└── " if is_last else "├── "
+            if child is None:
+                tree_lines.append(f"{prefix}{connector}{name}")
+            else:
+                tree_lines.append(f"{prefix}{connector}{name}/")
+                _walk(child, prefix + ("    " if is_last else "│   "))
+
+    _walk(root, "")
+    return "\n".join(tree_lines)
+
+
+def _format_flat_tree(files: List[Path]) -> str:
+    """format_file_tree() output for sorted paths at most two levels deep."""
+    groups: dict = {}
+    for file_path in files:
         parts = file_path.parts
-        indent = ""
-        
-        # Build directory structure
-        for i, part in enumerate(parts[:-1]):
-            dir_path = Path(*parts[:i+1])
-            if dir_path not in seen_dirs:
-                prefix = "├── " if i == 0 else "│   " * i + "├── "
-                tree_lines.append(f"{prefix}{part}/")
-                seen_dirs.add(dir_path)
-        
-        # Add file
         if len(parts) == 1:
-            prefix = ""
+            groups[parts[0]] = None
         else:
-            prefix = "│   " * (len(parts) - 1)
-        prefix += "└── " if file_path == filtered_files[-1] or not any(
-            f.parts[:len(parts)-1] == parts[:-1] and f != file_path 
-            for f in filtered_files[filtered_files.index(file_path)+1:]
-        ) else "├── "
-        
-        tree_lines.append(f"{prefix}{parts[-1]}")
-    
+            groups.setdefault(parts[0], []).append(parts[1])
+
+    tree_lines = []
+    last_index = len(groups) - 1
+    for index, (name, children) in enumerate(groups.items()):
+        if index == last_index:
+            connector, rail = "└── ", "    "
+        else:
+            connector, rail = "├── ", "│   "
+        if children is None:
+            tree_lines.append(connector + name)
+            continue
+        tree_lines.append(f"{connector}{name}/")
+        tree_lines.extend(rail + "├── " + child for child in children[:-1])
+        tree_lines.append(rail + "└── " + children[-1])
     return "\n".join(tree_lines)
@@ -1,15 +1,239 @@
 """Writer module for writing documentation to repositories."""
 
 import base64
-from typing import Optional
+import hashlib
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from core import get_logger, settings
 from core.lib import extract_repo_owner_and_name
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# Shared session: keeps connections to api.github.com alive across calls
+# instead of paying a TCP+TLS handshake per request. The adapter retries only
+# transient 5xx; rate limits (429/403) are left to _request and _RateLimiter
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["GET", "PUT"],
+            raise_on_status=False,
+        ),
+    ),
+)
+_SESSION.headers.update({
+    "Accept": "application/vnd.github.v3+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+})
+
+# Longest single pause for a rate-limit window (seconds) and retries per request
+MAX_RATE_LIMIT_WAIT = 300.0
+RATE_LIMIT_RETRIES = 3
+
+
+class _RateLimiter:
+    """
+    Process-wide pause driven by GitHub's rate-limit response headers.
+    
+    Every response updates the limiter: ``Retry-After`` (secondary limits) or
+    ``X-RateLimit-Remaining: 0`` with ``X-RateLimit-Reset`` (primary limit)
+    block all callers until the window reopens, so concurrent writers back
+    off together instead of each burning requests on 403/429s.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+    
+    def acquire(self) -> None:
+        """Wait while the rate-limit window is closed."""
+        with self._lock:
+            wait = self._blocked_until - time.time()
+        if wait > 0:
+            wait = min(wait, MAX_RATE_LIMIT_WAIT)
+            logger.warning("GitHub rate limit reached, waiting", seconds=round(wait, 1))
+            time.sleep(wait)
+    
+    def update_from_response(self, response: requests.Response, default_wait: float = 0.0) -> None:
+        """Record the window reported by ``response`` (or ``default_wait`` if it has none)."""
+        headers = response.headers
+        until = 0.0
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            until = time.time() + int(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            reset = headers.get("X-RateLimit-Reset")
+            if reset and reset.isdigit():
+                until = float(reset)
+        if not until and default_wait:
+            until = time.time() + default_wait
+        if until:
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, until)
+
+
+_limiter = _RateLimiter()
+
+
+def _is_rate_limited(response: requests.Response) -> bool:
+    return response.status_code == 429 or (
+        response.status_code == 403 and "rate limit" in response.text.lower()
+    )
+
+
+def _request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Send a request on the shared session, pausing and retrying on rate limits."""
+    if orjson is not None and "json" in kwargs:
+        # orjson serializes the large base64 payloads much faster than requests' json.dumps
+        kwargs["data"] = orjson.dumps(kwargs.pop("json"))
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "Content-Type": "application/json"}
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        _limiter.acquire()
+        response = _SESSION.request(method, url, **kwargs)
+        rate_limited = _is_rate_limited(response)
+        _limiter.update_from_response(response, default_wait=2.0 ** attempt if rate_limited else 0.0)
+        if not rate_limited or attempt == RATE_LIMIT_RETRIES:
+            return response
+    return response
+
+
+def _get(url: str, **kwargs: Any) -> requests.Response:
+    return _request("GET", url, **kwargs)
+
+
+def _put(url: str, **kwargs: Any) -> requests.Response:
+    return _request("PUT", url, **kwargs)
+
+
+# Repositories written concurrently by write_files_to_repo_via_api
+MAX_REPO_WRITERS = 8
+
+# Short-lived cache so repeated writes to the same repo within a run skip
+# redundant GETs. Values are (stored_at, value); disable with MOXI_NO_HTTP_CACHE=1
+HTTP_CACHE_TTL = 300  # seconds
+
+# (owner, repo, path, branch) -> blob SHA of the last version we read or wrote
+_sha_cache: Dict[Tuple[str, str, str, str], Tuple[float, str]] = {}
+
+
+def _cache_get(cache: Dict[Any, Tuple[float, Any]], key: Any) -> Any:
+    """Return a cached value younger than HTTP_CACHE_TTL, or None."""
+    if settings.MOXI_NO_HTTP_CACHE:
+        return None
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] > HTTP_CACHE_TTL:
+        cache.pop(key, None)
+        return None
+    return entry[1]
+
+
+def _cache_set(cache: Dict[Any, Tuple[float, Any]], key: Any, value: Any) -> None:
+    if not settings.MOXI_NO_HTTP_CACHE:
+        cache[key] = (time.monotonic(), value)
+
+
+@lru_cache(maxsize=1024)
+def _encode_gh_path(path: str) -> str:
+    """URL-encode each segment of a repository path (GitHub wants them encoded separately)."""
+    return "/".join(quote(part, safe="") for part in path.split("/"))
+
+
+def _git_blob_sha(content_bytes: bytes) -> str:
+    """SHA-1 git (and the Contents API ``sha`` field) uses for a blob of these bytes."""
+    return hashlib.sha1(b"blob %d\0" % len(content_bytes) + content_bytes).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _committer_info() -> Optional[Dict[str, str]]:
+    """
+    Committer name/email from git config, read once per process.
+    
+    Returns None if git or the config values are unavailable, in which case
+    GitHub uses the token owner's info.
+    """
+    try:
+        git_name = subprocess.check_output(
+            ["git", "config", "user.name"], 
+            stderr=subprocess.DEVNULL
+        ).decode("utf-8").strip()
+        git_email = subprocess.check_output(
+            ["git", "config", "user.email"], 
+            stderr=subprocess.DEVNULL
+        ).decode("utf-8").strip()
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    if not git_name or not git_email:
+        return None
+    logger.debug("Using committer info", name=git_name, email=git_email)
+    return {"name": git_name, "email": git_email}
+
+
+def get_default_branch(repo_url: str, github_token: Optional[str] = None) -> Optional[str]:
+    """
+    Look up a repository's default branch over the shared session.
+    
+    Args:
+        repo_url: GitHub repository URL (e.g., "https://github.com/user/repo")
+        github_token: GitHub token (if None, uses settings.GITHUB_TOKEN)
+        
+    Returns:
+        Default branch name, or None if the URL is invalid or the lookup fails
+    """
+    owner, repo = extract_repo_owner_and_name(repo_url)
+    if not owner or not repo:
+        return None
+    token = github_token or settings.GITHUB_TOKEN
+    headers = {"Authorization": f"token {token}"} if token else {}
+    response = _get(f"https://api.github.com/repos/{owner}/{repo}", headers=headers)
+    if response.status_code != 200:
+        return None
+    return response.json().get("default_branch")
+
+
+def _fetch_file_sha(api_url: str, headers: Dict[str, str], branch: str) -> Tuple[bool, Optional[str]]:
+    """
+    GET the blob SHA of a file through the Contents API.
+
+    Returns:
+        (True, sha) if the file exists, (True, None) if it does not,
+        (False, None) if the lookup failed
+    """
+    response = _get(api_url, headers=headers, params={"ref": branch})
+    if response.status_code == 200:
+        return True, response.json().get("sha")
+    if response.status_code == 404:
+        logger.info("File does not exist, will create", api_url=api_url, branch=branch)
+        return True, None
+    logger.error("Failed to check file existence",
+                status_code=response.status_code,
+                branch=branch,
+                response=response.text[:200])
+    return False, None
+
 
 def write_to_repo_via_api(
     repo_url: str,
@@ -59,18 +283,11 @@ def write_to_repo_via_api(
         # GitHub API endpoint
         # URL encode the file path to handle special characters and nested directories
         # Note: GitHub API requires each path segment to be encoded separately
-        from urllib.parse import quote
-        # Split path and encode each segment, then join with /
-        path_parts = file_path.split("/")
-        encoded_parts = [quote(part, safe="") for part in path_parts]
-        encoded_file_path = "/".join(encoded_parts)
+        encoded_file_path = _encode_gh_path(file_path)
         api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{encoded_file_path}"
         
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json",
-            "X-GitHub-Api-Version": "2022-11-28",  # Add API version header
-        }
+        # Accept / API version headers live on the session; the token is per call
+        headers = {"Authorization": f"token {token}"}
         
         logger.debug("API URL constructed", 
                     owner=owner, 
@@ -79,95 +296,27 @@ def write_to_repo_via_api(
                     encoded_path=encoded_file_path,
                     api_url=api_url)
         
-        # Check if file exists (to get SHA for update)
-        # Note: If branch is not specified or invalid, GitHub API uses default branch
-        logger.debug("Checking file existence", file=file_path, branch=branch, url=api_url)
-        response = requests.get(api_url, headers=headers, params={"ref": branch})
-        
-        sha = None
-        if response.status_code == 200:
-            # File exists, get SHA for update
-            sha = response.json().get("sha")
-            logger.info("File exists, will update", file=file_path, branch=branch, sha=sha[:8] if sha else "None")
-        elif response.status_code == 404:
-            # File doesn't exist, will create new
-            # But first, ensure all parent directories exist
-            # GitHub API can't create nested paths directly, so we need to create directories first
-            from pathlib import Path
-            file_path_obj = Path(file_path)
-            
-            # Build list of all parent directories (from root to immediate parent)
-            # e.g., for ".github/workflows/file.yml", we need: [".github", ".github/workflows"]
-            parent_dirs = []
-            current_path = file_path_obj.parent
-            while current_path != Path(".") and current_path != Path("/"):
-                parent_dirs.insert(0, str(current_path))
-                current_path = current_path.parent
-            
-            # Check and create each parent directory if needed
-            for parent_dir in parent_dirs:
-                parent_dir_encoded = "/".join([quote(part, safe="") for part in parent_dir.split("/")])
-                parent_api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{parent_dir_encoded}"
-                parent_response = requests.get(parent_api_url, headers=headers, params={"ref": branch})
-                
-                if parent_response.status_code == 404:
-                    # Directory doesn't exist, create it by creating a .gitkeep file
-                    logger.info("Parent directory doesn't exist, creating it", parent_dir=parent_dir)
-                    gitkeep_path = f"{parent_dir}/.gitkeep"
-                    gitkeep_encoded = "/".join([quote(part, safe="") for part in gitkeep_path.split("/")])
-                    gitkeep_api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{gitkeep_encoded}"
-                    gitkeep_content = base64.b64encode(b"# Directory created by Moxi\n").decode("utf-8")
-                    gitkeep_data = {
-                        "message": f"chore: Create {parent_dir} directory",
-                        "content": gitkeep_content,
-                        "branch": branch,
-                    }
-                    gitkeep_response = requests.put(gitkeep_api_url, headers=headers, json=gitkeep_data)
-                    if gitkeep_response.status_code not in [200, 201]:
-                        logger.warning("Failed to create parent directory",
-                                     parent_dir=parent_dir,
-                                     status_code=gitkeep_response.status_code,
-                                     response=gitkeep_response.text[:200])
-                        # Continue anyway - maybe the directory was created by another process
-                    else:
-                        logger.info("Successfully created parent directory", parent_dir=parent_dir)
-                elif parent_response.status_code == 200:
-                    # Check if response is a directory (array) or a file (object)
-                    parent_data = parent_response.json()
-                    if isinstance(parent_data, list):
-                        # It's a directory (array of files)
-                        logger.debug("Parent directory already exists", parent_dir=parent_dir)
-                    elif isinstance(parent_data, dict):
-                        # It's a file, not a directory - this shouldn't happen for a directory path
-                        logger.warning("Parent path points to a file, not a directory",
-                                     parent_dir=parent_dir,
-                                     file_name=parent_data.get("name"))
-                        # This is unusual, but we'll continue anyway
-                    else:
-                        logger.debug("Parent directory already exists", parent_dir=parent_dir)
-                else:
-                    logger.warning("Unexpected status when checking parent directory",
-                                 parent_dir=parent_dir,
-                                 status_code=parent_response.status_code)
-            
-            logger.info("File does not exist, will create", file=file_path, branch=branch)
-        else:
-            logger.error("Failed to check file existence", 
-                        status_code=response.status_code,
-                        branch=branch,
-                        response=response.text[:200])
-            return False
+        # Optimistic write only when the blob SHA of the last write of this path
+        # is cached: PUT straight away and GET the current SHA if GitHub rejects
+        # it (the "sha" field is the only precondition the Contents API checks).
+        # Without a cached SHA, GET first so an unchanged file is never uploaded
+        # and an existing one is not rejected for a missing SHA
+        cache_key = (owner, repo, file_path, branch)
+        sha = _cache_get(_sha_cache, cache_key)
+        optimistic = sha is not None
+        if not optimistic:
+            found, sha = _fetch_file_sha(api_url, headers, branch)
+            if not found:
+                return False
+            if sha:
+                _cache_set(_sha_cache, cache_key, sha)
         
         # Encode content to base64
         content_bytes = content.encode("utf-8")
-        content_base64 = base64.b64encode(content_bytes).decode("utf-8")
+        content_base64 = base64.b64encode(content_bytes).decode("ascii")
+        blob_sha = _git_blob_sha(content_bytes)
         
-        # Prepare commit message
-        if not commit_message:
-            if sha:
-                commit_message = f"docs: Auto-update {file_path} using Moxi"
-            else:
-                commit_message = f"docs: Auto-generate {file_path} using Moxi"
+        auto_message = not commit_message
         
         # Prepare request data
         data = {
@@ -176,53 +325,74 @@ def write_to_repo_via_api(
             "branch": branch,
         }
         
-        if sha:
-            data["sha"] = sha
-        
         # Add committer information (recommended by GitHub API docs)
         # This may be required for certain directories like .github
-        # Try to get committer info from git config, or use defaults
-        try:
-            import subprocess
-            git_name = subprocess.check_output(
-                ["git", "config", "user.name"], 
-                stderr=subprocess.DEVNULL
-            ).decode("utf-8").strip()
-            git_email = subprocess.check_output(
-                ["git", "config", "user.email"], 
-                stderr=subprocess.DEVNULL
-            ).decode("utf-8").strip()
-            if git_name and git_email:
-                data["committer"] = {
-                    "name": git_name,
-                    "email": git_email,
-                }
-                logger.debug("Added committer info", name=git_name, email=git_email)
-        except Exception:
-            # If git config is not available, use defaults
-            # GitHub will use the token owner's info if not provided
-            pass
+        committer = _committer_info()
+        if committer:
+            data["committer"] = committer
         
-        # Create or update file
-        logger.info("Writing file", 
-                   file=file_path, 
-                   branch=branch, 
-                   has_sha=sha is not None,
-                   api_url=api_url,
-                   encoded_path=encoded_file_path)
-        logger.debug("Request data", 
-                    message=data.get("message"),
-                    content_length=len(data.get("content", "")),
-                    has_sha="sha" in data)
-        
-        response = requests.put(api_url, headers=headers, json=data)
+        for attempt in range(2 if optimistic else 1):
+            # GitHub's "sha" is the git blob SHA, so identical content needs no commit
+            if sha == blob_sha:
+                logger.info("No change, skipping write", file=file_path, branch=branch, sha=sha[:8])
+                return True
+            
+            # Prepare commit message
+            if auto_message:
+                if sha:
+                    data["message"] = f"docs: Auto-update {file_path} using Moxi"
+                else:
+                    data["message"] = f"docs: Auto-generate {file_path} using Moxi"
+            if sha:
+                data["sha"] = sha
+            else:
+                data.pop("sha", None)
+            
+            # Create or update file
+            logger.info("Writing file", 
+                       file=file_path, 
+                       branch=branch, 
+                       has_sha=sha is not None,
+                       attempt=attempt + 1,
+                       api_url=api_url,
+                       encoded_path=encoded_file_path)
+            logger.debug("Request data", 
+                        message=data.get("message"),
+                        content_length=len(data.get("content", "")),
+                        has_sha="sha" in data)
+            
+            response = _put(api_url, headers=headers, json=data)
+            if response.status_code in [200, 201]:
+                break
+            # 409/422: stale cached SHA
+            if attempt or response.status_code not in (409, 422):
+                break
+            
+            logger.warning("Write rejected, refreshing SHA",
+                         file=file_path,
+                         branch=branch,
+                         status_code=response.status_code)
+            found, latest_sha = _fetch_file_sha(api_url, headers, branch)
+            if not found:
+                break
+            if latest_sha:
+                _cache_set(_sha_cache, cache_key, latest_sha)
+            else:
+                _sha_cache.pop(cache_key, None)
+            logger.info("Retrying with latest SHA", old_sha=sha[:8] if sha else "None",
+                       new_sha=latest_sha[:8] if latest_sha else "None")
+            sha = latest_sha
         
         if response.status_code in [200, 201]:
+            response_data = response.json()
+            new_sha = response_data.get("content", {}).get("sha")
+            if new_sha:
+                _cache_set(_sha_cache, cache_key, new_sha)
             logger.info("Successfully wrote to repository",
                        repo_url=repo_url,
                        file=file_path,
                        branch=branch,
-                       commit_url=response.json().get("commit", {}).get("html_url"))
+                       commit_url=response_data.get("commit", {}).get("html_url"))
             return True
         else:
             error_response = response.text[:500] if response.text else "No response body"
@@ -237,29 +407,6 @@ def write_to_repo_via_api(
             # Check for common permission issues
             if response.status_code == 409:
                 # 409 Conflict: SHA mismatch - file was modified
-                # Try to get the latest SHA and retry
-                logger.warning("SHA mismatch (409 Conflict), retrying with latest SHA",
-                             file=file_path,
-                             branch=branch)
-                # Get latest SHA
-                get_response = requests.get(api_url, headers=headers, params={"ref": branch})
-                if get_response.status_code == 200:
-                    latest_sha = get_response.json().get("sha")
-                    if latest_sha and latest_sha != sha:
-                        logger.info("Retrying with latest SHA", old_sha=sha[:8] if sha else "None", new_sha=latest_sha[:8])
-                        data["sha"] = latest_sha
-                        # Retry once
-                        retry_response = requests.put(api_url, headers=headers, json=data)
-                        if retry_response.status_code in [200, 201]:
-                            logger.info("Successfully wrote to repository after retry",
-                                       repo_url=repo_url,
-                                       file=file_path,
-                                       branch=branch)
-                            return True
-                        else:
-                            logger.error("Retry also failed",
-                                       status_code=retry_response.status_code,
-                                       response=retry_response.text[:200])
                 logger.error("Failed to write to repository - SHA mismatch (409 Conflict)",
                             repo_url=repo_url,
                             file=file_path,
@@ -278,7 +425,7 @@ def write_to_repo_via_api(
                                 error_message=error_message,
                                 api_url=api_url,
                                 encoded_path=encoded_file_path,
-                                hint="GitHub may have special restrictions for .github directory. Try: 1) Ensure directory exists, 2) Check if file already exists with different name, 3) Verify branch name is correct")
+                                hint="GitHub may have special restrictions for .github directory. Try: 1) Ensure token has 'workflow' scope, 2) Check if file already exists with different name, 3) Verify branch name is correct")
                 elif "Not Found" in error_message:
                     logger.error("Failed to write to repository - Possible causes:",
                                 repo_url=repo_url,
@@ -288,7 +435,7 @@ def write_to_repo_via_api(
                                 error_message=error_message,
                                 api_url=api_url,
                                 encoded_path=encoded_file_path,
-                                hint="Check: 1) Token has 'repo' scope (not just 'public_repo'), 2) Branch exists, 3) Token has write permissions, 4) Parent directory exists")
+                                hint="Check: 1) Token has 'repo' scope (not just 'public_repo'), 2) Branch exists, 3) Token has write permissions")
                 else:
                     logger.error("Failed to write to repository",
                                 repo_url=repo_url,
@@ -322,6 +469,190 @@ def write_to_repo_via_api(
         return False
 
 
+def write_files_to_repo_via_api(
+    files: List[Dict[str, str]],
+    branch: str = "main",
+    github_token: Optional[str] = None,
+    max_workers: int = MAX_REPO_WRITERS,
+) -> List[bool]:
+    """
+    Write many files, possibly to many repositories, using GitHub API.
+    
+    Different repositories are written concurrently over the shared session.
+    A repository with a single file goes through the Contents API; several
+    files for the same repository go into one commit through the Git Data API
+    (write_files_as_single_commit), so they succeed or fail together.
+    
+    Args:
+        files: Dicts with "repo_url", "file_path", "content" and an optional
+            "commit_message"
+        branch: Branch name (default: "main")
+        github_token: GitHub token (if None, uses settings.GITHUB_TOKEN)
+        max_workers: Maximum number of repositories written at once
+        
+    Returns:
+        One success flag per entry of ``files``, in the same order
+    """
+    by_repo: Dict[str, List[int]] = {}
+    for index, file in enumerate(files):
+        by_repo.setdefault(file["repo_url"], []).append(index)
+    
+    results = [False] * len(files)
+    
+    def _write_repo(indices: List[int]) -> None:
+        if len(indices) == 1:
+            file = files[indices[0]]
+            results[indices[0]] = write_to_repo_via_api(
+                repo_url=file["repo_url"],
+                content=file["content"],
+                file_path=file.get("file_path", "ARCHITECTURE_BY_MOXI.md"),
+                branch=branch,
+                commit_message=file.get("commit_message"),
+                github_token=github_token,
+            )
+            return
+        repo_files = [files[index] for index in indices]
+        ok = write_files_as_single_commit(
+            repo_url=repo_files[0]["repo_url"],
+            files=[(file.get("file_path", "ARCHITECTURE_BY_MOXI.md"), file["content"]) for file in repo_files],
+            branch=branch,
+            commit_message=next((file["commit_message"] for file in repo_files if file.get("commit_message")), None),
+            github_token=github_token,
+        )
+        for index in indices:
+            results[index] = ok
+    
+    if by_repo:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(by_repo)),
+                                thread_name_prefix="repo-write") as executor:
+            list(executor.map(_write_repo, by_repo.values()))
+    return results
+
+
+def write_files_as_single_commit(
+    repo_url: str,
+    files: List[Tuple[str, str]],
+    branch: str = "main",
+    commit_message: Optional[str] = None,
+    github_token: Optional[str] = None,
+) -> bool:
+    """
+    Write several files to a repository as one commit using the Git Data API.
+    
+    Takes a fixed four requests however many files there are: read the
+    branch ref, build a tree on top of the branch's tree with the new file
+    contents inline, create a commit, and move the ref. It needs no
+    per-file SHA lookups and creates no directories first. If the tree
+    comes out unchanged, the commit is skipped.
+    
+    Args:
+        repo_url: GitHub repository URL (e.g., "https://github.com/user/repo")
+        files: (path in repository, content) pairs
+        branch: Branch name (default: "main")
+        commit_message: Commit message (default: auto-generated)
+        github_token: GitHub token (if None, uses settings.GITHUB_TOKEN)
+        
+    Returns:
+        True if successful (or nothing changed), False otherwise
+    """
+    try:
+        token = github_token or settings.GITHUB_TOKEN
+        if not token:
+            logger.error("GitHub token is required for writing to repository")
+            return False
+        if not files:
+            return True
+        
+        owner, repo = extract_repo_owner_and_name(repo_url)
+        if not owner or not repo:
+            logger.error("Invalid repository URL", url=repo_url)
+            return False
+        
+        git_url = f"https://api.github.com/repos/{owner}/{repo}/git"
+        headers = {"Authorization": f"token {token}"}
+        
+        # 1. Current head of the branch and its tree
+        ref_response = _get(f"{git_url}/ref/heads/{branch}", headers=headers)
+        if ref_response.status_code != 200:
+            logger.error("Failed to read branch ref",
+                        repo_url=repo_url,
+                        branch=branch,
+                        status_code=ref_response.status_code,
+                        response=ref_response.text[:200])
+            return False
+        head_sha = ref_response.json()["object"]["sha"]
+        commit_response = _get(f"{git_url}/commits/{head_sha}", headers=headers)
+        if commit_response.status_code != 200:
+            logger.error("Failed to read head commit",
+                        repo_url=repo_url,
+                        sha=head_sha[:8],
+                        status_code=commit_response.status_code)
+            return False
+        base_tree_sha = commit_response.json()["tree"]["sha"]
+        
+        # 2. New tree with every file inline (no separate blob uploads)
+        tree_response = _request("POST", f"{git_url}/trees", headers=headers, json={
+            "base_tree": base_tree_sha,
+            "tree": [
+                {"path": path, "mode": "100644", "type": "blob", "content": content}
+                for path, content in files
+            ],
+        })
+        if tree_response.status_code != 201:
+            logger.error("Failed to create tree",
+                        repo_url=repo_url,
+                        status_code=tree_response.status_code,
+                        response=tree_response.text[:200])
+            return False
+        tree_sha = tree_response.json()["sha"]
+        if tree_sha == base_tree_sha:
+            logger.info("No change, skipping commit", repo_url=repo_url, branch=branch, files=len(files))
+            return True
+        
+        # 3. Commit on top of the current head
+        if not commit_message:
+            commit_message = f"docs: Auto-update {', '.join(path for path, _ in files)} using Moxi"
+        commit_data = {"message": commit_message, "tree": tree_sha, "parents": [head_sha]}
+        committer = _committer_info()
+        if committer:
+            commit_data["committer"] = committer
+        new_commit_response = _request("POST", f"{git_url}/commits", headers=headers, json=commit_data)
+        if new_commit_response.status_code != 201:
+            logger.error("Failed to create commit",
+                        repo_url=repo_url,
+                        status_code=new_commit_response.status_code,
+                        response=new_commit_response.text[:200])
+            return False
+        new_commit = new_commit_response.json()
+        
+        # 4. Fast-forward the branch (fails if someone pushed in between)
+        ref_update = _request("PATCH", f"{git_url}/refs/heads/{branch}", headers=headers,
+                              json={"sha": new_commit["sha"], "force": False})
+        if ref_update.status_code != 200:
+            logger.error("Failed to update branch",
+                        repo_url=repo_url,
+                        branch=branch,
+                        status_code=ref_update.status_code,
+                        response=ref_update.text[:200],
+                        hint="The branch may have moved while committing; retry the write.")
+            return False
+        
+        # Cached per-file SHAs are stale now
+        for path, _ in files:
+            _sha_cache.pop((owner, repo, path, branch), None)
+        
+        logger.info("Successfully wrote files to repository",
+                   repo_url=repo_url,
+                   branch=branch,
+                   files=len(files),
+                   commit_url=new_commit.get("html_url"))
+        return True
+    
+    except Exception as e:
+        logger.error("Error writing to repository", error=str(e))
+        return False
+
+
 def write_to_local(
     file_path: str,
     content: str,
@@ -337,12 +668,10 @@ def write_to_local(
         True if successful, False otherwise
     """
     try:
-        from pathlib import Path
-        
         path = Path(file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        path.write_text(content, encoding="utf-8")
+        path.write_bytes(content.encode("utf-8"))
         
         logger.info("Successfully wrote to local file", file=file_path)
         return True
@@ -350,4 +679,3 @@ def write_to_local(
     except Exception as e:
         logger.error("Error writing to local file", file=file_path, error=str(e))
         return False
-
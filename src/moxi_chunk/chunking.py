@@ -2,16 +2,42 @@
 
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Literal
 
 from core import get_logger, settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
 DATA_DIR = Path(settings.DATA_DIR)  # data/ (collection, chunks, sft)
 ROOT = DATA_DIR.parent
 
+# Below this many documents, chunk in-process (pool startup costs more than it saves)
+PARALLEL_MIN_DOCS = 500
+
+# Sentence end followed by whitespace, or a paragraph break
+_SENT_RE = re.compile(r"(?<=[.!?])\s+|\n\n+")
+
+
+def _iter_sentences(text: str):
+    """Yield the stripped, non-empty pieces between _SENT_RE boundaries."""
+    start = 0
+    for match in _SENT_RE.finditer(text):
+        part = text[start:match.start()].strip()
+        if part:
+            yield part
+        start = match.end()
+    part = text[start:].strip()
+    if part:
+        yield part
+
 
 def chunk_by_sentences(
     text: str,
@@ -23,12 +49,10 @@ def chunk_by_sentences(
         return []
     if len(text) <= max_length:
         return [text] if len(text) >= min_length else [text]
-    parts = re.split(r"(?<=[.!?])\s+|\n\n+", text)
-    parts = [p.strip() for p in parts if p.strip()]
     chunks = []
     current = []
     current_len = 0
-    for p in parts:
+    for p in _iter_sentences(text):
         need = len(p) + (1 if current else 0)
         if current_len + need <= max_length:
             current.append(p)
@@ -53,22 +77,30 @@ def chunk_by_sentences(
     return chunks
 
 
+def _chunk_one(doc: dict, min_length: int, max_length: int) -> tuple[dict, list[str]]:
+    """
+    Chunk one collection document (top-level so it pickles for the pool).
+    Returns the per-repo fields once plus the chunks; _expand_features builds the features.
+    """
+    base = {
+        "file_tree": doc.get("file_tree") or [],
+        "repo_url": doc.get("repo_url") or "",
+        "project_type": doc.get("project_type") or "unknown",
+        "owner": doc.get("owner") or "",
+        "repo": doc.get("repo") or "",
+    }
+    return base, chunk_by_sentences(doc.get("readme") or "", min_length=min_length, max_length=max_length)
+
+
+def _expand_features(features: list[dict], base: dict, chunks: list[str]) -> None:
+    features.extend({"chunk": ch, **base} for ch in chunks)
+
+
 def load_collection_from_mongo() -> list[dict]:
     """Load readme_samples from MongoDB."""
-    from core.db.mongo import find_readme_samples
-
-    out = []
-    skip = 0
-    limit = 200
-    while True:
-        batch = find_readme_samples(skip=skip, limit=limit)
-        if not batch:
-            break
-        out.extend(batch)
-        skip += limit
-        if len(batch) < limit:
-            break
-    return out
+    from core.db.mongo import iter_readme_samples
+
+    return list(iter_readme_samples())
 
 
 def load_collection_from_json(path: Path) -> list[dict]:
@@ -88,9 +120,11 @@ def run_chunking(
     max_length: int = 2000,
     source: Literal["mongo", "json", "auto"] = "auto",
     json_path: str | None = None,
+    workers: int | None = None,
 ) -> tuple[int, str]:
     """
     Read collection (Mongo or JSON), chunk READMEs, write features to output_path.
+    Chunking runs on `workers` processes (None: one per CPU, 1: in-process).
     Returns (num_chunks, absolute_output_path).
     """
     docs: list[dict] = []
@@ -114,29 +148,38 @@ def run_chunking(
     if not docs:
         raise RuntimeError("No collection data. Run collection first (e.g. collect_awesome_readme_data.py).")
 
+    chunk = partial(_chunk_one, min_length=min_length, max_length=max_length)
     features = []
-    for doc in docs:
-        readme = doc.get("readme") or ""
-        file_tree = doc.get("file_tree") or []
-        repo_url = doc.get("repo_url") or ""
-        project_type = doc.get("project_type") or "unknown"
-        owner = doc.get("owner") or ""
-        repo = doc.get("repo") or ""
-        for ch in chunk_by_sentences(readme, min_length=min_length, max_length=max_length):
-            features.append({
-                "chunk": ch,
-                "file_tree": file_tree,
-                "repo_url": repo_url,
-                "project_type": project_type,
-                "owner": owner,
-                "repo": repo,
-            })
+    if workers == 1 or len(docs) < PARALLEL_MIN_DOCS:
+        for doc in docs:
+            _expand_features(features, *chunk(doc))
+    else:
+        # CPU-bound string work: spread documents over processes, keep I/O here
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for base, chunks in executor.map(chunk, docs, chunksize=64):
+                _expand_features(features, base, chunks)
 
     out = Path(output_path)
     if not out.is_absolute():
         out = ROOT / out
     out.parent.mkdir(parents=True, exist_ok=True)
-    with open(out, "w", encoding="utf-8") as f:
-        json.dump({"features": features, "num_chunks": len(features)}, f, indent=2, ensure_ascii=False)
+    _write_features(out, features)
 
     return len(features), str(out)
+
+
+def _write_features(out: Path, features: list[dict]) -> None:
+    """Write features as JSONL (one per line) for *.jsonl, else as {"features", "num_chunks"} JSON."""
+    if out.suffix == ".jsonl":
+        with open(out, "wb") as f:
+            for feat in features:
+                if orjson is not None:
+                    f.write(orjson.dumps(feat))
+                else:
+                    f.write(json.dumps(feat, ensure_ascii=False).encode("utf-8"))
+                f.write(b"\n")
+    elif orjson is not None:
+        out.write_bytes(orjson.dumps({"features": features, "num_chunks": len(features)}))
+    else:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump({"features": features, "num_chunks": len(features)}, f, indent=2, ensure_ascii=False)
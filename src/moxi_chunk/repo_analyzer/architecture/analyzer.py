@@ -1,14 +1,137 @@
 """Architecture analyzer using deep code analysis (not just keywords)."""
 
 import ast
+import hashlib
+import mmap
+import multiprocessing
+import os
+import pickle
 import re
-from typing import Dict, List, Set, Tuple
-
-from core import get_logger
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Final, Iterable, List, Optional, Set, Tuple
+
+from core import get_logger, settings
 from moxi_chunk.repo_analyzer.models import RepositoryInfo
 
 logger = get_logger(__name__)
 
+# Below this many Python files, parse in-process (pool dispatch costs more than it saves)
+PARALLEL_MIN_FILES = 50
+# Files at least this large are memory-mapped instead of read into a bytes copy
+MMAP_MIN_BYTES = 1 << 16
+# Upper bound on parse processes; concurrent analyses (batch clones, streaming
+# workers) share the one pool rather than each adding processes
+MAX_PARSE_WORKERS = 8
+
+# Shared by every analysis in the process (created on first use)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Bump whenever _analyze_file_deep()/_analyze_content() output changes: a cache
+# written by another version is dropped on open (stored as PRAGMA user_version)
+ANALYSIS_CACHE_VERSION = 2
+# Most per-file analyses kept; the least recently stored ones are pruned first
+# (rows are keyed by absolute path, so every clone location adds its own)
+ANALYSIS_CACHE_MAX_ENTRIES = 100000
+# Rows stored between two prunes within one process
+_PRUNE_EVERY = 10000
+
+# Per-process connection to the on-disk analysis cache (see _analyze_file_cached)
+_cache_conn: Optional[sqlite3.Connection] = None
+_cache_pid: Optional[int] = None
+_cache_lock = threading.Lock()
+_stores_since_prune = 0
+# Connections inherited through fork() must not be used, nor closed (closing can
+# checkpoint/remove the parent's WAL); keep them referenced instead
+_inherited_cache_conns: List[sqlite3.Connection] = []
+
+
+def _reset_cache_after_fork() -> None:
+    # The parent's lock may have been held by another thread at fork time
+    global _cache_lock
+    _cache_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_cache_after_fork)
+
+
+def _prune_cache(conn: sqlite3.Connection) -> None:
+    """Drop the oldest analyses beyond ANALYSIS_CACHE_MAX_ENTRIES."""
+    with conn:
+        conn.execute(
+            "DELETE FROM analyses WHERE path NOT IN "
+            "(SELECT path FROM analyses ORDER BY stored_at DESC LIMIT ?)",
+            (ANALYSIS_CACHE_MAX_ENTRIES,),
+        )
+
+
+def _get_cache(cache_path: str) -> sqlite3.Connection:
+    """Open (once per process) the SQLite cache of per-file analyses."""
+    global _cache_conn, _cache_pid
+    if _cache_conn is not None and _cache_pid != os.getpid():
+        _inherited_cache_conns.append(_cache_conn)
+        _cache_conn = None
+    if _cache_conn is None:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != ANALYSIS_CACHE_VERSION:
+                conn.execute("DROP TABLE IF EXISTS analyses")
+                conn.execute(f"PRAGMA user_version = {ANALYSIS_CACHE_VERSION}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses "
+                "(path TEXT PRIMARY KEY, hash BLOB NOT NULL, result BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+        _prune_cache(conn)
+        _cache_conn = conn
+        _cache_pid = os.getpid()
+    return _cache_conn
+
+
+def _store_cached(cache_path: str, entries: List[Tuple[str, bytes, bytes]]) -> None:
+    """Write (path, hash, pickled result) rows, replacing entries for changed files."""
+    global _stores_since_prune
+    if not entries:
+        return
+    try:
+        with _cache_lock:
+            conn = _get_cache(cache_path)
+            stored_at = time.time()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)",
+                    [(*entry, stored_at) for entry in entries],
+                )
+            _stores_since_prune += len(entries)
+            if _stores_since_prune >= _PRUNE_EVERY:
+                _stores_since_prune = 0
+                _prune_cache(conn)
+    except sqlite3.Error as e:
+        logger.debug("Failed to update analysis cache", error=str(e))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Never fork: this process runs clone/HTTP/LLM threads whose locks a
+            # forked child would inherit mid-use
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, MAX_PARSE_WORKERS),
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _pool
+
 
 def analyze_architecture_with_rules(repo_analysis: RepositoryInfo) -> Dict:
     """
@@ -30,12 +153,24 @@ def analyze_architecture_with_rules(repo_analysis: RepositoryInfo) -> Dict:
     connections = []
     
     # Analyze each Python file individually to understand its role
-    file_analyses = []
-    for file_path in repo_analysis.all_files:
-        if file_path.suffix == ".py":
-            analysis = _analyze_file_deep(repo_analysis.path, file_path)
-            if analysis:
-                file_analyses.append(analysis)
+    # (CPU-bound AST work, so large repos are spread over processes); unchanged
+    # files are answered from the on-disk cache without parsing
+    py_files = repo_analysis.py_files
+    cache_path = settings.ANALYSIS_CACHE_PATH
+    analyses: Iterable[Optional[Dict]]
+    if cache_path:
+        if len(py_files) < PARALLEL_MIN_FILES:
+            results = [_analyze_file_cached(repo_analysis.path, file_path, cache_path) for file_path in py_files]
+        else:
+            results = list(_get_pool().map(_analyze_file_cached, repeat(repo_analysis.path), py_files,
+                                           repeat(cache_path), chunksize=32))
+        _store_cached(cache_path, [miss for _, miss in results if miss])
+        analyses = (analysis for analysis, _ in results)
+    elif len(py_files) < PARALLEL_MIN_FILES:
+        analyses = (_analyze_file_deep(repo_analysis.path, file_path) for file_path in py_files)
+    else:
+        analyses = _get_pool().map(_analyze_file_deep, repeat(repo_analysis.path), py_files, chunksize=32)
+    file_analyses = [analysis for analysis in analyses if analysis]
     
     # Aggregate findings from all files
     api_files = []
@@ -44,10 +179,12 @@ def analyze_architecture_with_rules(repo_analysis: RepositoryInfo) -> Dict:
     model_files = []
     cache_files = []
     queue_files = []
+    import_targets = _ImportTargetIndex(file_analyses)
+    # Many files import the same kinds of component; keep each edge once
+    seen_connections: Set[Tuple[str, str]] = set()
     
     for file_analysis in file_analyses:
         file_type = file_analysis.get('type')
-        file_path = file_analysis.get('path')
         
         if file_type == 'api_server':
             api_files.append(file_analysis)
@@ -64,8 +201,9 @@ def analyze_architecture_with_rules(repo_analysis: RepositoryInfo) -> Dict:
         
         # Extract connections from imports
         for imp in file_analysis.get('imports', []):
-            target_type = _classify_import_target(imp, file_analyses)
-            if target_type and file_type:
+            target_type = import_targets.classify(imp)
+            if target_type and file_type and (file_type, target_type) not in seen_connections:
+                seen_connections.add((file_type, target_type))
                 connections.append({
                     "from": file_type,
                     "to": target_type,
@@ -133,7 +271,7 @@ def analyze_architecture_with_rules(repo_analysis: RepositoryInfo) -> Dict:
     }
 
 
-def _analyze_file_deep(repo_path, file_path) -> Dict:
+def _analyze_file_deep(repo_path, file_path) -> Optional[Dict[str, Any]]:
     """
     Deep analysis of a single Python file.
     
@@ -148,158 +286,304 @@ def _analyze_file_deep(repo_path, file_path) -> Dict:
         Dict with file type, imports, and evidence
     """
     try:
-        full_path = repo_path / file_path
-        if not full_path.exists():
-            return None
-        
-        content = full_path.read_text(encoding="utf-8", errors="ignore")
-        
-        # Try to parse AST
+        # The file list comes from a fresh walk, so a missing file is the
+        # rare case: open directly instead of stat()ing first
         try:
-            tree = ast.parse(content)
-        except SyntaxError:
-            # If AST parsing fails, fall back to regex analysis
-            return _analyze_file_regex(content, file_path)
-        
-        file_type = None
-        imports = []
-        evidence = []
-        
-        # Analyze AST nodes
-        for node in ast.walk(tree):
-            # Extract imports
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for alias in node.names:
-                    imports.append(f"{module}.{alias.name}")
-            
-            # Check for API route decorators
-            if isinstance(node, ast.FunctionDef):
-                for decorator in node.decorator_list:
-                    decorator_str = _ast_to_string(decorator)
-                    if _is_api_decorator(decorator_str):
-                        file_type = 'api_server'
-                        evidence.append(f"Found API decorator: {decorator_str}")
-            
-            # Check for SQLAlchemy models
-            if isinstance(node, ast.ClassDef):
-                # Check if class inherits from SQLAlchemy Base
-                for base in node.bases:
-                    base_str = _ast_to_string(base)
-                    if 'Base' in base_str or 'db.Model' in base_str or 'DeclarativeBase' in base_str:
-                        file_type = 'model'
-                        evidence.append(f"Found model class: {node.name}")
-                
-                # Check for SQLAlchemy Column definitions
-                for item in node.body:
-                    if isinstance(item, ast.Assign):
-                        for target in item.targets:
-                            target_str = _ast_to_string(target)
-                            if 'Column' in content or 'relationship' in content:
-                                if file_type != 'model':
-                                    file_type = 'model'
-                                    evidence.append(f"Found SQLAlchemy Column in {node.name}")
-            
-            # Check for database connections
-            if isinstance(node, ast.Call):
-                call_str = _ast_to_string(node)
-                if _is_database_call(call_str, content):
-                    if not file_type:
-                        file_type = 'database'
-                    evidence.append(f"Found database connection: {call_str}")
-            
-            # Check for cache usage
-            if isinstance(node, (ast.Call, ast.Attribute)):
-                node_str = _ast_to_string(node)
-                if _is_cache_usage(node_str):
-                    if not file_type:
-                        file_type = 'cache'
-                    evidence.append(f"Found cache usage: {node_str}")
-        
-        # If no type detected from AST, try regex fallback
-        if not file_type:
-            regex_result = _analyze_file_regex(content, file_path)
-            if regex_result:
-                file_type = regex_result.get('type')
-                evidence.extend(regex_result.get('evidence', []))
-        
-        if file_type:
-            return {
-                "path": str(file_path),
-                "type": file_type,
-                "imports": imports,
-                "evidence": evidence
-            }
+            raw = _read_source(repo_path / file_path)
+        except FileNotFoundError:
+            return None
         
-        return None
+        content = str(raw, "utf-8", "ignore")
+        return _analyze_content(content, file_path)
         
     except Exception as e:
         logger.debug("Error analyzing file", file=str(file_path), error=str(e))
         return None
 
 
-def _analyze_file_regex(content: str, file_path) -> Dict:
+def _analyze_file_cached(repo_path, file_path, cache_path: str) -> Tuple[Optional[Dict], Optional[Tuple[str, bytes, bytes]]]:
+    """
+    _analyze_file_deep() backed by the on-disk cache, keyed by path and content hash.
+    
+    Returns:
+        (analysis, cache row to store on a miss or None on a hit)
+    """
+    full_path = repo_path / file_path
+    try:
+        raw = _read_source(full_path)
+    except OSError:
+        return None, None
+    key = str(full_path)
+    digest = hashlib.blake2b(raw, digest_size=16).digest()
+    
+    try:
+        with _cache_lock:
+            row = _get_cache(cache_path).execute(
+                "SELECT result FROM analyses WHERE path = ? AND hash = ?", (key, digest)
+            ).fetchone()
+        if row:
+            return pickle.loads(row[0]), None
+    except (sqlite3.Error, pickle.UnpicklingError) as e:
+        logger.debug("Analysis cache lookup failed", file=str(file_path), error=str(e))
+    
+    try:
+        analysis = _analyze_content(str(raw, "utf-8", "ignore"), file_path)
+    except Exception as e:
+        logger.debug("Error analyzing file", file=str(file_path), error=str(e))
+        return None, None
+    return analysis, (key, digest, pickle.dumps(analysis, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _read_source(full_path: Path):
+    """
+    Return a file's raw bytes as a bytes-like object.
+    
+    Large files are memory-mapped so hashing and decoding read the page cache
+    directly instead of going through an intermediate bytes copy.
+    """
+    with open(full_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+
+
+def _analyze_content(content: str, file_path) -> Optional[Dict[str, Any]]:
+    """Analyze the source of one Python file (see _analyze_file_deep)."""
+    # Try to parse AST (compile() directly: ast.parse() only wraps it, and the
+    # real file name ends up in parser errors)
+    try:
+        tree = compile(content, str(file_path), "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+    except SyntaxError:
+        # If AST parsing fails, fall back to regex analysis
+        return _analyze_file_regex(content, file_path)
+    
+    visitor = _FileVisitor(content)
+    visitor.visit(tree)
+    file_type = visitor.file_type
+    imports = visitor.imports
+    evidence = visitor.evidence
+    
+    # If no type detected from AST, try regex fallback
+    if not file_type:
+        regex_result = _analyze_file_regex(content, file_path)
+        if regex_result:
+            file_type = regex_result.get('type')
+            evidence.extend(regex_result.get('evidence', []))
+    
+    if file_type:
+        return {
+            "path": str(file_path),
+            "type": file_type,
+            "imports": imports,
+            "evidence": evidence
+        }
+    
+    return None
+
+
+# Leaf nodes (and names, whose only child is their context) that can neither
+# match nor contain a match; over half of a typical tree. Not descended into.
+_INERT_NODES: Final = frozenset(
+    [ast.Name, ast.Constant, ast.Load, ast.Store, ast.Del]
+    + [op for base in (ast.operator, ast.boolop, ast.cmpop, ast.unaryop) for op in base.__subclasses__()]
+)
+
+
+class _FileVisitor:
+    """
+    Single pass over a module's AST collecting imports, the file type and evidence.
+    
+    Nodes are visited in ast.walk() (breadth-first) order, since later
+    findings may override the file type. Each node type is dispatched once
+    through a per-class table to its visit_* method, instead of being tested
+    against every node type of interest.
+    """
+    
+    __slots__ = ("content", "has_columns", "file_type", "imports", "evidence", "_strings")
+    
+    # node class -> unbound visit_* method (or None), filled on first sight
+    _dispatch: ClassVar[Dict[type, Optional[Callable[["_FileVisitor", Any], None]]]] = {}
+    
+    def __init__(self, content: str):
+        self.content = content
+        # File-wide, so scanned once rather than per class attribute
+        self.has_columns = 'Column' in content or 'relationship' in content
+        self.file_type: Optional[str] = None
+        self.imports: List[str] = []
+        self.evidence: List[str] = []
+        # id(node) -> _ast_to_string(node); valid while the tree is alive
+        self._strings: Dict[int, str] = {}
+    
+    def visit(self, tree: ast.AST) -> None:
+        dispatch = self._dispatch
+        iter_child_nodes = ast.iter_child_nodes
+        todo = deque([tree])
+        while todo:
+            node = todo.popleft()
+            node_class = type(node)
+            if node_class in _INERT_NODES:
+                continue
+            todo.extend(iter_child_nodes(node))
+            try:
+                method = dispatch[node_class]
+            except KeyError:
+                method = dispatch[node_class] = getattr(_FileVisitor, "visit_" + node_class.__name__, None)
+            if method is not None:
+                method(self, node)
+    
+    # Extract imports
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(alias.name)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        for alias in node.names:
+            self.imports.append(f"{module}.{alias.name}")
+    
+    # Check for API route decorators
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        for decorator in node.decorator_list:
+            decorator_str = _ast_to_string(decorator, self._strings)
+            if _is_api_decorator(decorator_str):
+                self.file_type = 'api_server'
+                self.evidence.append(f"Found API decorator: {decorator_str}")
+    
+    # Check for SQLAlchemy models
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        # Check if class inherits from SQLAlchemy Base
+        for base in node.bases:
+            base_str = _ast_to_string(base, self._strings)
+            if 'Base' in base_str or 'db.Model' in base_str or 'DeclarativeBase' in base_str:
+                self.file_type = 'model'
+                self.evidence.append(f"Found model class: {node.name}")
+        
+        # Check for SQLAlchemy Column definitions
+        if self.has_columns and self.file_type != 'model':
+            for item in node.body:
+                if isinstance(item, ast.Assign):
+                    self.file_type = 'model'
+                    self.evidence.append(f"Found SQLAlchemy Column in {node.name}")
+                    break
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        # Check for database connections
+        call_str = _ast_to_string(node, self._strings)
+        if _is_database_call(call_str, self.content):
+            if not self.file_type:
+                self.file_type = 'database'
+            self.evidence.append(f"Found database connection: {call_str}")
+        self.visit_Attribute(node)
+    
+    # Check for cache usage
+    def visit_Attribute(self, node: ast.expr) -> None:
+        node_str = _ast_to_string(node, self._strings)
+        if _is_cache_usage(node_str):
+            if not self.file_type:
+                self.file_type = 'cache'
+            self.evidence.append(f"Found cache usage: {node_str}")
+
+
+# Fallback patterns for _analyze_file_regex, compiled once: (source, compiled).
+# The source text is kept because it is reported in the evidence.
+_API_PATTERNS: Final = tuple((pattern, re.compile(pattern, re.IGNORECASE)) for pattern in (
+    r'@app\.route\s*\(',  # Flask
+    r'@router\.(get|post|put|delete)\s*\(',  # FastAPI
+    r'@.*\.route\s*\(',  # Generic route decorator
+    r'Blueprint\s*\(',  # Flask Blueprint
+    r'APIRouter\s*\(',  # FastAPI Router
+))
+_MODEL_RE: Final = re.compile(r'class\s+\w+.*\(.*Base.*\)|class\s+\w+.*\(.*db\.Model.*\)|Column\s*\(')
+_DB_PATTERNS: Final = tuple((pattern, re.compile(pattern, re.IGNORECASE)) for pattern in (
+    r'create_engine\s*\(',
+    r'connect\s*\(',
+    r'sessionmaker\s*\(',
+    r'engine\.connect\s*\(',
+))
+_SERVICE_PATTERNS: Final = tuple((pattern, re.compile(pattern, re.IGNORECASE)) for pattern in (
+    r'class\s+\w+Service',
+    r'def\s+\w+_service\s*\(',
+    r'class\s+\w+.*Service.*:',
+))
+_CACHE_RE: Final = re.compile(r'redis\.|cache\.|Cache\(', re.IGNORECASE)
+_QUEUE_RE: Final = re.compile(r'celery\.|rabbitmq|pika\.|Queue\(', re.IGNORECASE)
+
+
+def _keywords_re(*keywords: str) -> "re.Pattern[str]":
+    """Compile keywords into one alternation matched against lowercased text."""
+    return re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))
+
+
+# Keyword scans: one regex search over the lowercased text per category
+# instead of a substring test per keyword
+_API_DECORATOR_RE: Final = _keywords_re(
+    'route', 'get', 'post', 'put', 'delete', 'patch',
+    'blueprint', 'router', 'endpoint'
+)
+_DATABASE_CALL_RE: Final = _keywords_re('create_engine', 'connect', 'session', 'engine')
+_CACHE_USAGE_RE: Final = _keywords_re('redis', 'cache', 'get', 'set')
+# Checked in order; the first matching category wins
+_IMPORT_TARGET_KEYWORDS: Final = (
+    ('api_server', _keywords_re('flask', 'fastapi', 'django', 'tornado')),
+    ('database', _keywords_re('sqlalchemy', 'psycopg2', 'mysql', 'pymongo')),
+    ('cache', _keywords_re('redis', 'cache')),
+    ('queue', _keywords_re('celery', 'rabbitmq', 'pika')),
+)
+_IMPORT_TYPE_KEYWORDS: Final = (
+    ("API Server", _keywords_re("flask", "fastapi")),
+    ("Database", _keywords_re("sqlalchemy", "psycopg2", "mysql")),
+    ("Cache", _keywords_re("redis")),
+    ("Queue", _keywords_re("rabbitmq", "celery", "pika")),
+)
+_HAS_KEYWORDS: Final = {
+    'flask_or_fastapi': _keywords_re("from flask", "import flask", "Flask(", "from fastapi", "import fastapi", "FastAPI("),
+    'database': _keywords_re("sqlalchemy", "psycopg2", "mysql", "mongodb", "pymongo", "database", "db"),
+    'cache': _keywords_re("redis", "cache", "memcached"),
+    'queue': _keywords_re("rabbitmq", "celery", "queue", "pika"),
+    'storage': _keywords_re("s3", "boto3", "storage", "minio"),
+    'web_framework': _keywords_re("django", "tornado", "bottle", "cherrypy"),
+    'business_logic': _keywords_re("service", "business", "logic", "handler", "processor"),
+}
+
+def _analyze_file_regex(content: str, file_path) -> Optional[Dict[str, Any]]:
     """Fallback: Analyze file using regex patterns when AST parsing fails."""
     file_type = None
     evidence = []
     
     # Check for API route patterns
-    api_patterns = [
-        r'@app\.route\s*\(',  # Flask
-        r'@router\.(get|post|put|delete)\s*\(',  # FastAPI
-        r'@.*\.route\s*\(',  # Generic route decorator
-        r'Blueprint\s*\(',  # Flask Blueprint
-        r'APIRouter\s*\(',  # FastAPI Router
-    ]
-    for pattern in api_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
+    for pattern, compiled in _API_PATTERNS:
+        if compiled.search(content):
             file_type = 'api_server'
             evidence.append(f"Found API route pattern: {pattern}")
             break
     
     # Check for SQLAlchemy models
-    if re.search(r'class\s+\w+.*\(.*Base.*\)', content) or \
-       re.search(r'class\s+\w+.*\(.*db\.Model.*\)', content) or \
-       re.search(r'Column\s*\(', content):
+    if _MODEL_RE.search(content):
         file_type = 'model'
         evidence.append("Found SQLAlchemy model pattern")
     
     # Check for database connections
-    db_patterns = [
-        r'create_engine\s*\(',
-        r'connect\s*\(',
-        r'sessionmaker\s*\(',
-        r'engine\.connect\s*\(',
-    ]
-    for pattern in db_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
+    for pattern, compiled in _DB_PATTERNS:
+        if compiled.search(content):
             if not file_type:
                 file_type = 'database'
             evidence.append(f"Found database pattern: {pattern}")
     
     # Check for service patterns
-    service_patterns = [
-        r'class\s+\w+Service',
-        r'def\s+\w+_service\s*\(',
-        r'class\s+\w+.*Service.*:',
-    ]
-    for pattern in service_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
+    for pattern, compiled in _SERVICE_PATTERNS:
+        if compiled.search(content):
             if not file_type:
                 file_type = 'service'
             evidence.append(f"Found service pattern: {pattern}")
     
     # Check for cache
-    if re.search(r'redis\.|cache\.|Cache\(', content, re.IGNORECASE):
+    if _CACHE_RE.search(content):
         if not file_type:
             file_type = 'cache'
         evidence.append("Found cache usage")
     
     # Check for queue
-    if re.search(r'celery\.|rabbitmq|pika\.|Queue\(', content, re.IGNORECASE):
+    if _QUEUE_RE.search(content):
         if not file_type:
             file_type = 'queue'
         evidence.append("Found queue usage")
@@ -309,64 +593,128 @@ def _analyze_file_regex(content: str, file_path) -> Dict:
     return None
 
 
-def _ast_to_string(node) -> str:
-    """Convert AST node to string representation."""
-    try:
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{_ast_to_string(node.value)}.{node.attr}"
-        elif isinstance(node, ast.Call):
-            func_str = _ast_to_string(node.func)
-            return func_str
+def _ast_to_string(node, memo: Optional[Dict[int, str]] = None) -> str:
+    """
+    Convert AST node to string representation.
+    
+    Names and attribute chains are rendered as dotted paths with calls
+    collapsed to their callee (``a.b().c`` -> ``a.b.c``); anything else is
+    unparsed. The chain is followed iteratively, and when ``memo`` is given
+    the string of every node on it is recorded by id(), so the attributes and
+    calls nested in an already-rendered node are never rendered again.
+    """
+    if memo is not None:
+        cached = memo.get(id(node))
+        if cached is not None:
+            return cached
+    
+    chain = []
+    current = node
+    while isinstance(current, (ast.Attribute, ast.Call)):
+        chain.append(current)
+        current = current.func if isinstance(current, ast.Call) else current.value
+        if memo is not None and id(current) in memo:
+            text = memo[id(current)]
+            break
+    else:
+        if isinstance(current, ast.Name):
+            text = current.id
         else:
-            return ast.unparse(node) if hasattr(ast, 'unparse') else str(node)
-    except:
-        return str(node)
+            try:
+                text = ast.unparse(current)
+            except Exception:
+                text = str(current)
+        if memo is not None:
+            memo[id(current)] = text
+    
+    for link in reversed(chain):
+        if isinstance(link, ast.Attribute):
+            text = f"{text}.{link.attr}"
+        if memo is not None:
+            memo[id(link)] = text
+    return text
 
 
 def _is_api_decorator(decorator_str: str) -> bool:
     """Check if decorator is an API route decorator."""
-    api_patterns = [
-        'route', 'get', 'post', 'put', 'delete', 'patch',
-        'blueprint', 'router', 'endpoint'
-    ]
-    return any(pattern in decorator_str.lower() for pattern in api_patterns)
+    return _API_DECORATOR_RE.search(decorator_str.lower()) is not None
 
 
 def _is_database_call(call_str: str, content: str) -> bool:
     """Check if call is a database connection."""
-    db_keywords = ['create_engine', 'connect', 'session', 'engine']
-    return any(keyword in call_str.lower() for keyword in db_keywords)
+    return _DATABASE_CALL_RE.search(call_str.lower()) is not None
 
 
 def _is_cache_usage(node_str: str) -> bool:
     """Check if node is cache usage."""
-    cache_keywords = ['redis', 'cache', 'get', 'set']
-    return any(keyword in node_str.lower() for keyword in cache_keywords)
-
-
-def _classify_import_target(import_str: str, all_file_analyses: List[Dict]) -> str:
-    """Classify what type of component an import refers to."""
-    import_lower = import_str.lower()
-    
-    # Check if import matches known patterns
-    if any(x in import_lower for x in ['flask', 'fastapi', 'django', 'tornado']):
-        return 'api_server'
-    elif any(x in import_lower for x in ['sqlalchemy', 'psycopg2', 'mysql', 'pymongo']):
-        return 'database'
-    elif any(x in import_lower for x in ['redis', 'cache']):
-        return 'cache'
-    elif any(x in import_lower for x in ['celery', 'rabbitmq', 'pika']):
-        return 'queue'
-    
-    # Check if import is from another file in the project
-    for file_analysis in all_file_analyses:
-        file_path = file_analysis.get('path', '')
-        if import_str in file_path or file_path.replace('/', '.').replace('\\', '.') in import_str:
-            return file_analysis.get('type')
+    return _CACHE_USAGE_RE.search(node_str.lower()) is not None
+
+
+class _ImportTargetIndex:
+    """
+    Classify what type of component an import refers to, for one repository.
     
-    return None
+    An import matches a project file when it is a substring of the file's path,
+    or the file's dotted path is a substring of the import; the first matching
+    file wins. Instead of testing every file for every import, paths are
+    joined into one string searched with str.find(), dotted paths are looked
+    up by the windows of the import that have their lengths, and results are
+    memoized per distinct import string.
+    """
+    
+    __slots__ = ("_types", "_joined", "_starts", "_dotted", "_dotted_lengths", "_memo")
+    
+    def __init__(self, file_analyses: List[Dict]):
+        paths = [file_analysis.get('path', '') for file_analysis in file_analyses]
+        self._types = [file_analysis.get('type') for file_analysis in file_analyses]
+        # Paths never contain NUL, so a match can't straddle two of them
+        self._joined = "\0".join(paths)
+        self._starts = []
+        offset = 0
+        for path in paths:
+            self._starts.append(offset)
+            offset += len(path) + 1
+        # dotted path -> index of the first file with it
+        self._dotted: Dict[str, int] = {}
+        for index, path in enumerate(paths):
+            self._dotted.setdefault(path.replace('/', '.').replace('\\', '.'), index)
+        self._dotted_lengths = sorted({len(dotted) for dotted in self._dotted})
+        self._memo: Dict[str, Optional[str]] = {}
+    
+    def classify(self, import_str: str) -> Optional[str]:
+        try:
+            return self._memo[import_str]
+        except KeyError:
+            target_type = self._memo[import_str] = self._classify(import_str)
+            return target_type
+    
+    def _classify(self, import_str: str) -> Optional[str]:
+        import_lower = import_str.lower()
+        
+        # Check if import matches known patterns
+        for component_type, keywords_re in _IMPORT_TARGET_KEYWORDS:
+            if keywords_re.search(import_lower):
+                return component_type
+        
+        # Check if import is from another file in the project
+        if not self._types:
+            return None
+        first = len(self._types)
+        if "\0" not in import_str:
+            position = self._joined.find(import_str)
+            if position >= 0:
+                first = bisect_right(self._starts, position) - 1
+        for length in self._dotted_lengths:
+            if length > len(import_str):
+                break
+            for start in range(len(import_str) - length + 1):
+                index = self._dotted.get(import_str[start:start + length])
+                if index is not None and index < first:
+                    first = index
+        
+        if first < len(self._types):
+            return self._types[first]
+        return None
 
 
 def _detect_database_from_code(db_files: List[Dict]) -> str:
@@ -378,45 +726,37 @@ def _detect_database_from_code(db_files: List[Dict]) -> str:
 
 def _has_flask_or_fastapi(code_text: str) -> bool:
     """Check if code uses Flask or FastAPI."""
-    keywords = ["from flask", "import flask", "Flask(", "from fastapi", "import fastapi", "FastAPI("]
-    return any(keyword.lower() in code_text.lower() for keyword in keywords)
+    return _HAS_KEYWORDS['flask_or_fastapi'].search(code_text.lower()) is not None
 
 
 def _has_database(code_text: str) -> bool:
     """Check if code uses database."""
-    keywords = ["sqlalchemy", "psycopg2", "mysql", "mongodb", "pymongo", "database", "db"]
-    return any(keyword.lower() in code_text.lower() for keyword in keywords)
+    return _HAS_KEYWORDS['database'].search(code_text.lower()) is not None
 
 
 def _has_cache(code_text: str) -> bool:
     """Check if code uses cache."""
-    keywords = ["redis", "cache", "memcached"]
-    return any(keyword.lower() in code_text.lower() for keyword in keywords)
+    return _HAS_KEYWORDS['cache'].search(code_text.lower()) is not None
 
 
 def _has_queue(code_text: str) -> bool:
     """Check if code uses message queue."""
-    keywords = ["rabbitmq", "celery", "queue", "pika"]
-    return any(keyword.lower() in code_text.lower() for keyword in keywords)
+    return _HAS_KEYWORDS['queue'].search(code_text.lower()) is not None
 
 
 def _has_storage(code_text: str) -> bool:
     """Check if code uses storage."""
-    keywords = ["s3", "boto3", "storage", "minio"]
-    return any(keyword.lower() in code_text.lower() for keyword in keywords)
+    return _HAS_KEYWORDS['storage'].search(code_text.lower()) is not None
 
 
 def _has_web_framework(code_text: str) -> bool:
     """Check if code uses web framework (Django, etc.)."""
-    keywords = ["django", "tornado", "bottle", "cherrypy"]
-    return any(keyword.lower() in code_text.lower() for keyword in keywords)
+    return _HAS_KEYWORDS['web_framework'].search(code_text.lower()) is not None
 
 
 def _has_business_logic(code_text: str) -> bool:
     """Check if code has business logic layer."""
-    # Look for service patterns, business logic patterns
-    keywords = ["service", "business", "logic", "handler", "processor"]
-    return any(keyword.lower() in code_text.lower() for keyword in keywords)
+    return _HAS_KEYWORDS['business_logic'].search(code_text.lower()) is not None
 
 
 def _detect_database_type(code_text: str) -> str:
@@ -439,19 +779,18 @@ def _extract_imports(repo_path, file_path) -> List[str]:
     imports = []
     try:
         full_path = repo_path / file_path
-        if full_path.exists():
-            content = full_path.read_text(encoding="utf-8", errors="ignore")
-            lines = content.split("\n")
-            for line in lines:
-                line = line.strip()
-                if line.startswith("import ") or line.startswith("from "):
-                    imports.append(line)
+        content = full_path.read_text(encoding="utf-8", errors="ignore")
+        lines = content.split("\n")
+        for line in lines:
+            line = line.strip()
+            if line.startswith("import ") or line.startswith("from "):
+                imports.append(line)
     except Exception:
         pass
     return imports
 
 
-def _classify_file_type(file_path, code_text: str) -> str:
+def _classify_file_type(file_path, code_text: str) -> Optional[str]:
     """Classify file type based on path and content."""
     path_str = str(file_path).lower()
     
@@ -469,18 +808,11 @@ def _classify_file_type(file_path, code_text: str) -> str:
         return None
 
 
-def _classify_import_type(import_line: str, code_text: str) -> str:
+def _classify_import_type(import_line: str, code_text: str) -> Optional[str]:
     """Classify import type."""
     import_lower = import_line.lower()
     
-    if "flask" in import_lower or "fastapi" in import_lower:
-        return "API Server"
-    elif "sqlalchemy" in import_lower or "psycopg2" in import_lower or "mysql" in import_lower:
-        return "Database"
-    elif "redis" in import_lower:
-        return "Cache"
-    elif "rabbitmq" in import_lower or "celery" in import_lower or "pika" in import_lower:
-        return "Queue"
-    else:
-        return None
-
+    for import_type, keywords_re in _IMPORT_TYPE_KEYWORDS:
+        if keywords_re.search(import_lower):
+            return import_type
+    return None
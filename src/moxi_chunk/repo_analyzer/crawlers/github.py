@@ -1,18 +1,57 @@
 """GitHub repository crawler for cloning repositories."""
 
 import os
+import re
 import shutil
 import subprocess
+import tarfile
 import tempfile
-from pathlib import Path
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Optional
 
-from core import get_logger
+import requests
+
+from core import get_logger, settings
 from core.errors import RepositoryNotFound
 from core.lib import ensure_dir_exists, extract_repo_owner_and_name, validate_github_url
 
 logger = get_logger(__name__)
 
+SHALLOW_CLONE_ARGS = ("--depth=1", "--single-branch", "--filter=blob:none")
+
+# Snapshot of the default branch, no .git; private repos need the API + token
+TARBALL_URL = "https://codeload.github.com/{owner}/{repo}/tar.gz/HEAD"
+API_TARBALL_URL = "https://api.github.com/repos/{owner}/{repo}/tarball"
+# Commit SHA of the default branch's HEAD (plain text with the sha media type)
+HEAD_SHA_URL = "https://api.github.com/repos/{owner}/{repo}/commits/HEAD"
+# Written next to a tarball snapshot (".{repo}.snapshot"): the commit SHA it was
+# taken at; its mtime is when it was last checked against the remote
+SNAPSHOT_MARKER = ".{repo}.snapshot"
+_SHA_RE = re.compile(r"[0-9a-f]{7,40}")
+
+# Default concurrent fetches in fetch_many (network bound, not CPU bound)
+FETCH_WORKERS = 8
+
+# One lock per cache entry, so concurrent fetches of a repo don't race on its directory
+_path_locks: Dict[Path, threading.Lock] = {}
+_path_locks_guard = threading.Lock()
+
+
+def _path_lock(path: Path) -> threading.Lock:
+    with _path_locks_guard:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = threading.Lock()
+        return lock
+
+
+def _git_env() -> dict:
+    """Environment for git subprocesses: fail instead of prompting for credentials."""
+    return {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
 
 class GithubCrawler:
     """Crawler for fetching GitHub repositories."""
@@ -51,11 +90,57 @@ class GithubCrawler:
         owner, repo_name = extract_repo_owner_and_name(repo_url)
         logger.info("Fetching repository", url=repo_url, owner=owner, repo=repo_name)
 
+        if use_cache and self.cache_dir:
+            with _path_lock(self.cache_dir / owner / repo_name):
+                return self._fetch(repo_url, owner, repo_name, use_cache)
+        return self._fetch(repo_url, owner, repo_name, use_cache)
+
+    def fetch_many(
+        self,
+        repo_urls: Iterable[str],
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Path]:
+        """
+        Fetch several repositories concurrently.
+        
+        Downloads and clones are network bound and run in git subprocesses or
+        socket reads that release the GIL, so threads overlap them and the
+        wall time approaches that of the slowest repository instead of the sum.
+        
+        Args:
+            repo_urls: GitHub repository URLs
+            use_cache: If True and cache_dir is set, reuse cached repos
+            max_workers: Concurrent fetches (default: FETCH_WORKERS)
+            
+        Returns:
+            Mapping of repo URL to local path for every repository fetched;
+            failures are logged and left out
+        """
+        repo_urls = list(dict.fromkeys(repo_urls))
+        if not repo_urls:
+            return {}
+
+        def fetch_one(repo_url: str) -> Optional[Path]:
+            try:
+                return self.fetch(repo_url, use_cache=use_cache)
+            except RepositoryNotFound as e:
+                logger.warning("Skipping repository", url=repo_url, error=str(e))
+                return None
+
+        workers = min(max_workers or FETCH_WORKERS, len(repo_urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+            paths = pool.map(fetch_one, repo_urls)
+            return {url: path for url, path in zip(repo_urls, paths) if path is not None}
+
+    def _fetch(self, repo_url: str, owner: str, repo_name: str, use_cache: bool) -> Path:
+        """fetch() for a validated URL; holds the cache entry's lock when caching."""
         # If using cache, check if repo already exists
         if use_cache and self.cache_dir:
             cached_path = self.cache_dir / owner / repo_name
             if cached_path.exists():
                 logger.info("Using cached repository", path=str(cached_path))
+                self._update(cached_path, owner, repo_name)
                 return cached_path
 
         # Clone to temporary or cache directory
@@ -68,14 +153,21 @@ class GithubCrawler:
             temp_dir = tempfile.mkdtemp(prefix="moxi_")
             repo_path = Path(temp_dir) / repo_name
 
+        # A tarball snapshot is enough for analysis; git is the fallback
+        if self._download_tarball(owner, repo_name, repo_path):
+            return repo_path
+
         try:
             # Clone the repository
             logger.info("Cloning repository", url=repo_url, target=str(repo_path))
+            # Only HEAD's files are analyzed: skip history, other branches and
+            # blobs outside the checkout
             result = subprocess.run(
-                ["git", "clone", repo_url, str(repo_path)],
+                ["git", "clone", *SHALLOW_CLONE_ARGS, repo_url, str(repo_path)],
                 capture_output=True,
                 text=True,
                 timeout=300,  # 5 minute timeout
+                env=_git_env(),
             )
 
             if result.returncode != 0:
@@ -96,3 +188,146 @@ class GithubCrawler:
                 shutil.rmtree(temp_dir)
             raise RepositoryNotFound(f"Error cloning {repo_url}: {str(e)}")
 
+    def _download_tarball(self, owner: str, repo_name: str, repo_path: Path) -> bool:
+        """
+        Stream the repository's HEAD tarball into ``repo_path``.
+        
+        The archive is extracted into a scratch directory next to the target
+        and renamed into place (replacing an older snapshot), so a failed
+        download never leaves a partial tree that later looks like a cached
+        repository. The commit SHA of the snapshot is recorded next to it.
+        
+        Returns:
+            True on success, False if the caller should fall back to git
+        """
+        if settings.GITHUB_TOKEN:
+            url = API_TARBALL_URL.format(owner=owner, repo=repo_name)
+            headers = {"Authorization": f"Bearer {settings.GITHUB_TOKEN}"}
+        else:
+            url = TARBALL_URL.format(owner=owner, repo=repo_name)
+            headers = {}
+
+        logger.info("Downloading repository tarball", url=url, target=str(repo_path))
+        scratch = tempfile.mkdtemp(prefix=f".{repo_name}-", dir=repo_path.parent)
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=(10, 60)) as response:
+                if response.status_code != 200:
+                    logger.info("Tarball unavailable, falling back to git clone",
+                                url=url, status=response.status_code)
+                    return False
+                with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                    sha = _extract_stripped(archive, Path(scratch))
+            if repo_path.exists():
+                stale = tempfile.mkdtemp(prefix=f".{repo_name}-stale-", dir=repo_path.parent)
+                os.replace(repo_path, Path(stale) / repo_name)
+                os.replace(scratch, repo_path)
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                os.replace(scratch, repo_path)
+            _snapshot_marker(repo_path).write_text(sha or "")
+            logger.info("Repository downloaded successfully", path=str(repo_path))
+            return True
+        except (requests.RequestException, tarfile.TarError, OSError) as e:
+            logger.warning("Tarball download failed, falling back to git clone", url=url, error=str(e))
+            return False
+        finally:
+            if os.path.exists(scratch):
+                shutil.rmtree(scratch, ignore_errors=True)
+
+    def _update(self, repo_path: Path, owner: str, repo_name: str) -> None:
+        """
+        Bring a cached clone or snapshot up to the remote HEAD.
+        
+        Clones get a shallow fetch. Tarball snapshots have no .git (running
+        git there would act on whatever repository encloses the cache); once
+        older than REPO_SNAPSHOT_TTL they are re-downloaded if HEAD has moved
+        from their recorded SHA. Failures (offline, removed repo) are logged
+        and the cached checkout is used as is.
+        """
+        if not (repo_path / ".git").exists():
+            self._update_snapshot(repo_path, owner, repo_name)
+            return
+        for args in (
+            ["git", "-C", str(repo_path), "fetch", "--depth=1", "origin", "HEAD"],
+            ["git", "-C", str(repo_path), "reset", "--hard", "FETCH_HEAD"],
+        ):
+            try:
+                result = subprocess.run(args, capture_output=True, text=True, timeout=300, env=_git_env())
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning("Failed to update cached repository", path=str(repo_path), error=str(e))
+                return
+            if result.returncode != 0:
+                logger.warning("Failed to update cached repository", path=str(repo_path),
+                               error=result.stderr or result.stdout)
+                return
+
+    def _update_snapshot(self, repo_path: Path, owner: str, repo_name: str) -> None:
+        """Re-download a tarball snapshot past REPO_SNAPSHOT_TTL whose HEAD has moved."""
+        marker = _snapshot_marker(repo_path)
+        try:
+            age = time.time() - marker.stat().st_mtime
+            snapshot_sha = marker.read_text().strip()
+        except OSError:
+            age, snapshot_sha = None, ""  # Taken before SHAs were recorded
+        if age is not None and age < settings.REPO_SNAPSHOT_TTL:
+            return
+
+        head_sha = _remote_head_sha(owner, repo_name)
+        if head_sha and snapshot_sha and head_sha.startswith(snapshot_sha):
+            marker.touch()
+            return
+        logger.info("Refreshing cached snapshot", path=str(repo_path),
+                    snapshot_sha=snapshot_sha[:8] or None, head_sha=head_sha[:8] if head_sha else None)
+        if not self._download_tarball(owner, repo_name, repo_path):
+            logger.warning("Failed to refresh cached snapshot, using it as is", path=str(repo_path))
+
+
+def _snapshot_marker(repo_path: Path) -> Path:
+    return repo_path.with_name(SNAPSHOT_MARKER.format(repo=repo_path.name))
+
+
+def _remote_head_sha(owner: str, repo_name: str) -> Optional[str]:
+    """Commit SHA of the remote default branch, or None if it cannot be resolved."""
+    headers = {"Accept": "application/vnd.github.sha"}
+    if settings.GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {settings.GITHUB_TOKEN}"
+    try:
+        response = requests.get(HEAD_SHA_URL.format(owner=owner, repo=repo_name), headers=headers, timeout=10)
+    except requests.RequestException as e:
+        logger.warning("Failed to resolve remote HEAD", owner=owner, repo=repo_name, error=str(e))
+        return None
+    sha = response.text.strip()
+    if response.status_code != 200 or not _SHA_RE.fullmatch(sha):
+        logger.warning("Failed to resolve remote HEAD", owner=owner, repo=repo_name, status=response.status_code)
+        return None
+    return sha
+
+
+def _extract_stripped(archive: tarfile.TarFile, target: Path) -> Optional[str]:
+    """
+    Extract a GitHub tarball member by member, dropping its ``{repo}-{sha}/`` root.
+    
+    Only regular files and directories are extracted, and members that would
+    land outside ``target`` are skipped.
+    
+    Returns:
+        The commit SHA of the snapshot (from the pax header git archive
+        writes, else the suffix of the root directory), or None
+    """
+    extract_filter = getattr(tarfile, "data_filter", None)  # Python 3.11.4+
+    root = None
+    for member in archive:
+        if root is None:
+            root = PurePosixPath(member.name).parts[0]
+        parts = PurePosixPath(member.name).parts[1:]
+        if not parts or ".." in parts or not (member.isfile() or member.isdir()):
+            continue
+        member.name = "/".join(parts)
+        if extract_filter:
+            archive.extract(member, target, filter=extract_filter)
+        else:
+            archive.extract(member, target)
+    for candidate in (archive.pax_headers.get("comment", ""), (root or "").rsplit("-", 1)[-1]):
+        if _SHA_RE.fullmatch(candidate):
+            return candidate
+    return None
@@ -1,7 +1,9 @@
 """Local repository crawler for handling local file paths."""
 
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from core import get_logger
 from core.errors import RepositoryNotFound
@@ -9,6 +11,96 @@ from core.lib import ensure_dir_exists
 
 logger = get_logger(__name__)
 
+# Directories never descended into when walking a repository (VCS metadata,
+# dependencies, virtualenvs and tool caches; same set as moxi_collect's file tree)
+WALK_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", ".venv", "venv", ".pytest_cache", ".mypy_cache",
+    ".tox", ".idea",
+})
+# Concurrent directory scans in fast_walk
+WALK_WORKERS = 8
+
+
+def _scan_dir(directory: str, skip_dirs: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """List one directory: (file paths, subdirectory paths to descend into)."""
+    files: List[str] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # DirEntry caches the type from readdir, so no stat() per entry;
+                # symlinked directories are not followed (like Path.rglob)
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dirs:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry.path)
+    except (PermissionError, FileNotFoundError):
+        pass
+    return files, subdirs
+
+
+def iter_files(
+    root: Path,
+    skip_dirs: Iterable[str] = WALK_SKIP_DIRS,
+    max_workers: int = WALK_WORKERS,
+) -> Iterator[str]:
+    """
+    Yield every file under ``root`` as a relative path string, in no particular order.
+    
+    Directories are scanned with os.scandir() on a thread pool: each scan
+    submits the subdirectories it finds, and the syscalls release the GIL, so
+    a cold or network file system is walked several directories at a time.
+    Directories named in ``skip_dirs`` are pruned without being read.
+    Plain strings are yielded so callers that only look at names and
+    extensions never build a Path per file; closing the generator early
+    cancels the directory scans that have not started yet.
+    
+    Args:
+        root: Directory to walk
+        skip_dirs: Directory names not to descend into
+        max_workers: Concurrent directory scans
+        
+    Yields:
+        File paths relative to ``root``
+    """
+    root_str = os.fspath(root)
+    prefix = len(os.path.join(root_str, ""))
+    skip_dirs = frozenset(skip_dirs)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="walk") as pool:
+        pending = {pool.submit(_scan_dir, root_str, skip_dirs)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    pending.update(pool.submit(_scan_dir, subdir, skip_dirs) for subdir in subdirs)
+                    for path in files:
+                        yield path[prefix:]
+        finally:
+            # A consumer that stops early (or fails) doesn't wait for the queued scans
+            for future in pending:
+                future.cancel()
+
+
+def fast_walk(
+    root: Path,
+    skip_dirs: Iterable[str] = WALK_SKIP_DIRS,
+    max_workers: int = WALK_WORKERS,
+) -> List[Path]:
+    """
+    List every file under ``root`` as paths relative to it (see iter_files).
+    
+    Args:
+        root: Directory to walk
+        skip_dirs: Directory names not to descend into
+        max_workers: Concurrent directory scans
+        
+    Returns:
+        Relative file paths, sorted so the result is reproducible
+    """
+    return [Path(path) for path in sorted(iter_files(root, skip_dirs, max_workers))]
+
 
 class LocalCrawler:
     """Crawler for handling local repository paths."""
@@ -39,7 +39,7 @@ def analyze_repository(path_or_url: str, cache_dir: str | None = None) -> Reposi
         project_type=project_type,
         project_language=project_language,
         key_files=key_files,
-        all_files=list(files),
+        all_files=tuple(files),
     )
 
 
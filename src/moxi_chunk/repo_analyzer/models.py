@@ -3,7 +3,7 @@
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Tuple
 
 
 class ProjectType(str, Enum):
@@ -25,13 +25,23 @@ class ProjectLanguage(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RepositoryInfo:
-    """Aggregated information about a repository."""
+    """
+    Aggregated information about a repository.
+
+    Immutable and slotted: one is kept per analyzed repo (batch runs hold many),
+    and ``all_files`` is a tuple of relative paths.
+    """
 
     path: Path
     project_type: ProjectType
     project_language: ProjectLanguage = ProjectLanguage.UNKNOWN
     key_files: Dict[str, Path] = field(default_factory=dict)
-    all_files: List[Path] = field(default_factory=list)
+    all_files: Tuple[Path, ...] = ()
+
+    @property
+    def py_files(self) -> Tuple[Path, ...]:
+        """Python source files among ``all_files``."""
+        return tuple(file_path for file_path in self.all_files if file_path.suffix == ".py")
 
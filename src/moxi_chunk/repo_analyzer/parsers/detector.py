@@ -6,81 +6,92 @@ from typing import Iterable
 from moxi_chunk.repo_analyzer.models import ProjectLanguage, ProjectType
 
 
+# IMPORTANT: APPLICATION indicators are checked FIRST (before library check)
+# Many modern applications use pyproject.toml, but they're still applications
+# if they have entry points like main.py, app.py, etc.
+
+# Application indicators (strongest signal for applications)
+_APP_SIGNALS = {
+    "main.py",
+    "app.py",
+    "manage.py",  # Django
+    "wsgi.py",  # WSGI apps
+    "asgi.py",  # ASGI apps
+    "application.py",
+    "server.py",
+    # Docker/containerization (indicates runnable application)
+    "docker-compose.yml",
+    "dockerfile",
+}
+
+# Web framework indicators in paths (also strong signal for applications)
+_WEB_FRAMEWORKS = ("flask", "django", "fastapi", "tornado", "bottle")
+
+# CLI indicators (checked before library)
+_CLI_SIGNALS = {
+    "cli.py",
+    "cli",
+    "command.py",
+    "commands.py",
+    "__main__.py",  # Python -m style CLI
+}
+# Directories for click, argparse, or typer commands (CLI frameworks)
+_CLI_PATHS = ("cli/", "commands/", "cmd/")
+
+# Library indicators (only if no application/CLI signals found)
+# Libraries almost always have setup.py or pyproject.toml
+_LIBRARY_INDICATORS = {
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "poetry.lock",  # Poetry projects are usually libraries
+}
+
+
 def detect_project_type(files: Iterable[Path]) -> ProjectType:
     """
     Heuristic detection of project type based on file names and structure.
 
+    Files are consumed in a single pass, so ``files`` may be a generator.
+    Application signals return as soon as they are seen; everything else is
+    decided once all files have been counted.
+
     Args:
         files: Iterable of relative file paths.
 
     Returns:
         ProjectType enum value.
     """
-    names = {f.name.lower() for f in files}
-    paths = {"/".join(f.parts).lower() for f in files}
-    
-    # Count Python files to help determine project type
-    py_files = [f for f in files if f.suffix == ".py"]
-    py_file_count = len(py_files)
-
-    # IMPORTANT: Check APPLICATION indicators FIRST (before library check)
-    # Many modern applications use pyproject.toml, but they're still applications
-    # if they have entry points like main.py, app.py, etc.
-    
-    # Application indicators (check FIRST - strongest signal for applications)
-    app_signals = {
-        "main.py",
-        "app.py",
-        "manage.py",  # Django
-        "wsgi.py",  # WSGI apps
-        "asgi.py",  # ASGI apps
-        "application.py",
-        "server.py",
-    }
-    if any(signal in names for signal in app_signals):
-        return ProjectType.APPLICATION
-    
-    # Check for web framework indicators (also strong signal for applications)
-    web_frameworks = ["flask", "django", "fastapi", "tornado", "bottle"]
-    if any(framework in p for p in paths for framework in web_frameworks):
-        return ProjectType.APPLICATION
-    
-    # Check for Docker/containerization (indicates runnable application)
-    if "docker-compose.yml" in names or "dockerfile" in names:
-        # If has Docker + pyproject.toml, likely an application
-        return ProjectType.APPLICATION
-
-    # CLI indicators (check before library)
-    cli_signals = {
-        "cli.py",
-        "cli",
-        "command.py",
-        "commands.py",
-        "__main__.py",  # Python -m style CLI
-    }
-    if any(signal in names for signal in cli_signals):
-        return ProjectType.CLI
-    
-    # Check for click, argparse, or typer usage (CLI frameworks)
-    cli_paths = ["cli/", "commands/", "cmd/"]
-    if any(cli_path in p for p in paths for cli_path in cli_paths):
+    names = set()
+    has_cli_path = False
+    has_package_path = False
+    py_file_count = 0  # Python files help determine project type
+
+    for f in files:
+        name = f.name.lower()
+        if name in _APP_SIGNALS:
+            return ProjectType.APPLICATION
+        path = "/".join(f.parts).lower()
+        if any(framework in path for framework in _WEB_FRAMEWORKS):
+            return ProjectType.APPLICATION
+
+        names.add(name)
+        if not has_cli_path:
+            has_cli_path = any(cli_path in path for cli_path in _CLI_PATHS)
+        if not has_package_path:
+            has_package_path = "src/" in path or "/__init__.py" in path
+        if f.suffix == ".py":
+            py_file_count += 1
+
+    if not names.isdisjoint(_CLI_SIGNALS) or has_cli_path:
         return ProjectType.CLI
 
-    # NOW check for library indicators (only if no application/CLI signals found)
-    # Libraries almost always have setup.py or pyproject.toml
-    library_indicators = {
-        "pyproject.toml",
-        "setup.py",
-        "setup.cfg",
-        "poetry.lock",  # Poetry projects are usually libraries
-    }
-    if any(indicator in names for indicator in library_indicators):
+    if not names.isdisjoint(_LIBRARY_INDICATORS):
         return ProjectType.LIBRARY
-    
+
     # Check for src/ or package structure (common in libraries)
-    if any("src/" in p or "/__init__.py" in p for p in paths):
-        if py_file_count > 3:  # Multiple Python files suggest library
-            return ProjectType.LIBRARY
+    if has_package_path and py_file_count > 3:  # Multiple Python files suggest library
+        return ProjectType.LIBRARY
 
     # If we have many Python files but no clear indicator, default to library
     if py_file_count > 5:
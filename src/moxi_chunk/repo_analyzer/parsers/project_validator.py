@@ -1,12 +1,37 @@
 """Validate if a repository is a valid coding project."""
 
+import os
+import re
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import DefaultDict, Optional
 
 from core import get_logger
 
 logger = get_logger(__name__)
 
+# Exclude keywords for description and topics
+EXCLUDE_KEYWORDS = frozenset({
+    "awesome",
+    "list",
+    "books",
+    "resources",
+    "curated",
+    "collection",
+    "learning",
+    "tutorial",
+    "course",
+    "education",
+})
+EXCLUDE_NAME_KEYWORDS = frozenset({"awesome", "list", "books", "resources", "curated"})
+# Substring matches of any keyword in one regex scan instead of one scan per keyword
+_EXCLUDE_RE = re.compile("|".join(map(re.escape, sorted(EXCLUDE_KEYWORDS))))
+_EXCLUDE_NAME_RE = re.compile("|".join(map(re.escape, sorted(EXCLUDE_NAME_KEYWORDS))))
+
+CODE_EXTENSIONS = frozenset({".py", ".js", ".java", ".go", ".rs", ".cpp", ".c", ".ts", ".tsx"})
+# File names that indicate a project structure
+STRUCTURE_FILES = frozenset({"__init__.py", "setup.py", "pyproject.toml", "requirements.txt"})
+
 
 def is_valid_coding_project(
     repo_path: Path,
@@ -38,27 +63,14 @@ def is_valid_coding_project(
             topics = repo_info.get("topics", [])
             
             # Exclude keywords in description
-            exclude_keywords = [
-                "awesome",
-                "list",
-                "books",
-                "resources",
-                "curated",
-                "collection",
-                "learning",
-                "tutorial",
-                "course",
-                "education",
-            ]
-            
-            if any(keyword in description for keyword in exclude_keywords):
+            if _EXCLUDE_RE.search(description):
                 logger.debug("Excluded: description contains exclude keywords",
                            repo=str(repo_path),
                            description=description[:100])
                 return False
             
             # Exclude topics
-            if any(topic.lower() in exclude_keywords for topic in topics):
+            if any(topic.lower() in EXCLUDE_KEYWORDS for topic in topics):
                 logger.debug("Excluded: topics contain exclude keywords",
                            repo=str(repo_path),
                            topics=topics)
@@ -66,44 +78,55 @@ def is_valid_coding_project(
         
         # Step 2: Check repository name
         repo_name = repo_path.name.lower()
-        exclude_name_keywords = ["awesome", "list", "books", "resources", "curated"]
-        if any(keyword in repo_name for keyword in exclude_name_keywords):
+        if _EXCLUDE_NAME_RE.search(repo_name):
             logger.debug("Excluded: repository name contains exclude keywords",
                        repo=str(repo_path))
             return False
         
-        # Step 3: Check file structure
+        # Step 3: Check file structure, classifying every file in one pass
+        total_files = 0
+        ext_counts: DefaultDict[str, int] = defaultdict(int)
+        has_structure = False
+        checked_dir = None
         try:
-            from moxi_chunk.repo_analyzer.parsers.tree_builder import list_files
-            relative_files = list(list_files(repo_path))
-            # Convert relative paths to absolute paths
-            files = [repo_path / f for f in relative_files]
-            # Filter out directories and hidden files
-            files = [
-                f for f in files
-                if f.is_file() and not f.name.startswith(".")
-            ]
+            from moxi_chunk.repo_analyzer.crawlers.local import iter_files
+            # iter_files() yields relative path strings of regular files, so
+            # names and extensions are sliced from str without a Path per file
+            for rel in iter_files(repo_path):
+                name = rel.rpartition(os.sep)[2]
+                # Filter out hidden files
+                if name.startswith("."):
+                    continue
+                total_files += 1
+                ext_counts[os.path.splitext(name)[1]] += 1
+                if not has_structure:
+                    # "src/" can only occur in the directory part, and iter_files()
+                    # yields a directory's files together, so lower it once per directory
+                    directory = rel[: len(rel) - len(name)]
+                    if directory != checked_dir:
+                        checked_dir = directory
+                        has_structure = "src/" in directory.lower()
+                    has_structure = has_structure or name.lower() in STRUCTURE_FILES
         except Exception as e:
             logger.warning("Failed to list files", repo=str(repo_path), error=str(e))
             return False
         
-        if not files:
+        if not total_files:
             logger.debug("Excluded: no files found", repo=str(repo_path))
             return False
+        py_file_count = ext_counts[".py"]
+        code_file_count = sum(ext_counts[ext] for ext in CODE_EXTENSIONS if ext in ext_counts)
         
         # Step 4: Check Python files count
-        py_files = [f for f in files if f.suffix == ".py"]
-        if len(py_files) < min_py_files:
+        if py_file_count < min_py_files:
             logger.debug("Excluded: insufficient Python files",
                        repo=str(repo_path),
-                       py_files=len(py_files),
+                       py_files=py_file_count,
                        required=min_py_files)
             return False
         
         # Step 5: Check code file ratio
-        code_extensions = {".py", ".js", ".java", ".go", ".rs", ".cpp", ".c", ".ts", ".tsx"}
-        code_files = [f for f in files if f.suffix in code_extensions]
-        code_ratio = len(code_files) / len(files) if files else 0
+        code_ratio = code_file_count / total_files
         
         if code_ratio < min_code_ratio:
             logger.debug("Excluded: low code file ratio",
@@ -113,16 +136,6 @@ def is_valid_coding_project(
             return False
         
         # Step 6: Check project structure indicators
-        file_names = {f.name.lower() for f in files}
-        file_paths = {str(f.relative_to(repo_path)).lower() for f in files}
-        
-        has_structure = any([
-            "src/" in p for p in file_paths if "/" in p
-        ]) or any([
-            name in file_names
-            for name in ["__init__.py", "setup.py", "pyproject.toml", "requirements.txt"]
-        ])
-        
         if not has_structure:
             logger.debug("Excluded: no project structure indicators",
                        repo=str(repo_path))
@@ -130,7 +143,7 @@ def is_valid_coding_project(
         
         logger.debug("Valid coding project",
                    repo=str(repo_path),
-                   py_files=len(py_files),
+                   py_files=py_file_count,
                    code_ratio=f"{code_ratio:.2%}")
         return True
         
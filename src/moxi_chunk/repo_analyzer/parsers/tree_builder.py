@@ -3,20 +3,22 @@
 from pathlib import Path
 from typing import List
 
+from moxi_chunk.repo_analyzer.crawlers.local import fast_walk
+
 
 def list_files(repo_path: Path) -> List[Path]:
     """
     List all files (relative paths) under the repository.
 
+    VCS metadata, dependency, virtualenv and cache directories are pruned
+    without being read (see WALK_SKIP_DIRS), and each entry's type comes from
+    os.scandir(), so files are never stat()ed just to be listed.
+
     Args:
         repo_path: Root path of repository.
 
     Returns:
-        A list of relative file paths.
+        A sorted list of relative file paths.
     """
-    files: List[Path] = []
-    for path in repo_path.rglob("*"):
-        if path.is_file():
-            files.append(path.relative_to(repo_path))
-    return files
+    return fast_walk(repo_path)
 
@@ -17,7 +17,7 @@ def main() -> int:
     parser.add_argument(
         "--output", "-o",
         default="data/chunks/readme_chunks.json",
-        help="Output JSON path",
+        help="Output path (.jsonl writes one feature per line)",
     )
     parser.add_argument("--min-length", type=int, default=1000, help="Min chunk length")
     parser.add_argument("--max-length", type=int, default=2000, help="Max chunk length")
@@ -28,6 +28,12 @@ def main() -> int:
         help="Read from mongo, json, or auto",
     )
     parser.add_argument("--json-path", default=None, help="JSON path when source=json")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Chunking processes (default: one per CPU; 1 = no pool)",
+    )
     args = parser.parse_args()
 
     try:
@@ -37,6 +43,7 @@ def main() -> int:
             max_length=args.max_length,
             source=args.source,
             json_path=args.json_path,
+            workers=args.workers,
         )
         print(f"Wrote {n} chunks to {path}", file=sys.stderr)
         return 0
@@ -4,22 +4,40 @@ Moxi collection pipeline: gather READMEs + file trees from awesome-readme-style
 Output: data/collection/ (JSON) and/or MongoDB readme_samples.
 """
 
+import base64
 import json
 import os
 import re
 import sys
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from core.config import settings
+from core.http_cache import conditional_get
+from core.rate_limit import TokenBucket
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 GITHUB_API_BASE = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_BASE}/graphql"
 GITHUB_TOKEN = settings.GITHUB_TOKEN or os.environ.get("GITHUB_TOKEN")
 
+# Repos collected concurrently (each is a handful of network round-trips)
+COLLECT_WORKERS = 16
+# GitHub REST allows 5000 requests/hour with a token, 60 without
+API_REQUESTS_PER_HOUR = 5000 if GITHUB_TOKEN else 60
+
 DATA_DIR = Path(settings.DATA_DIR)
 DEFAULT_OUTPUT = str(DATA_DIR / "collection" / "awesome_readme_data.json")
 
@@ -30,49 +48,152 @@ README_LIST_SOURCES = [
 ]
 
 
-def _parse_repos_from_markdown(content: str, source_name: str) -> List[Dict[str, str]]:
-    link_pattern = re.compile(r"\]\s*\(\s*https://github\.com/([^/]+)/([^)/#?]+)[^)]*\)")
+# Characters str.splitlines() treats as line boundaries
+_LINE_BREAKS = r"\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile(f"[{_LINE_BREAKS}]")
+# Markdown link to a GitHub repo: ](https://github.com/owner/repo...)
+_LINK_RE = re.compile(
+    rf"\][^\S{_LINE_BREAKS}]*\([^\S{_LINE_BREAKS}]*https://github\.com/"
+    rf"([^/{_LINE_BREAKS}]+)/([^)/#?{_LINE_BREAKS}]+)[^){_LINE_BREAKS}]*\)"
+)
+
+# Directories left out of collected file trees (same names the local repo walk prunes)
+TREE_EXCLUDED_DIRS = (".git", "node_modules", "__pycache__", ".venv", "venv", ".pytest_cache", ".mypy_cache", ".tox", ".idea")
+# Whole path components only, so .github/ or .gitignore are kept
+_TREE_EXCLUDE_RE = re.compile(r"(?:^|/)(?:" + "|".join(map(re.escape, TREE_EXCLUDED_DIRS)) + r")(?:/|$)")
+
+# README keywords per project type, checked in priority order
+_PROJECT_TYPE_KEYWORDS = (
+    ("api", ("api", "rest", "endpoint")),
+    ("web_application", ("web", "frontend", "react")),
+    ("cli_tool", ("cli", "command", "tool")),
+    ("library", ("library", "package", "sdk")),
+    ("framework", ("framework",)),
+    ("mobile_app", ("mobile", "ios", "android")),
+)
+
+# README spellings tried in the GraphQL bundle; anything else goes through the REST readme endpoint
+_README_PATHS = ("README.md", "readme.md", "Readme.md", "README.rst", "README")
+# README + repo info in one round-trip (GraphQL needs a token)
+_REPO_BUNDLE_QUERY = """
+query($owner: String!, $repo: String!) {
+  repository(owner: $owner, name: $repo) {
+    description
+    stargazerCount
+    createdAt
+    updatedAt
+    primaryLanguage { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    defaultBranchRef { name }
+%s
+  }
+}
+""" % "\n".join(
+    f'    readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+    for i, path in enumerate(_README_PATHS)
+)
+
+
+_last_throttle_notice = 0.0
+
+
+def _report_throttle_wait(seconds: float) -> None:
+    """Say why collection stalls (at most once a minute: all workers wait together)."""
+    global _last_throttle_notice
+    now = time.monotonic()
+    if now - _last_throttle_notice >= 60:
+        _last_throttle_notice = now
+        hint = "" if GITHUB_TOKEN else " (set GITHUB_TOKEN for 5000/hour)"
+        print(f"  GitHub API limit of {API_REQUESTS_PER_HOUR} requests/hour reached, waiting ~{seconds:.0f}s{hint}")
+
+
+# Shared by all workers for api.github.com calls (raw downloads are not limited)
+_api_throttle = TokenBucket(API_REQUESTS_PER_HOUR, period=3600, burst=50, on_wait=_report_throttle_wait)
+
+# Shared session: collection workers reuse pooled keep-alive connections to
+# api.github.com / raw.githubusercontent.com instead of a TCP+TLS handshake per call
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+_SESSION.headers.update({"Accept": "application/vnd.github.v3+json"})
+if GITHUB_TOKEN:
+    _SESSION.headers["Authorization"] = f"token {GITHUB_TOKEN}"
+
+
+def _cached_get(url: str, timeout: float) -> requests.Response:
+    """GET through the shared session as a conditional request (see core.http_cache)."""
+    return conditional_get(_SESSION, url, timeout=timeout)
+
+
+def _parse_repos_from_markdown(content: str, source_name: str) -> Dict[str, Dict[str, str]]:
+    """Repos linked from a markdown list, keyed by lowercased "owner/repo" in first-seen order."""
     repos_by_key: Dict[str, Dict[str, str]] = {}
-    for line in content.splitlines():
-        for m in link_pattern.finditer(line):
-            owner, repo = m.group(1), m.group(2).rstrip("/")
-            if owner.lower() == "github.com" or not repo:
-                continue
-            key = f"{owner}/{repo}".lower()
-            if key in repos_by_key:
-                continue
-            rest = line[m.end() :].strip()
-            description = rest.lstrip("-").strip() if rest.startswith("-") else ""
-            repo_url = f"https://github.com/{owner}/{repo}"
-            repos_by_key[key] = {"repo_url": repo_url, "owner": owner, "repo": repo, "name": f"{owner}/{repo}", "description": description, "source": source_name}
-    return list(repos_by_key.values())
+    # One scan over the whole buffer; the pattern cannot cross a line break,
+    # so matches are the same as scanning line by line
+    for m in _LINK_RE.finditer(content):
+        owner, repo = m.group(1), m.group(2).rstrip("/")
+        if owner.lower() == "github.com" or not repo:
+            continue
+        key = f"{owner}/{repo}".lower()
+        if key in repos_by_key:
+            continue
+        eol = _LINE_BREAK_RE.search(content, m.end())
+        rest = content[m.end() : eol.start() if eol else len(content)].strip()
+        description = rest.lstrip("-").strip() if rest.startswith("-") else ""
+        repo_url = f"https://github.com/{owner}/{repo}"
+        repos_by_key[key] = {"repo_url": repo_url, "owner": owner, "repo": repo, "name": f"{owner}/{repo}", "description": description, "source": source_name}
+    return repos_by_key
+
+
+def _fetch_source(cfg: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    response = _SESSION.get(cfg["url"], timeout=15)
+    response.raise_for_status()
+    return _parse_repos_from_markdown(response.text, cfg["name"])
 
 
 def collect_repos_from_all_sources(source_names: Optional[List[str]] = None) -> List[Dict[str, str]]:
+    return list(_collect_repos_by_key(source_names).values())
+
+
+def _collect_repos_by_key(source_names: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+    """Merged repos from every selected list, keyed by lowercased "owner/repo"."""
+    sources = [cfg for cfg in README_LIST_SOURCES if source_names is None or cfg["name"] in source_names]
     seen: Dict[str, Dict[str, str]] = {}
-    for cfg in README_LIST_SOURCES:
-        name = cfg["name"]
-        if source_names is not None and name not in source_names:
-            continue
-        url = cfg["url"]
-        print(f"Fetching list: {name} ...")
-        try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            repos = _parse_repos_from_markdown(response.text, name)
-            for r in repos:
-                key = f"{r['owner']}/{r['repo']}".lower()
-                if key not in seen:
-                    seen[key] = r
+    if not sources:
+        print("Total: 0 unique repos")
+        return seen
+    print(f"Fetching lists: {', '.join(cfg['name'] for cfg in sources)} ...")
+    # Lists download in parallel; merging in source order keeps the earlier
+    # source's entry for a repo listed twice
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        futures = [pool.submit(_fetch_source, cfg) for cfg in sources]
+        for cfg, future in zip(sources, futures):
+            name = cfg["name"]
+            try:
+                repos = future.result()
+            except Exception as e:
+                print(f"   Skip {name}: {e}")
+                continue
+            for key, r in repos.items():
+                seen.setdefault(key, r)
             print(f"   {name}: {len(repos)} links (total unique: {len(seen)})")
-        except Exception as e:
-            print(f"   Skip {name}: {e}")
-    result = list(seen.values())
-    print(f"Total: {len(result)} unique repos")
-    return result
+    print(f"Total: {len(seen)} unique repos")
+    return seen
 
 
-def fetch_repo_readme(owner: str, repo: str) -> Optional[str]:
+def _fetch_raw_readme(owner: str, repo: str) -> Optional[str]:
+    """Probe raw.githubusercontent.com directly (not counted against the API rate limit)."""
     raw_urls = [
         f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md",
         f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md",
@@ -81,21 +202,33 @@ def fetch_repo_readme(owner: str, repo: str) -> Optional[str]:
     ]
     for raw_url in raw_urls:
         try:
-            response = requests.get(raw_url, timeout=10)
+            response = _SESSION.get(raw_url, timeout=10)
             if response.status_code == 200:
                 return response.text
         except Exception:
             continue
+    return None
+
+
+def fetch_repo_readme(owner: str, repo: str) -> Optional[str]:
+    # Without a token the API allows 60 requests/hour, so try the free raw
+    # probes first and spend an API call only on unusual names/branches
+    if not GITHUB_TOKEN:
+        readme = _fetch_raw_readme(owner, repo)
+        if readme is not None:
+            return readme
+    # The readme endpoint resolves the default branch and file name in one call
+    # and inlines the content, so no blind raw probes are needed
     try:
         url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/readme"
-        headers = {"Accept": "application/vnd.github.v3+json"}
-        if GITHUB_TOKEN:
-            headers["Authorization"] = f"token {GITHUB_TOKEN}"
-        response = requests.get(url, headers=headers, timeout=10)
+        _api_throttle.acquire()
+        response = _cached_get(url, timeout=10)
         if response.status_code == 404:
             return None
+        if response.status_code == 403 and GITHUB_TOKEN:
+            # Rate-limited: raw downloads are still allowed
+            return _fetch_raw_readme(owner, repo)
         response.raise_for_status()
-        import base64
         return base64.b64decode(response.json()["content"]).decode("utf-8")
     except Exception as e:
         print(f"  Could not fetch README for {owner}/{repo}: {e}")
@@ -104,9 +237,9 @@ def fetch_repo_readme(owner: str, repo: str) -> Optional[str]:
 
 def fetch_repo_info(owner: str, repo: str) -> Optional[Dict]:
     url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
-    headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        _api_throttle.acquire()
+        response = _cached_get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
         return {"language": data.get("language"), "stars": data.get("stargazers_count", 0), "description": data.get("description", ""), "topics": data.get("topics", []), "created_at": data.get("created_at"), "updated_at": data.get("updated_at")}
@@ -118,42 +251,122 @@ def fetch_repo_info(owner: str, repo: str) -> Optional[Dict]:
 def detect_project_type(readme: str, repo_info: Optional[Dict]) -> str:
     readme_lower = readme.lower()
     repo_info = repo_info or {}
-    if "api" in readme_lower or "rest" in readme_lower or "endpoint" in readme_lower:
-        return "api"
-    elif "web" in readme_lower or "frontend" in readme_lower or "react" in readme_lower:
-        return "web_application"
-    elif "cli" in readme_lower or "command" in readme_lower or "tool" in readme_lower:
-        return "cli_tool"
-    elif "library" in readme_lower or "package" in readme_lower or "sdk" in readme_lower:
-        return "library"
-    elif "framework" in readme_lower:
-        return "framework"
-    elif "mobile" in readme_lower or "ios" in readme_lower or "android" in readme_lower:
-        return "mobile_app"
+    # Substring search is a C-level scan, so checking groups in priority order
+    # and stopping at the first hit beats a single regex pass over the README
+    for project_type, keywords in _PROJECT_TYPE_KEYWORDS:
+        if any(keyword in readme_lower for keyword in keywords):
+            return project_type
     return "other"
 
 
-def get_repo_file_tree(owner: str, repo: str) -> List[str]:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/main?recursive=1"
-    headers = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+def fetch_repo_bundle(owner: str, repo: str) -> Optional[Tuple[Optional[str], Dict, Optional[str]]]:
+    """
+    Fetch README text, repo info and default branch with one GraphQL query.
+
+    Returns (readme or None if no common README path matched, info shaped like
+    fetch_repo_info, default branch), or None when GraphQL is unavailable or
+    the query failed so the caller can use the REST endpoints.
+    """
+    if not GITHUB_TOKEN:
+        return None
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 404:
-            response = requests.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/master?recursive=1", headers=headers, timeout=10)
+        _api_throttle.acquire()
+        response = _SESSION.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": _REPO_BUNDLE_QUERY, "variables": {"owner": owner, "repo": repo}},
+            timeout=15,
+        )
+        response.raise_for_status()
+        data = (response.json().get("data") or {}).get("repository")
+        if not data:
+            return None
+    except Exception as e:
+        print(f"  GraphQL bundle failed for {owner}/{repo}: {e}")
+        return None
+    readme = next(
+        (blob["text"] for blob in (data.get(f"readme{i}") for i in range(len(_README_PATHS)))
+         if blob and blob.get("text") is not None),
+        None,
+    )
+    info = {
+        "language": (data.get("primaryLanguage") or {}).get("name"),
+        "stars": data.get("stargazerCount", 0),
+        "description": data.get("description"),
+        "topics": [node["topic"]["name"] for node in (data.get("repositoryTopics") or {}).get("nodes", [])],
+        "created_at": data.get("createdAt"),
+        "updated_at": data.get("updatedAt"),
+    }
+    branch = (data.get("defaultBranchRef") or {}).get("name")
+    return readme, info, branch
+
+
+def get_repo_file_tree(owner: str, repo: str, branch: Optional[str] = None) -> List[str]:
+    # Without a known default branch, try main then master
+    refs = (branch,) if branch else ("main", "master")
+    try:
+        for ref in refs:
+            _api_throttle.acquire()
+            response = _cached_get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees/{ref}?recursive=1", timeout=10)
+            if response.status_code != 404:
+                break
         if response.status_code == 404:
             return []
         response.raise_for_status()
         data = response.json()
-        excluded = [".git", "node_modules", "__pycache__", ".venv", "venv", ".pytest_cache", ".mypy_cache"]
-        return sorted(
+        paths = [
             item["path"] for item in data.get("tree", [])
-            if item["type"] == "blob" and not any(ex in item["path"] for ex in excluded)
-        )
+            if item["type"] == "blob" and not _TREE_EXCLUDE_RE.search(item["path"])
+        ]
+        paths.sort()
+        return paths
     except Exception as e:
         print(f"  Could not fetch file tree: {e}")
         return []
 
 
+def _collect_one(repo_info: Dict[str, str], min_readme_length: int) -> Tuple[Dict[str, str], Optional[dict]]:
+    """Fetch one repo's README, metadata and file tree: (repo_info, sample or None if it failed)."""
+    owner = repo_info["owner"]
+    repo = repo_info["repo"]
+    bundle = fetch_repo_bundle(owner, repo)
+    if bundle is not None:
+        readme, repo_metadata, branch = bundle
+        if readme is None:
+            readme = fetch_repo_readme(owner, repo)
+    else:
+        readme, repo_metadata, branch = fetch_repo_readme(owner, repo), None, None
+    if not readme or len(readme) < min_readme_length:
+        return repo_info, None
+    if repo_metadata is None:
+        repo_metadata = fetch_repo_info(owner, repo) or {}
+    project_type = detect_project_type(readme, repo_metadata)
+    file_tree = get_repo_file_tree(owner, repo, branch)
+    sample = {
+        "repo_url": repo_info["repo_url"], "owner": owner, "repo": repo, "name": repo_info["name"],
+        "description": repo_info["description"], "project_type": project_type,
+        "language": repo_metadata.get("language"), "stars": repo_metadata.get("stars", 0),
+        "readme": readme, "readme_length": len(readme), "file_tree": file_tree, "file_count": len(file_tree),
+        "source": repo_info.get("source", "awesome-readme"),
+    }
+    return repo_info, sample
+
+
+def _read_json(path: Path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    """Write indented UTF-8 JSON; orjson serializes the large README payload much faster."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+
 def collect_awesome_readme_data(
     output_file: str = DEFAULT_OUTPUT,
     limit: Optional[int] = None,
@@ -167,64 +380,51 @@ def collect_awesome_readme_data(
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     print("Collecting README data (multi-source merge)...")
-    repos = collect_repos_from_all_sources(source_names=source_names)
+    # Keys are built once at parse time and reused for the skip check below
+    repos_by_key = _collect_repos_by_key(source_names)
+    keys = list(repos_by_key)
     if limit:
-        repos = repos[:limit]
-    total_in_list = len(repos)
+        keys = keys[:limit]
+    total_in_list = len(keys)
 
-    existing_by_key: Dict[str, dict] = {}
-    existing_failed: List[Dict[str, str]] = []
+    training_data: List[dict] = []
+    failed: List[Dict[str, str]] = []
+    existing_ok_keys: Set[str] = set()
+    existing_failed_keys: Set[str] = set()
     if output_path.exists():
         try:
-            with open(output_path, "r", encoding="utf-8") as f:
-                old = json.load(f)
-            for s in old.get("training_data", []):
-                key = f"{s.get('owner', '')}/{s.get('repo', '')}".lower()
-                if key:
-                    existing_by_key[key] = s
-            existing_failed = old.get("failed", [])
-            failed_keys = {f"{f.get('owner', '')}/{f.get('repo', '')}".lower() for f in existing_failed}
-            existing_by_key.update({k: {"_failed": True} for k in failed_keys if k})
+            old = _read_json(output_path)
+            training_data = old.get("training_data", [])
+            failed = [r for r in old.get("failed", []) if isinstance(r, dict)]
+            existing_ok_keys = {f"{s.get('owner', '')}/{s.get('repo', '')}".lower() for s in training_data}
+            existing_failed_keys = {f"{r.get('owner', '')}/{r.get('repo', '')}".lower() for r in failed}
         except Exception as e:
+            training_data, failed = [], []
             print(f"Could not load existing output ({e}), will collect from scratch.")
-    training_data = [s for s in existing_by_key.values() if not s.get("_failed")]
-    failed = [f for f in existing_failed if isinstance(f, dict)]
-    skipped = sum(1 for r in repos if f"{r['owner']}/{r['repo']}".lower() in existing_by_key)
+    seen = existing_ok_keys | existing_failed_keys
+    repos = [repos_by_key[key] for key in keys if key not in seen]
+    skipped = total_in_list - len(repos)
     if skipped:
         print(f"Skipping {skipped} already-collected repos.")
-    repos = [r for r in repos if f"{r['owner']}/{r['repo']}".lower() not in existing_by_key]
     print(f"Will collect READMEs from {len(repos)} repos...")
-    for i, repo_info in enumerate(repos, 1):
-        owner = repo_info["owner"]
-        repo = repo_info["repo"]
-        print(f"\n[{i}/{len(repos)}] {owner}/{repo}...")
-        readme = fetch_repo_readme(owner, repo)
-        if not readme:
-            failed.append(repo_info)
-            continue
-        if len(readme) < min_readme_length:
-            failed.append(repo_info)
-            continue
-        repo_metadata = fetch_repo_info(owner, repo) or {}
-        project_type = detect_project_type(readme, repo_metadata)
-        file_tree = get_repo_file_tree(owner, repo)
-        sample = {
-            "repo_url": repo_info["repo_url"], "owner": owner, "repo": repo, "name": repo_info["name"],
-            "description": repo_info["description"], "project_type": project_type,
-            "language": repo_metadata.get("language"), "stars": repo_metadata.get("stars", 0),
-            "readme": readme, "readme_length": len(readme), "file_tree": file_tree, "file_count": len(file_tree),
-            "source": repo_info.get("source", "awesome-readme"),
-        }
-        training_data.append(sample)
-        print(f"  OK ({len(readme)} chars, {project_type})")
-        time.sleep(0.5)
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "metadata": {"total_repos": total_in_list, "collected": len(training_data), "failed": len(failed), "sources": [s["name"] for s in README_LIST_SOURCES], "collection_date": time.strftime("%Y-%m-%d %H:%M:%S")},
-            "training_data": training_data,
-            "failed": failed,
-        }, f, indent=2, ensure_ascii=False)
+    if repos:
+        with ThreadPoolExecutor(max_workers=COLLECT_WORKERS, thread_name_prefix="collect") as pool:
+            results = pool.map(_collect_one, repos, [min_readme_length] * len(repos))
+            # map() yields in input order, so the output file stays in list order
+            for i, (repo_info, sample) in enumerate(results, 1):
+                print(f"[{i}/{len(repos)}] {repo_info['owner']}/{repo_info['repo']}", end="")
+                if sample is None:
+                    print("  failed")
+                    failed.append(repo_info)
+                else:
+                    print(f"  OK ({sample['readme_length']} chars, {sample['project_type']})")
+                    training_data.append(sample)
+
+    _write_json(output_path, {
+        "metadata": {"total_repos": total_in_list, "collected": len(training_data), "failed": len(failed), "sources": [s["name"] for s in README_LIST_SOURCES], "collection_date": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "training_data": training_data,
+        "failed": failed,
+    })
     print(f"\nDone. Collected: {len(training_data)}, failed: {len(failed)}, saved to {output_path}")
     try:
         from core.db.mongo import ping, insert_readme_samples
@@ -234,8 +434,8 @@ def collect_awesome_readme_data(
     except Exception as e:
         print(f"  MongoDB not written: {e}")
     if training_data:
-        avg_len = sum(s["readme_length"] for s in training_data) // len(training_data)
-        print(f"  Avg README length: {avg_len} chars. Types: {dict(Counter(s['project_type'] for s in training_data))}")
+        avg_len = sum(map(itemgetter("readme_length"), training_data)) // len(training_data)
+        print(f"  Avg README length: {avg_len} chars. Types: {dict(Counter(map(itemgetter('project_type'), training_data)))}")
 
 
 def push_json_to_mongo(json_path: str) -> bool:
@@ -246,8 +446,7 @@ def push_json_to_mongo(json_path: str) -> bool:
     if not path.exists():
         print(f"File not found: {path}")
         return False
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = _read_json(path)
     training_data = data.get("training_data", [])
     if not training_data:
         print("No training_data in file.")
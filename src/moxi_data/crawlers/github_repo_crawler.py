@@ -1,19 +1,124 @@
 """GitHub Trending crawler for fetching high-quality repositories."""
 
+import re
+import threading
 import time
-from typing import List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterator, List, NamedTuple, Optional
 
 import requests
-from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from core import get_logger, settings
 from core.errors import ImproperlyConfigured
+from core.http_cache import conditional_get
+from core.rate_limit import TokenBucket
 from core.lib import extract_repo_owner_and_name, validate_github_url
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# Search result pages requested at once
+SEARCH_PAGE_WORKERS = 4
+
+# Exclude keywords for description/topics (substring) and names
+EXCLUDE_KEYWORDS = frozenset({
+    "awesome", "list", "books", "resources", "curated",
+    "collection", "learning", "tutorial", "course", "education",
+    "framework", "library", "boilerplate", "template", "starter",
+    "sdk", "toolkit", "engine", "compiler", "interpreter",
+})
+EXCLUDE_NAME_KEYWORDS = frozenset({"awesome", "list", "framework", "library", "sdk", "toolkit"})
+# Looser lists for the fallback query
+FALLBACK_EXCLUDE_KEYWORDS = frozenset({
+    "awesome", "list", "framework", "library", "boilerplate",
+    "template", "starter", "sdk", "toolkit",
+})
+FALLBACK_EXCLUDE_NAME_KEYWORDS = frozenset({"awesome", "list", "framework", "library"})
+
+
+def _keyword_re(keywords: frozenset) -> re.Pattern:
+    """Substring match of any keyword in one regex scan instead of one scan per keyword."""
+    return re.compile("|".join(map(re.escape, sorted(keywords))))
+
+
+_EXCLUDE_RE = _keyword_re(EXCLUDE_KEYWORDS)
+_EXCLUDE_NAME_RE = _keyword_re(EXCLUDE_NAME_KEYWORDS)
+_FALLBACK_EXCLUDE_RE = _keyword_re(FALLBACK_EXCLUDE_KEYWORDS)
+_FALLBACK_EXCLUDE_NAME_RE = _keyword_re(FALLBACK_EXCLUDE_NAME_KEYWORDS)
+
+
+class _ExcludeRules(NamedTuple):
+    """Keyword filters applied to a search result's description, topics and name."""
+
+    description: re.Pattern
+    topics: frozenset
+    name: re.Pattern
+
+
+_EXCLUDE_RULES = _ExcludeRules(_EXCLUDE_RE, EXCLUDE_KEYWORDS, _EXCLUDE_NAME_RE)
+_FALLBACK_EXCLUDE_RULES = _ExcludeRules(
+    _FALLBACK_EXCLUDE_RE, FALLBACK_EXCLUDE_KEYWORDS, _FALLBACK_EXCLUDE_NAME_RE
+)
+
+# Search terms and negative qualifiers per project type (real applications, not frameworks);
+# simpler terms are more likely to return results
+PROJECT_TYPE_QUERIES = {
+    "webapp": (
+        "(webapp OR \"web app\" OR \"web application\" OR \"full stack\" OR fullstack)",
+        "-framework -library -boilerplate -template -starter",
+    ),
+    "fullstack": (
+        "(\"full stack\" OR fullstack OR \"frontend backend\" OR \"api server\")",
+        "-framework -library -boilerplate",
+    ),
+    "api": (
+        "(api OR \"rest api\" OR \"graphql api\" OR \"api server\")",
+        "-framework -library -sdk -boilerplate",
+    ),
+}
+# Always exclude frameworks and libraries (but less aggressively) without a project type
+DEFAULT_QUERY_EXCLUDES = "-framework -library -boilerplate -template"
+FALLBACK_QUERY_EXCLUDES = "-framework -library -boilerplate"
+# Excluded server-side on every query (the client-side filters would drop these anyway);
+# "-term" rather than NOT, since a query may hold at most five AND/OR/NOT operators
+COMMON_QUERY_EXCLUDES = "-awesome"
+# Projects not pushed to / updated within this many days are skipped (likely too complex/legacy)
+RECENT_ACTIVITY_DAYS = 730
+
+GRAPHQL_SEARCH_QUERY = """
+query($q: String!, $first: Int!, $after: String) {
+  search(query: $q, type: REPOSITORY, first: $first, after: $after) {
+    pageInfo { endCursor hasNextPage }
+    nodes {
+      ... on Repository {
+        name
+        url
+        owner { login }
+        stargazerCount
+        primaryLanguage { name }
+        description
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        updatedAt
+      }
+    }
+  }
+}
+"""
+
 
-class RepositoryInfo(BaseModel):
+@dataclass(slots=True, frozen=True)
+class RepositoryInfo:
     """Repository information for dataset generation."""
 
     url: str
@@ -25,27 +130,117 @@ class RepositoryInfo(BaseModel):
     description: Optional[str] = None
 
 
+def _graphql_repo_to_item(node: dict) -> dict:
+    """Map a GraphQL Repository node onto the REST search item fields we read."""
+    return {
+        "name": node["name"],
+        "html_url": node["url"],
+        "owner": {"login": node["owner"]["login"]},
+        "stargazers_count": node["stargazerCount"],
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "description": node.get("description"),
+        "topics": [n["topic"]["name"] for n in (node.get("repositoryTopics") or {}).get("nodes", [])],
+        "updated_at": node.get("updatedAt"),
+    }
+
+
+def _response_json(response: requests.Response):
+    """Decode a JSON response body; orjson parses the bytes directly (search pages are large)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # Let requests decode it (other encodings) or raise its usual error
+    return response.json()
+
+
+class _TokenPool:
+    """Round-robin over GitHub tokens, skipping ones whose quota is nearly spent until it resets."""
+
+    # Below this many remaining requests a token rests until X-RateLimit-Reset
+    MIN_REMAINING = 5
+
+    def __init__(self, tokens: List[str]):
+        self._tokens = tokens
+        self._next = 0
+        self._resting_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def acquire(self) -> str:
+        """Next token with quota left (or, if all are low, the one that resets first)."""
+        with self._lock:
+            now = time.time()
+            for _ in range(len(self._tokens)):
+                token = self._tokens[self._next]
+                self._next = (self._next + 1) % len(self._tokens)
+                if self._resting_until.get(token, 0.0) <= now:
+                    return token
+            return min(self._tokens, key=lambda token: self._resting_until.get(token, 0.0))
+
+    def update(self, token: str, headers) -> None:
+        """Record the quota a response reports for ``token``."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            if int(remaining) < self.MIN_REMAINING:
+                self._resting_until[token] = float(reset)
+            else:
+                self._resting_until.pop(token, None)
+
+
 class GithubTrendingCrawler:
     """Crawler for fetching high-quality GitHub repositories using GitHub API."""
 
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, github_tokens: Optional[List[str]] = None):
         """
         Initialize GitHub Trending crawler.
         
         Args:
             github_token: GitHub personal access token. If None, uses settings.GITHUB_TOKEN.
                         Token is optional but recommended for higher rate limits.
+            github_tokens: Several tokens to rotate through, each with its own quota.
+                        If None, settings.GITHUB_TOKENS (comma-separated) is added to github_token.
         """
-        self.token = github_token or settings.GITHUB_TOKEN
+        if github_tokens is None:
+            github_tokens = [github_token or settings.GITHUB_TOKEN or ""]
+            github_tokens += (settings.GITHUB_TOKENS or "").split(",")
+        tokens = list(dict.fromkeys(token.strip() for token in github_tokens if token and token.strip()))
+        self.token = tokens[0] if tokens else None
+        self._token_pool = _TokenPool(tokens) if tokens else None
         self.base_url = "https://api.github.com"
         self.session = requests.Session()
+        # Keep-alive connections to api.github.com shared by the page workers; transient
+        # errors and secondary rate limits (429 + Retry-After) are retried with backoff.
+        # GraphQL POSTs are read-only queries, so they are retried too.
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=20,
+                pool_maxsize=20,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=1,
+                    status_forcelist=[429, 502, 503, 504],
+                    allowed_methods=frozenset({"GET", "POST"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                ),
+            ),
+        )
+        # Search API: 30 requests/minute per token, 10 without
+        self._search_limiter = TokenBucket(30 * len(tokens) if tokens else 10)
         
         if self.token:
             self.session.headers.update({
                 "Authorization": f"token {self.token}",
                 "Accept": "application/vnd.github.v3+json"
             })
-            logger.info("GitHub API authenticated", has_token=True)
+            logger.info("GitHub API authenticated", has_token=True, tokens=len(self._token_pool))
         else:
             logger.warning("No GitHub token provided, rate limit: 60 requests/hour")
             logger.warning("With token: 5000 requests/hour. Consider setting GITHUB_TOKEN in .env")
@@ -64,12 +259,17 @@ class GithubTrendingCrawler:
         Raises:
             ImproperlyConfigured: If API request fails (except 422 which is handled by caller)
         """
+        token = self._token_pool.acquire() if self._token_pool else None
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            # Conditional request: an unchanged page is a free 304 (see core.http_cache)
+            response = conditional_get(self.session, url, params=params, timeout=30,
+                                       headers={"Authorization": f"token {token}"} if token else None)
+            if token:
+                self._token_pool.update(token, response.headers)
             
             # Handle 422 error (GitHub API limit: max 1000 results)
             if response.status_code == 422:
-                error_data = response.json()
+                error_data = _response_json(response)
                 error_message = error_data.get("message", "Unprocessable Entity")
                 if "Only the first 1000 search results" in error_message:
                     # This is expected when reaching GitHub's 1000 result limit
@@ -85,7 +285,7 @@ class GithubTrendingCrawler:
             if remaining < 10:
                 logger.warning("GitHub API rate limit low", remaining=remaining)
             
-            return response.json()
+            return _response_json(response)
             
         except requests.exceptions.HTTPError as e:
             # Re-raise 422 errors so caller can handle them gracefully
@@ -97,6 +297,202 @@ class GithubTrendingCrawler:
             logger.error("GitHub API request failed", url=url, error=str(e))
             raise ImproperlyConfigured(f"GitHub API request failed: {str(e)}")
 
+    def _search_page(self, url: str, params: dict) -> dict:
+        """Fetch one page of search results within the search rate limit."""
+        self._search_limiter.acquire()
+        return self._make_request(url, params=params)
+
+    def _rest_search_pages(self, params: dict, max_pages: int, limit: int) -> Iterator[dict]:
+        """
+        Yield REST search result pages in page order.
+        
+        Page 1 is fetched alone. When more pages are wanted, as many as the
+        limit can still use (assuming every result is kept, at most
+        SEARCH_PAGE_WORKERS) are requested together, paced by the search rate
+        limit rather than fixed sleeps; nothing is requested ahead of that.
+        """
+        url = f"{self.base_url}/search/repositories"
+        per_page = params["per_page"]
+        futures: deque = deque()
+        next_page = 1
+        items_seen = 0
+        with ThreadPoolExecutor(max_workers=SEARCH_PAGE_WORKERS, thread_name_prefix="gh-search") as pool:
+            try:
+                while futures or next_page <= max_pages:
+                    if not futures:
+                        wanted = 1 if next_page == 1 else -(-(limit - items_seen) // per_page)
+                        for _ in range(max(1, min(wanted, SEARCH_PAGE_WORKERS, max_pages - next_page + 1))):
+                            futures.append(pool.submit(self._search_page, url, {**params, "page": next_page}))
+                            next_page += 1
+                    data = futures.popleft().result()
+                    items_seen += len(data.get("items", []))
+                    yield data
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _graphql(self, query: str, variables: dict) -> dict:
+        """
+        Run a GraphQL query and return its ``data``.
+        
+        Raises:
+            ImproperlyConfigured: If the request fails or the response has errors
+        """
+        token = self._token_pool.acquire()
+        try:
+            response = self.session.post(
+                f"{self.base_url}/graphql",
+                json={"query": query, "variables": variables},
+                headers={"Authorization": f"token {token}"},
+                timeout=30,
+            )
+            self._token_pool.update(token, response.headers)
+            response.raise_for_status()
+            payload = _response_json(response)
+        except requests.exceptions.RequestException as e:
+            logger.error("GitHub GraphQL request failed", error=str(e))
+            raise ImproperlyConfigured(f"GitHub GraphQL request failed: {str(e)}")
+        if payload.get("errors"):
+            message = payload["errors"][0].get("message", "unknown error")
+            logger.error("GitHub GraphQL query failed", error=message)
+            raise ImproperlyConfigured(f"GitHub GraphQL query failed: {message}")
+        return payload["data"]
+
+    def _graphql_search_pages(
+        self, query: str, sort: str, order: str, per_page: int, max_pages: int
+    ) -> Iterator[dict]:
+        """
+        Yield search result pages from the GraphQL API, shaped like REST search responses.
+        
+        Only the fields the filters use are selected, so each page is a much
+        smaller response than the REST one; pages follow the result cursor.
+        Requires a token (GraphQL has no anonymous access). These POSTs bypass
+        core.http_cache: GitHub sends no ETag for GraphQL, so there is nothing
+        to revalidate and each page costs its rate-limit points on every run.
+        """
+        variables = {"q": f"{query} sort:{sort}-{order}", "first": per_page, "after": None}
+        for _ in range(max_pages):
+            search = self._graphql(GRAPHQL_SEARCH_QUERY, variables)["search"]
+            yield {"items": [_graphql_repo_to_item(node) for node in search["nodes"] if node]}
+            if not search["pageInfo"]["hasNextPage"]:
+                return
+            variables["after"] = search["pageInfo"]["endCursor"]
+
+    @staticmethod
+    def _build_query(
+        min_stars: int,
+        language: Optional[str] = None,
+        project_type: Optional[str] = None,
+        fallback: bool = False,
+    ) -> str:
+        """
+        Build the search query string.
+        
+        Args:
+            min_stars: Minimum number of stars
+            language: Programming language filter
+            project_type: Type of project ("webapp", "fullstack", "api", None for general)
+            fallback: Simpler query without project_type restrictions
+            
+        Returns:
+            GitHub search query
+        """
+        query_parts = [f"stars:>={min_stars}", COMMON_QUERY_EXCLUDES]
+        if fallback:
+            query_parts.append(FALLBACK_QUERY_EXCLUDES)
+        elif project_type:
+            query_parts.extend(PROJECT_TYPE_QUERIES.get(project_type, ()))
+        else:
+            query_parts.append(DEFAULT_QUERY_EXCLUDES)
+        
+        # Exclude old/complex projects on GitHub's side instead of fetching and dropping them
+        # Don't exclude Java - some good projects use Java
+        pushed_after = datetime.now(timezone.utc).date() - timedelta(days=RECENT_ACTIVITY_DAYS)
+        query_parts.append(f"pushed:>{pushed_after.isoformat()}")
+        
+        if language:
+            # GitHub API requires lowercase language names
+            # "Python" -> "python", "JavaScript" -> "javascript", etc.
+            query_parts.append(f"language:{language.lower()}")
+        
+        return " ".join(query_parts)
+
+    @staticmethod
+    def _filter_item(
+        item: dict,
+        language: Optional[str] = None,
+        rules: _ExcludeRules = _EXCLUDE_RULES,
+        updated_cutoff: str = "",
+    ) -> Optional[RepositoryInfo]:
+        """
+        Turn a search result into a RepositoryInfo, or None if it is filtered out.
+        
+        Args:
+            item: Search result item (REST shape)
+            language: Expected language; results reporting another one are skipped
+            rules: Exclude keywords for description, topics and name
+            updated_cutoff: Skip results last updated before this ISO-8601 UTC timestamp
+            
+        Returns:
+            RepositoryInfo, or None if the repository is skipped
+        """
+        # Additional language filter: GitHub API's language field may not match query
+        repo_language = item.get("language", "").lower() if item.get("language") else ""
+        if language:
+            language_lower = language.lower()
+            # Skip if language doesn't match (GitHub API sometimes returns wrong language)
+            if repo_language and repo_language != language_lower:
+                logger.debug("Skipping repo with mismatched language",
+                           repo=item["name"],
+                           expected=language_lower,
+                           actual=repo_language)
+                return None
+
+        # Filter: Exclude content list projects based on description and topics
+        description = (item.get("description") or "").lower()
+        topics = item.get("topics", [])
+        repo_name = item["name"].lower()
+
+        # Skip if description contains exclude keywords
+        if rules.description.search(description):
+            logger.debug("Skipping excluded project (description)",
+                       repo=item["name"],
+                       description=description[:100])
+            return None
+
+        # Skip if topics contain exclude keywords
+        if any(topic.lower() in rules.topics for topic in topics):
+            logger.debug("Skipping excluded project (topics)",
+                       repo=item["name"],
+                       topics=topics)
+            return None
+
+        # Skip if repository name contains exclude keywords
+        if rules.name.search(repo_name):
+            logger.debug("Skipping excluded project (name)",
+                       repo=item["name"])
+            return None
+
+        # Skip very old projects (likely too complex/legacy)
+        # Check if last updated is too old (more than 2 years)
+        # (GitHub timestamps are ISO-8601 UTC, so they compare as strings)
+        updated_at = item.get("updated_at") or ""
+        if updated_at and updated_at < updated_cutoff:
+            logger.debug("Skipping old project",
+                       repo=item["name"],
+                       updated=updated_at)
+            return None
+
+        return RepositoryInfo(
+            url=item["html_url"],
+            owner=item["owner"]["login"],
+            name=item["name"],
+            stars=item["stargazers_count"],
+            language=item.get("language"),
+            has_readme=item.get("has_readme", False),
+            description=item.get("description")
+        )
+
     def search_repositories(
         self,
         min_stars: int = 100,
@@ -120,39 +516,7 @@ class GithubTrendingCrawler:
         Returns:
             List of RepositoryInfo objects
         """
-        query_parts = [f"stars:>={min_stars}"]
-        
-        # Add project type specific queries (for real applications, not frameworks)
-        # Use simpler queries that are more likely to return results
-        if project_type == "webapp":
-            # Search for web applications - use broader terms
-            query_parts.append("(webapp OR \"web app\" OR \"web application\" OR \"full stack\" OR fullstack)")
-            query_parts.append("-framework -library -boilerplate -template -starter")
-        elif project_type == "fullstack":
-            # Search for full-stack projects
-            query_parts.append("(\"full stack\" OR fullstack OR \"frontend backend\" OR \"api server\")")
-            query_parts.append("-framework -library -boilerplate")
-        elif project_type == "api":
-            # Search for API projects
-            query_parts.append("(api OR \"rest api\" OR \"graphql api\" OR \"api server\")")
-            query_parts.append("-framework -library -sdk -boilerplate")
-        
-        # Always exclude frameworks and libraries (but less aggressively)
-        if not project_type:
-            query_parts.append("-framework -library -boilerplate -template")
-        
-        # Exclude old/complex projects (but make it optional if no results)
-        # Don't exclude Java - some good projects use Java
-        # Use more recent date to get more results
-        query_parts.append("pushed:>2022-01-01")  # Last 3 years (more lenient)
-        
-        if language:
-            # GitHub API requires lowercase language names
-            # "Python" -> "python", "JavaScript" -> "javascript", etc.
-            language_lower = language.lower()
-            query_parts.append(f"language:{language_lower}")
-        
-        query = " ".join(query_parts)
+        query = self._build_query(min_stars, language, project_type)
         # Default limit if not provided
         if limit is None:
             limit = settings.MAX_REPOS_TO_CRAWL
@@ -160,122 +524,59 @@ class GithubTrendingCrawler:
                    query=query, min_stars=min_stars, limit=limit)
         
         repos: List[RepositoryInfo] = []
-        page = 1
+        updated_cutoff = (datetime.now(timezone.utc) - timedelta(days=RECENT_ACTIVITY_DAYS)).strftime("%Y-%m-%dT%H:%M:%SZ")
         per_page = min(100, limit)  # GitHub API max is 100 per page
         max_pages = 10  # GitHub API search limit: max 1000 results (10 pages × 100 per page)
+        filter_item = partial(self._filter_item, language=language, updated_cutoff=updated_cutoff)
         
-        while len(repos) < limit and page <= max_pages:
-            params = {
-                "q": query,
-                "sort": sort,
-                "order": order,
-                "per_page": per_page,
-                "page": page
-            }
-            
-            url = f"{self.base_url}/search/repositories"
-            try:
-                data = self._make_request(url, params=params)
-            except Exception as e:
-                # Handle 422 error (GitHub API limit: max 1000 results)
-                if "422" in str(e) or "Unprocessable Entity" in str(e):
-                    logger.warning("GitHub API limit reached (max 1000 results)", 
-                                 page=page, 
-                                 repos_fetched=len(repos),
-                                 hint="GitHub API only returns max 1000 results per search query")
+        # Pages come back in order (see _rest_search_pages/_graphql_search_pages).
+        # With a token the smaller GraphQL pages win over the ETag cache, which
+        # only covers the REST path (GraphQL responses carry no ETag)
+        if self.token:
+            pages = self._graphql_search_pages(query, sort, order, per_page, max_pages)
+        else:
+            pages = self._rest_search_pages(
+                {"q": query, "sort": sort, "order": order, "per_page": per_page}, max_pages, limit
+            )
+        try:
+            for page in range(1, max_pages + 1):
+                if len(repos) >= limit:
                     break
-                else:
-                    raise  # Re-raise other errors
-            
-            items = data.get("items", [])
-            if not items:
-                logger.info("No more repositories found", page=page)
-                break
-            
-            for item in items:
-                    if len(repos) >= limit:
+                try:
+                    data = next(pages)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    # Handle 422 error (GitHub API limit: max 1000 results)
+                    if "422" in str(e) or "Unprocessable Entity" in str(e):
+                        logger.warning("GitHub API limit reached (max 1000 results)", 
+                                     page=page, 
+                                     repos_fetched=len(repos),
+                                     hint="GitHub API only returns max 1000 results per search query")
                         break
-                    
-                    # Additional language filter: GitHub API's language field may not match query
-                    repo_language = item.get("language", "").lower() if item.get("language") else ""
-                    if language:
-                        language_lower = language.lower()
-                        # Skip if language doesn't match (GitHub API sometimes returns wrong language)
-                        if repo_language and repo_language != language_lower:
-                            logger.debug("Skipping repo with mismatched language",
-                                       repo=item["name"],
-                                       expected=language_lower,
-                                       actual=repo_language)
-                            continue
-                    
-                    # Filter: Exclude content list projects based on description and topics
-                    description = (item.get("description") or "").lower()
-                    topics = item.get("topics", [])
-                    repo_name = item["name"].lower()
-                    
-                    exclude_keywords = [
-                        "awesome", "list", "books", "resources", "curated",
-                        "collection", "learning", "tutorial", "course", "education",
-                        "framework", "library", "boilerplate", "template", "starter",
-                        "sdk", "toolkit", "engine", "compiler", "interpreter"
-                    ]
-                    
-                    # Skip if description contains exclude keywords
-                    if any(keyword in description for keyword in exclude_keywords):
-                        logger.debug("Skipping excluded project (description)",
-                                   repo=item["name"],
-                                   description=description[:100])
-                        continue
-                    
-                    # Skip if topics contain exclude keywords
-                    if any(topic.lower() in exclude_keywords for topic in topics):
-                        logger.debug("Skipping excluded project (topics)",
-                                   repo=item["name"],
-                                   topics=topics)
-                        continue
-                    
-                    # Skip if repository name contains exclude keywords
-                    exclude_name_keywords = ["awesome", "list", "framework", "library", "sdk", "toolkit"]
-                    if any(keyword in repo_name for keyword in exclude_name_keywords):
-                        logger.debug("Skipping excluded project (name)",
-                                   repo=item["name"])
-                        continue
-                    
-                    # Skip very old projects (likely too complex/legacy)
-                    # Check if last updated is too old (more than 2 years)
-                    updated_at = item.get("updated_at", "")
-                    if updated_at:
-                        from datetime import datetime
-                        try:
-                            update_date = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-                            two_years_ago = datetime.now().replace(year=datetime.now().year - 2)
-                            if update_date < two_years_ago:
-                                logger.debug("Skipping old project",
-                                           repo=item["name"],
-                                           updated=updated_at)
-                                continue
-                        except:
-                            pass
-                    
-                    repo_info = RepositoryInfo(
-                        url=item["html_url"],
-                        owner=item["owner"]["login"],
-                        name=item["name"],
-                        stars=item["stargazers_count"],
-                        language=item.get("language"),
-                        has_readme=item.get("has_readme", False),
-                        description=item.get("description")
-                    )
-                    repos.append(repo_info)
-            
-            logger.info("Fetched repositories", 
-                       current=len(repos), 
-                       target=limit, 
-                       page=page)
-            
-            # Rate limit: 30 requests per minute for authenticated, 10 for unauthenticated
-            time.sleep(2 if self.token else 6)
-            page += 1
+                    else:
+                        raise  # Re-raise other errors
+                
+                items = data.get("items", [])
+                if not items:
+                    logger.info("No more repositories found", page=page)
+                    break
+                
+                repos.extend(islice(
+                    (repo for repo in map(filter_item, items) if repo is not None),
+                    limit - len(repos),
+                ))
+
+                logger.info("Fetched repositories", 
+                           current=len(repos), 
+                           target=limit, 
+                           page=page)
+                
+                # A short page is the last one
+                if len(items) < per_page:
+                    break
+        finally:
+            pages.close()
         
         logger.info("Repository search complete", total=len(repos), query=query)
         
@@ -284,14 +585,7 @@ class GithubTrendingCrawler:
             logger.warning("No results with strict query, trying simpler fallback", 
                          original_query=query, project_type=project_type)
             # Fallback: simpler query without project_type restrictions
-            fallback_query_parts = [f"stars:>={min_stars}"]
-            if language:
-                language_lower = language.lower()
-                fallback_query_parts.append(f"language:{language_lower}")
-            fallback_query_parts.append("-framework -library -boilerplate")
-            fallback_query_parts.append("pushed:>2022-01-01")
-            
-            fallback_query = " ".join(fallback_query_parts)
+            fallback_query = self._build_query(min_stars, language, fallback=True)
             logger.info("Trying fallback query", query=fallback_query)
             
             # Try one page with fallback
@@ -303,38 +597,10 @@ class GithubTrendingCrawler:
                     "per_page": min(100, limit),
                     "page": 1
                 }
-                url = f"{self.base_url}/search/repositories"
-                data = self._make_request(url, params=params)
+                data = self._search_page(f"{self.base_url}/search/repositories", params)
                 items = data.get("items", [])
-                
-                for item in items[:limit]:
-                    # Apply same filters as before
-                    description = (item.get("description") or "").lower()
-                    topics = item.get("topics", [])
-                    repo_name = item["name"].lower()
-                    
-                    exclude_keywords = [
-                        "awesome", "list", "framework", "library", "boilerplate", 
-                        "template", "starter", "sdk", "toolkit"
-                    ]
-                    
-                    if any(keyword in description for keyword in exclude_keywords):
-                        continue
-                    if any(topic.lower() in exclude_keywords for topic in topics):
-                        continue
-                    if any(keyword in repo_name for keyword in ["awesome", "list", "framework", "library"]):
-                        continue
-                    
-                    repo_info = RepositoryInfo(
-                        url=item["html_url"],
-                        owner=item["owner"]["login"],
-                        name=item["name"],
-                        stars=item["stargazers_count"],
-                        language=item.get("language"),
-                        has_readme=item.get("has_readme", False),
-                        description=item.get("description")
-                    )
-                    repos.append(repo_info)
+                filter_item = partial(self._filter_item, rules=_FALLBACK_EXCLUDE_RULES)
+                repos.extend(repo for repo in map(filter_item, items[:limit]) if repo is not None)
                 
                 logger.info("Fallback query returned results", count=len(repos))
             except Exception as e:
@@ -24,7 +24,10 @@ except Exception:
 
 
 def load_chunks(path: Path) -> list[dict]:
-    """Load chunked features from JSON (format from moxi_chunk)."""
+    """Load chunked features from JSON or JSONL (formats from moxi_chunk)."""
+    if path.suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
     with open(path, encoding="utf-8") as f:
         data = json.load(f)
     if isinstance(data, list):
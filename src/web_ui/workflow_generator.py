@@ -2,11 +2,8 @@
 
 from typing import Optional
 
-import requests
-
 from core import get_logger
-from core.lib import extract_repo_owner_and_name
-from doc_generator.writer import write_to_repo_via_api
+from doc_generator.writer import get_default_branch, write_to_repo_via_api
 from moxi_analyzer import analyze_repository
 from moxi_analyzer.models import ProjectLanguage
 
@@ -134,24 +131,12 @@ def write_workflow_to_repo(
             # Continue anyway - might be a new repo or detection issue
         # Get default branch if not provided
         if branch is None:
-            owner, repo = extract_repo_owner_and_name(repo_url)
-            if owner and repo:
-                # Get repository info to find default branch
-                api_url = f"https://api.github.com/repos/{owner}/{repo}"
-                headers = {
-                    "Authorization": f"token {github_token}",
-                    "Accept": "application/vnd.github.v3+json",
-                }
-                response = requests.get(api_url, headers=headers)
-                if response.status_code == 200:
-                    branch = response.json().get("default_branch", "main")
-                    logger.info("Detected default branch", repo=repo_url, branch=branch)
-                else:
-                    branch = "main"  # Fallback
-                    logger.warning("Failed to get default branch, using 'main'", repo=repo_url)
+            branch = get_default_branch(repo_url, github_token)
+            if branch:
+                logger.info("Detected default branch", repo=repo_url, branch=branch)
             else:
                 branch = "main"  # Fallback
-                logger.warning("Invalid repo URL, using 'main'", repo=repo_url)
+                logger.warning("Failed to get default branch, using 'main'", repo=repo_url)
         
         # Generate workflow content
         workflow_content = generate_workflow_content()
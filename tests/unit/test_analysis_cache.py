@@ -0,0 +1,79 @@
+"""On-disk cache of per-file architecture analyses."""
+
+import pytest
+
+from core import settings
+from moxi_chunk.repo_analyzer.architecture import analyzer
+from moxi_chunk.repo_analyzer.main import analyze_repository
+
+SOURCES = {
+    "app/main.py": "from fastapi import FastAPI\nfrom app.db import get_session\n\napp = FastAPI()\n\n@app.get('/')\ndef index():\n    return {}\n",
+    "app/db.py": "from sqlalchemy import create_engine\n\nengine = create_engine('sqlite://')\n\ndef get_session():\n    return engine\n",
+    "app/models.py": "from pydantic import BaseModel\n\nclass User(BaseModel):\n    name: str\n",
+    "app/worker.py": "import redis\nfrom celery import Celery\n\ncelery = Celery('app')\n",
+}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    for rel, source in SOURCES.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    return analyze_repository(str(root))
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache" / "analysis.sqlite")
+    monkeypatch.setattr(settings, "ANALYSIS_CACHE_PATH", path)
+    monkeypatch.setattr(analyzer, "_cache_conn", None)
+    yield path
+    if analyzer._cache_conn is not None:
+        analyzer._cache_conn.close()
+        analyzer._cache_conn = None
+
+
+def _cached_rows(cache_path):
+    return analyzer._get_cache(cache_path).execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+
+def test_warm_run_matches_cold_run(repo, cache_path, monkeypatch):
+    cold = analyzer.analyze_architecture_with_rules(repo)
+    assert cold["components"]
+    assert _cached_rows(cache_path) == len(SOURCES)
+
+    # Warm run must not parse anything
+    monkeypatch.setattr(analyzer, "_analyze_content", lambda *args: pytest.fail("cache miss"))
+    assert analyzer.analyze_architecture_with_rules(repo) == cold
+
+
+def test_version_bump_invalidates_cache(repo, cache_path, monkeypatch):
+    analyzer.analyze_architecture_with_rules(repo)
+    assert _cached_rows(cache_path) == len(SOURCES)
+
+    analyzer._cache_conn.close()
+    monkeypatch.setattr(analyzer, "_cache_conn", None)
+    monkeypatch.setattr(analyzer, "ANALYSIS_CACHE_VERSION", analyzer.ANALYSIS_CACHE_VERSION + 1)
+    assert _cached_rows(cache_path) == 0
+
+
+def test_cache_is_capped_oldest_first(cache_path, monkeypatch):
+    monkeypatch.setattr(analyzer, "ANALYSIS_CACHE_MAX_ENTRIES", 3)
+    monkeypatch.setattr(analyzer, "_PRUNE_EVERY", 1)
+    monkeypatch.setattr(analyzer, "_stores_since_prune", 0)
+    for i in range(5):
+        analyzer._store_cached(cache_path, [(f"/repo/f{i}.py", b"h", b"r")])
+    paths = {row[0] for row in analyzer._get_cache(cache_path).execute("SELECT path FROM analyses")}
+    assert paths == {"/repo/f2.py", "/repo/f3.py", "/repo/f4.py"}
+
+
+def test_connection_is_reopened_in_forked_child(cache_path, monkeypatch):
+    parent_conn = analyzer._get_cache(cache_path)
+    monkeypatch.setattr(analyzer, "_cache_pid", -1)  # as seen from a forked child
+    child_conn = analyzer._get_cache(cache_path)
+    assert child_conn is not parent_conn
+    assert parent_conn in analyzer._inherited_cache_conns
+    analyzer._inherited_cache_conns.remove(parent_conn)
+    parent_conn.close()
@@ -0,0 +1,45 @@
+"""Page fetching of the GitHub repository search crawler."""
+
+import pytest
+
+from moxi_data.crawlers.github_repo_crawler import GithubTrendingCrawler
+
+
+def _item(page, index):
+    return {
+        "name": f"repo{page}_{index}",
+        "html_url": f"https://github.com/owner/repo{page}_{index}",
+        "owner": {"login": "owner"},
+        "stargazers_count": 100,
+        "language": "Python",
+        "description": "A web application",
+        "topics": [],
+        "updated_at": "2999-01-01T00:00:00Z",
+    }
+
+
+@pytest.fixture
+def crawler(monkeypatch):
+    crawler = GithubTrendingCrawler(github_tokens=[])  # REST search
+    crawler.pages_requested = []
+
+    def make_request(url, params=None):
+        page = params["page"]
+        crawler.pages_requested.append(page)
+        count = params["per_page"] if page <= 7 else 0
+        return {"items": [_item(page, i) for i in range(count)]}
+
+    monkeypatch.setattr(crawler, "_make_request", make_request)
+    return crawler
+
+
+@pytest.mark.parametrize("limit, pages", [(50, [1]), (100, [1]), (250, [1, 2, 3]), (450, [1, 2, 3, 4, 5])])
+def test_requests_only_pages_the_limit_can_use(crawler, limit, pages):
+    repos = crawler.search_repositories(limit=limit)
+    assert len(repos) == limit
+    assert sorted(crawler.pages_requested) == pages
+
+
+def test_results_stay_in_page_order(crawler):
+    repos = crawler.search_repositories(limit=1000)
+    assert [repo.name for repo in repos] == [f"repo{p}_{i}" for p in range(1, 8) for i in range(100)]
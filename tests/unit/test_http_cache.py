@@ -0,0 +1,91 @@
+"""Conditional GETs backed by the SQLite ETag cache."""
+
+import json
+
+import pytest
+import requests
+
+from core import http_cache, settings
+
+URL = "https://api.github.com/repos/owner/repo"
+
+
+def _response(status_code, body=b"", etag=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
+class StubSession:
+    """Serves one resource; answers 304 when If-None-Match carries its current ETag."""
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+        self.sent_headers = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        headers = headers or {}
+        self.sent_headers.append(headers)
+        if headers.get("If-None-Match") == self.etag:
+            return _response(304)
+        return _response(200, self.body, self.etag)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_CACHE_PATH", str(tmp_path / "http.sqlite"))
+    monkeypatch.setattr(http_cache, "_conn", None)
+    yield
+    if http_cache._conn is not None:
+        http_cache._conn.close()
+        http_cache._conn = None
+
+
+def test_304_replays_cached_body(cache):
+    body = json.dumps({"name": "repo", "description": "café"}).encode("utf-8")
+    session = StubSession(body, '"v1"')
+
+    first = http_cache.conditional_get(session, URL)
+    assert first.status_code == 200
+    assert "If-None-Match" not in session.sent_headers[0]
+
+    second = http_cache.conditional_get(session, URL, headers={"Authorization": "token t"})
+    assert session.sent_headers[1] == {"Authorization": "token t", "If-None-Match": '"v1"'}
+    assert second.status_code == 200
+    assert second.encoding == "utf-8"
+    assert second.content == body
+    assert second.json() == {"name": "repo", "description": "café"}
+
+
+def test_changed_resource_replaces_entry(cache):
+    session = StubSession(b'{"v": 1}', '"v1"')
+    http_cache.conditional_get(session, URL)
+    session.body, session.etag = b'{"v": 2}', '"v2"'
+
+    assert http_cache.conditional_get(session, URL).json() == {"v": 2}
+    assert http_cache.conditional_get(session, URL).json() == {"v": 2}
+    assert session.sent_headers[-1]["If-None-Match"] == '"v2"'
+
+
+def test_expired_entries_are_not_revalidated(cache, monkeypatch):
+    session = StubSession(b"{}", '"v1"')
+    http_cache.conditional_get(session, URL)
+    monkeypatch.setattr(settings, "HTTP_CACHE_TTL", -1)
+
+    http_cache.conditional_get(session, URL)
+    assert "If-None-Match" not in session.sent_headers[-1]
+
+
+def test_cache_is_bounded(cache, monkeypatch):
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_MAX_ENTRIES", 3)
+    session = StubSession(b"{}", '"v1"')
+    for i in range(5):
+        http_cache.conditional_get(session, f"{URL}{i}")
+
+    http_cache._prune(http_cache._conn)
+    urls = [row[0] for row in http_cache._conn.execute("SELECT url FROM responses ORDER BY url")]
+    assert urls == [f"{URL}2", f"{URL}3", f"{URL}4"]
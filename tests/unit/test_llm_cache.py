@@ -0,0 +1,169 @@
+"""Exact/semantic LLM response cache of the streaming doc flow."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import models
+
+from core import settings
+from doc_generator.streaming import llm_cache
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+
+
+class FakeEmbedder:
+    def encode(self, text):
+        # Every input maps to the same vector, so any semantic lookup is a perfect match
+        return SimpleNamespace(tolist=lambda: [1.0, 0.0])
+
+
+def _matches(condition, payload):
+    if isinstance(condition, models.IsEmptyCondition):
+        return condition.is_empty.key not in payload
+    value = payload.get(condition.key)
+    if value is None:
+        return False
+    if condition.match is not None:
+        return value == condition.match.value
+    bounds = condition.range
+    return ((bounds.gte is None or value >= bounds.gte)
+            and (bounds.lt is None or value < bounds.lt))
+
+
+def _passes(points_filter, payload):
+    must = points_filter.must or []
+    should = points_filter.should or []
+    return (all(_matches(c, payload) for c in must)
+            and (not should or any(_matches(c, payload) for c in should)))
+
+
+class FakeQdrant:
+    def __init__(self):
+        self.points = {}
+
+    def upsert_points(self, collection_name, points):
+        for point in points:
+            self.points[point.id] = point
+
+    def search(self, collection_name, query_vector, query_filter=None, limit=5):
+        return [
+            SimpleNamespace(score=1.0, payload=point.payload)
+            for point in self.points.values()
+            if query_filter is None or _passes(query_filter, point.payload)
+        ][:limit]
+
+    def delete_points(self, collection_name, points_filter):
+        self.points = {
+            point_id: point for point_id, point in self.points.items()
+            if not _passes(points_filter, point.payload)
+        }
+
+
+class Generator:
+    def __init__(self):
+        self.calls = []
+
+    @llm_cache.cached_llm
+    def generate(self, message):
+        self.calls.append(message["repo_url"])
+        message["architecture_content"] = f"docs for {message['repo_url']}"
+        return message
+
+
+def _message(repo_url, files=("app.py", "models.py")):
+    return {"repo_url": repo_url, "repo_analysis": SimpleNamespace(all_files=list(files))}
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_get_collection", lambda: collection)
+    return collection
+
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    store = FakeQdrant()
+    monkeypatch.setattr(llm_cache, "_get_semantic_tier", lambda: (FakeEmbedder(), store))
+    return store
+
+
+def test_exact_hit_skips_generation(mongo, qdrant):
+    generator = Generator()
+    generator.generate(_message("https://github.com/a/app"))
+    result = generator.generate(_message("https://github.com/a/app"))
+    assert result["architecture_content"] == "docs for https://github.com/a/app"
+    assert generator.calls == ["https://github.com/a/app"]
+
+
+def test_semantic_hit_never_crosses_repositories(mongo, qdrant):
+    generator = Generator()
+    generator.generate(_message("https://github.com/a/app"))
+    result = generator.generate(_message("https://github.com/b/fork"))
+    assert result["architecture_content"] == "docs for https://github.com/b/fork"
+    assert generator.calls == ["https://github.com/a/app", "https://github.com/b/fork"]
+
+
+def test_semantic_hit_for_same_repository(mongo, qdrant):
+    generator = Generator()
+    generator.generate(_message("https://github.com/a/app"))
+    # Changed file tree: no exact hit, but the same repository matches semantically
+    result = generator.generate(_message("https://github.com/a/app", files=("app.py",)))
+    assert result["architecture_content"] == "docs for https://github.com/a/app"
+    assert generator.calls == ["https://github.com/a/app"]
+
+
+def test_expired_semantic_entries_are_ignored_and_purged(mongo, qdrant, monkeypatch):
+    generator = Generator()
+    generator.generate(_message("https://github.com/a/app"))
+    for point in qdrant.points.values():
+        point.payload["created_at"] = time.time() - settings.LLM_CACHE_TTL - 1
+
+    generator.generate(_message("https://github.com/a/app", files=("app.py",)))
+    assert len(generator.calls) == 2
+    assert [p.payload["created_at"] > time.time() - 60 for p in qdrant.points.values()] == [True]
+
+
+def test_exact_tier_works_without_semantic_tier(mongo, monkeypatch):
+    def unavailable():
+        raise ImportError("sentence_transformers")
+
+    monkeypatch.setattr(llm_cache, "_get_semantic_tier", unavailable)
+    generator = Generator()
+    generator.generate(_message("https://github.com/a/app"))
+    assert len(mongo.docs) == 1
+    generator.generate(_message("https://github.com/a/app"))
+    assert generator.calls == ["https://github.com/a/app"]
+
+
+def test_semantic_tier_failure_is_recorded_once(monkeypatch):
+    attempts = []
+
+    class Unreachable:
+        def __init__(self):
+            attempts.append(1)
+            raise ConnectionError("qdrant down")
+
+    monkeypatch.setattr("core.db.qdrant.QdrantConnector", Unreachable)
+    monkeypatch.setattr(llm_cache, "_semantic_tier", None)
+    monkeypatch.setattr(llm_cache, "_semantic_error", None)
+    assert llm_cache._get_semantic_tier() is None
+    assert llm_cache._get_semantic_tier() is None
+    assert len(attempts) <= 1
+
+
+def test_semantic_text_is_bounded():
+    files = [f"pkg{i}/module{j}.py" for i in range(500) for j in range(10)]
+    text = llm_cache._semantic_text("https://github.com/a/app", _message("https://github.com/a/app", files))
+    assert len(text.split()) <= 2 * llm_cache.SEMANTIC_SUMMARY_ENTRIES + 1
@@ -0,0 +1,97 @@
+"""Refresh of cached tarball snapshots in the GitHub crawler."""
+
+import io
+import os
+import tarfile
+
+import pytest
+
+from core import settings
+from moxi_chunk.repo_analyzer.crawlers import github
+
+OLD_SHA = "1111111111111111111111111111111111111111"
+NEW_SHA = "2222222222222222222222222222222222222222"
+
+
+def _tarball(sha, source):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", pax_headers={"comment": sha}) as archive:
+        data = source.encode()
+        member = tarfile.TarInfo(f"app-{sha[:7]}/main.py")
+        member.size = len(data)
+        archive.addfile(member, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+class Response:
+    def __init__(self, status_code=200, text="", raw=None):
+        self.status_code = status_code
+        self.text = text
+        self.raw = raw
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Remote:
+    def __init__(self):
+        self.sha = OLD_SHA
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        self.requests.append(url)
+        if url.endswith("/commits/HEAD"):
+            return Response(text=self.sha)
+        return Response(raw=_tarball(self.sha, f"# {self.sha}\n"))
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    remote = Remote()
+    monkeypatch.setattr(github.requests, "get", remote.get)
+    monkeypatch.setattr(settings, "GITHUB_TOKEN", None)
+    return remote
+
+
+def _expire(path):
+    marker = github._snapshot_marker(path)
+    past = marker.stat().st_mtime - settings.REPO_SNAPSHOT_TTL - 1
+    os.utime(marker, (past, past))
+
+
+def test_snapshot_records_its_commit(remote, tmp_path):
+    path = github.GithubCrawler(cache_dir=str(tmp_path)).fetch("https://github.com/a/app")
+    assert (path / "main.py").read_text() == f"# {OLD_SHA}\n"
+    assert github._snapshot_marker(path).read_text() == OLD_SHA
+
+
+def test_fresh_snapshot_is_reused_without_requests(remote, tmp_path):
+    crawler = github.GithubCrawler(cache_dir=str(tmp_path))
+    crawler.fetch("https://github.com/a/app")
+    remote.requests.clear()
+    crawler.fetch("https://github.com/a/app")
+    assert remote.requests == []
+
+
+def test_expired_snapshot_is_kept_while_head_is_unchanged(remote, tmp_path):
+    crawler = github.GithubCrawler(cache_dir=str(tmp_path))
+    path = crawler.fetch("https://github.com/a/app")
+    _expire(path)
+    remote.requests.clear()
+    crawler.fetch("https://github.com/a/app")
+    assert [url.rsplit("/", 1)[-1] for url in remote.requests] == ["HEAD"]
+
+
+def test_expired_snapshot_is_replaced_when_head_moved(remote, tmp_path):
+    crawler = github.GithubCrawler(cache_dir=str(tmp_path))
+    path = crawler.fetch("https://github.com/a/app")
+    _expire(path)
+    remote.sha = NEW_SHA
+    assert crawler.fetch("https://github.com/a/app") == path
+    assert (path / "main.py").read_text() == f"# {NEW_SHA}\n"
+    assert github._snapshot_marker(path).read_text() == NEW_SHA
+    assert {p.name for p in path.parent.iterdir()} == {"app", github._snapshot_marker(path).name}